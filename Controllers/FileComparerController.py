@@ -1,9 +1,15 @@
 from pathlib import Path
-from difflib import unified_diff
-from difflib import SequenceMatcher
+import hashlib
+import os
 import re
 
+from Controllers.MyersDiffController import MyersDiffController
+from Controllers.SequenceMatcherDiffController import (
+    SequenceMatcherDiffController)
+
 from Utils.Constants import THRESHOLD
+from Utils.DiffResult import DiffHunk
+from Utils.DiffResult import DiffResult
 from Utils.Constants import MAX_LINE_LENGTH
 
 class FileComparerController:
@@ -17,96 +23,284 @@ class FileComparerController:
         with comments.
     - Tag modifications as 'major' or 'minor' based on configurable thresholds.
     - Format files to split overly long lines for better readability.
+    - Detect identical files cheaply so they skip the diff entirely.
+
+    The line diff is delegated to a pluggable DiffEngine, selected by
+    name from DIFF_ENGINES or given as an instance.
 
     Attributes:
-        None
+        use_stat_check (bool): Whether files that are the same inode
+            (hard links or the same path) are treated as identical
+            without reading them.
     """
 
-    def compare_files(self, old_version_file: Path, new_version_file: Path):
+    DIFF_ENGINES = {
+        "difflib": SequenceMatcherDiffController,
+        "myers": MyersDiffController,
+    }
+
+    def __init__(self, use_stat_check: bool = True, diff_engine="difflib"):
         """
-        Compare two files line-by-line and count the number of added and
-        removed lines.
+        Initializes the FileComparerController.
 
         Args:
-            old_version_file (Path): The path to the original version of the file.
-            new_version_file (Path): The path to the new version of the file.
+            use_stat_check (bool): Enables the stat-based identity check.
+            diff_engine (str | DiffEngine): The diff engine or the name
+                of one of DIFF_ENGINES.
+        """
+        self.use_stat_check = use_stat_check
+        self.set_diff_engine(diff_engine)
+
+    def set_diff_engine(self, diff_engine):
+        """
+        Select the diff engine used to compare and annotate files.
+
+        Args:
+            diff_engine (str | DiffEngine): The diff engine or the name
+                of one of DIFF_ENGINES.
 
+        Raises:
+            ValueError: If the name is not a known diff engine.
+        """
+        if isinstance(diff_engine, str):
+            if diff_engine not in self.DIFF_ENGINES:
+                raise ValueError(
+                    f"Unknown diff engine '{diff_engine}'. Available: "
+                    f"{', '.join(self.DIFF_ENGINES)}."
+                )
+            diff_engine = self.DIFF_ENGINES[diff_engine]()
+
+        self.__diff_engine = diff_engine
+
+    def get_diff_engine(self):
+        """
         Returns:
-            tuple[int, int]: A tuple containing the number of added and removed lines.
+            DiffEngine: The diff engine in use.
+        """
+        return self.__diff_engine
+
+    def files_are_identical(self, old_file: Path, new_file: Path) -> bool:
+        """
+        Check whether two files have exactly the same content.
+
+        The check goes from cheapest to most expensive: same inode
+        (when `use_stat_check` is enabled), then size, then a SHA-256
+        hash of the contents.
+
+        Args:
+            old_file (Path): The path to the original version of the file.
+            new_file (Path): The path to the new version of the file.
+
+        Returns:
+            bool: True if both files have the same bytes.
         """
+        old_stat = os.stat(old_file)
+        new_stat = os.stat(new_file)
 
-        if not old_version_file.exists() or not new_version_file.exists():
+        if self.use_stat_check and os.path.samestat(old_stat, new_stat):
+            return True
+
+        if old_stat.st_size != new_stat.st_size:
+            return False
+
+        return self.__hash_file(old_file) == self.__hash_file(new_file)
+
+    def __hash_file(self, file_path: Path) -> bytes:
+        """
+        Compute the SHA-256 digest of a file, reading it in chunks.
+
+        Args:
+            file_path (Path): Path to the file to hash.
+
+        Returns:
+            bytes: The digest of the file content.
+        """
+        digest = hashlib.sha256()
+
+        with open(file_path, "rb") as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                digest.update(chunk)
+
+        return digest.digest()
+
+    def diff_files(self, old_file: Path, new_file: Path) -> DiffResult:
+        """
+        Diff two versions of a file once, so the result can be used both
+        to count and to annotate the changes.
+
+        Identical files are detected first and are not read.
+
+        Args:
+            old_file (Path): The path to the original version of the file.
+            new_file (Path): The path to the new version of the file.
+
+        Returns:
+            DiffResult: The lines, opcodes, counts and hunks of the diff.
+        """
+        if not old_file.exists() or not new_file.exists():
             raise FileNotFoundError("One or both files do not exist.")
 
-        with old_version_file.open('r') as \
-        ovfile, new_version_file.open('r') as nvfile:
+        if self.files_are_identical(old_file, new_file):
+            return DiffResult.identical()
+
+        with old_file.open('r') as ovfile, new_file.open('r') as nvfile:
             old_lines = ovfile.readlines()
             new_lines = nvfile.readlines()
 
-        num_added_lines = num_removed_lines = 0
+        return self.diff_lines(old_lines, new_lines)
+
+    def diff_lines(self, old_lines: list[str], new_lines: list[str]) -> DiffResult:
+        """
+        Diff two lists of lines with the selected diff engine and grade
+        every changed hunk.
 
-        for line in unified_diff(old_lines, new_lines, lineterm=''):
-            if line.startswith('+') and not line.startswith('+++'):
-                num_added_lines += 1
-            elif line.startswith('-') and not line.startswith('---'):
-                num_removed_lines += 1
+        A 'replace' hunk is major when any of its line pairs is a major
+        change or when it adds or removes extra lines. Pure insertions and
+        deletions are major changes.
 
-        return num_added_lines, num_removed_lines
+        Args:
+            old_lines (list[str]): The lines of the original version.
+            new_lines (list[str]): The lines of the new version.
 
-    def add_modification_comments(self, old_file: Path, new_file: Path):
+        Returns:
+            DiffResult: The lines, opcodes, counts and hunks of the diff.
+        """
+        opcodes = self.__diff_engine.get_opcodes(old_lines, new_lines)
+        hunks = []
+
+        for tag, i1, i2, j1, j2 in opcodes:
+            if tag == 'equal':
+                continue
+
+            line_tags = ()
+            severity = "major"
+
+            if tag == 'replace':
+                line_tags = tuple(
+                    self.__set_exchange_rate_tags(old, new)
+                    for old, new in zip(old_lines[i1:i2], new_lines[j1:j2])
+                )
+                if i2 - i1 == j2 - j1 and \
+                        "  # major change" not in line_tags:
+                    severity = "minor"
+
+            hunks.append(DiffHunk(tag, i1, i2, j1, j2, severity, line_tags))
+
+        return DiffResult(old_lines, new_lines, opcodes, hunks)
+
+    def compare_files(self, old_version_file: Path, new_version_file: Path):
+        """
+        Compare two files line-by-line and count the number of added and
+        removed lines.
+
+        Args:
+            old_version_file (Path): The path to the original version of the file.
+            new_version_file (Path): The path to the new version of the file.
+
+        Returns:
+            tuple[int, int]: A tuple containing the number of added and removed lines.
+        """
+        diff_result = self.diff_files(old_version_file, new_version_file)
+
+        return diff_result.added_lines, diff_result.removed_lines
+
+    def add_modification_comments(
+        self,
+        old_file: Path,
+        new_file: Path,
+        diff_result: DiffResult = None
+    ):
         """
         Add inline comments to highlight modifications between two file versions.
 
         The old file receives comments indicating deleted lines, while the new file
         is annotated with added lines and a tag indicating the severity of the change
-        (major or minor).
+        (major or minor). Identical files have nothing to annotate and are left
+        untouched.
 
         Args:
             old_file (Path): Path to the original file.
             new_file (Path): Path to the new file.
+            diff_result (DiffResult): The diff of both files, as returned by
+                `diff_files`. When omitted, the files are diffed again.
         """
-                
-        with old_file.open('r') as f1, new_file.open('r') as f2:
-            old_lines = f1.readlines()
-            new_lines = f2.readlines()
+        if diff_result is None:
+            diff_result = self.diff_files(old_file, new_file)
+
+        if not diff_result.has_changes():
+            return
 
-        sm = SequenceMatcher(None, old_lines, new_lines)
+        old_output, new_output = self.render_modification_comments(diff_result)
 
         with old_file.open('w') as outf_old, new_file.open('w') as outf_new:
-            for tag, i1, i2, j1, j2 in sm.get_opcodes():
-
-                if tag == 'equal':
-                    outf_old.writelines(old_lines[i1:i2])
-                    outf_new.writelines(new_lines[j1:j2])
-
-                elif tag == 'replace':
-                    for old, new in zip(old_lines[i1:i2], new_lines[j1:j2]):
-                        outf_old.write('# Deleted Line\n')
-                        outf_old.write(old)
-
-                        etiqueta = self.__set_exchange_rate_tags(old, new)
-                        outf_new.write(f'# Added Line: {etiqueta}\n')
-                        outf_new.write(new)
-
-                    extra_old = old_lines[i1:i2][len(new_lines[j1:j2]):]
-                    extra_new = new_lines[j1:j2][len(old_lines[i1:i2]):]
-                    for old in extra_old:
-                        outf_old.write('# Deleted Line: Major change\n')
-                        outf_old.write(old)
-                    for new in extra_new:
-                        outf_new.write('# Added Line: Major change\n')
-                        outf_new.write(new)
-
-                elif tag == 'delete':
-                    for old in old_lines[i1:i2]:
-                        outf_old.write('# Deleted Line\n')
-                        outf_old.write(old)
-
-                elif tag == 'insert':
-                    for new in new_lines[j1:j2]:
-                        outf_new.write('# Added Line\n')
-                        outf_new.write(new)
-        
+            outf_old.writelines(old_output)
+            outf_new.writelines(new_output)
+
+    def render_modification_comments(
+        self,
+        diff_result: DiffResult
+    ) -> tuple[list[str], list[str]]:
+        """
+        Build the annotated lines of both file versions in memory.
+
+        The comments are the same ones `add_modification_comments` writes,
+        so the result can be stored anywhere without touching the
+        compared files.
+
+        Args:
+            diff_result (DiffResult): The diff of both versions.
+
+        Returns:
+            tuple[list[str], list[str]]: The annotated old and new lines.
+        """
+        old_lines = diff_result.old_lines
+        new_lines = diff_result.new_lines
+        outf_old = []
+        outf_new = []
+        line_tags = {
+            (hunk.old_start, hunk.new_start): hunk.line_tags
+            for hunk in diff_result.hunks
+        }
+
+        for tag, i1, i2, j1, j2 in diff_result.opcodes:
+
+            if tag == 'equal':
+                outf_old.extend(old_lines[i1:i2])
+                outf_new.extend(new_lines[j1:j2])
+
+            elif tag == 'replace':
+                for old, new, etiqueta in zip(
+                    old_lines[i1:i2],
+                    new_lines[j1:j2],
+                    line_tags[(i1, j1)]
+                ):
+                    outf_old.append('# Deleted Line\n')
+                    outf_old.append(old)
+
+                    outf_new.append(f'# Added Line: {etiqueta}\n')
+                    outf_new.append(new)
+
+                extra_old = old_lines[i1:i2][len(new_lines[j1:j2]):]
+                extra_new = new_lines[j1:j2][len(old_lines[i1:i2]):]
+                for old in extra_old:
+                    outf_old.append('# Deleted Line: Major change\n')
+                    outf_old.append(old)
+                for new in extra_new:
+                    outf_new.append('# Added Line: Major change\n')
+                    outf_new.append(new)
+
+            elif tag == 'delete':
+                for old in old_lines[i1:i2]:
+                    outf_old.append('# Deleted Line\n')
+                    outf_old.append(old)
+
+            elif tag == 'insert':
+                for new in new_lines[j1:j2]:
+                    outf_new.append('# Added Line\n')
+                    outf_new.append(new)
+
+        return outf_old, outf_new
+
     def __set_exchange_rate_tags(
         self,
         old_line: str,
@@ -158,6 +352,26 @@ class FileComparerController:
         with file_path.open("r", encoding="utf-8") as file_read:
             lines = file_read.readlines()
 
+        formatted_lines = self.format_long_lines(lines)
+
+        with file_path.open("w", encoding="utf-8") as file_write:
+            file_write.writelines(formatted_lines)
+
+        return formatted_lines
+
+    def format_long_lines(self, lines: list[str]) -> list[str]:
+        """
+        Split the lines that exceed MAX_LINE_LENGTH, in memory.
+
+        This applies the same reflow as `format_file_long_lines` without
+        reading or writing any file.
+
+        Args:
+            lines (list[str]): The lines to format.
+
+        Returns:
+            list[str]: The newly formatted lines.
+        """
         formatted_lines = []
 
         for line in lines:
@@ -185,7 +399,4 @@ class FileComparerController:
             else:
                 formatted_lines.append(line + '\n')
 
-        with file_path.open("w", encoding="utf-8") as file_write:
-            file_write.writelines(formatted_lines)
-
         return formatted_lines
@@ -1,13 +1,35 @@
+from __future__ import annotations
+
+import logging
+
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from functools import partial
 from pathlib import Path
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 
 from Controllers.FileComparerController import FileComparerController
-from Views import FileLineCounterView
 from Models import FileLineCounterModel
+from Models.ComparisonResultStore import ComparisonResultStore
 from .PythonStandardValidatorController import (
     PythonStandardValidatorController)
 from .LineAnalyzerController import LineAnalyzerController
+from .TokenLineAnalyzerController import TokenLineAnalyzerController
+from Utils.CodeUnitBreakdown import CodeUnitChange, compare_code_units
+from Utils.ComparisonProgress import ComparisonProgress
 from Utils.FileReader import FileReader
+from Utils.GitRevisionSource import GitRevisionSource
+from Utils.MetricsCache import MetricsCache
+from Utils.ProjectFileIndex import ProjectFileIndex
+from Utils.ProjectTreeWalker import ProjectTreeWalker
+from Utils.RenameDetector import RenameDetector
+from Utils.SnapshotManifest import SnapshotEntry, SnapshotManifest
+from Utils.StageProfiler import NullStageProfiler, StageProfiler
+from Utils.TreeHashIndex import TreeHashIndex
+from Utils.Constants import MAX_WORKERS
+
+if TYPE_CHECKING:
+    from Views import FileLineCounterView
 
 class FileLineCounterController:
     """
@@ -17,6 +39,11 @@ class FileLineCounterController:
     with Python coding standards.
     """
 
+    COUNTING_ENGINES = {
+        "heuristic": LineAnalyzerController,
+        "tokenize": TokenLineAnalyzerController,
+    }
+
     def __init__(
         self,
         file_line_counter_view: FileLineCounterView = None,
@@ -28,7 +55,20 @@ class FileLineCounterController:
         self.__file_line_counter_view = file_line_counter_view
         self.__file_line_counter_model = file_line_counter_model
         self.__file_comparer_controller = FileComparerController()
+        self.__diff_engine = "difflib"
+        self.__counting_engine = "heuristic"
         self.__file_analyzer_controller = LineAnalyzerController()
+        self.__max_workers = MAX_WORKERS
+        self.__metrics_cache = None
+        self.__read_only = False
+        self.__output_directory = None
+        self.__standard_rules = PythonStandardValidatorController.DEFAULT_RULES
+        self.__profiler = NullStageProfiler()
+        self.__rename_detector = RenameDetector()
+        self.__detected_renames = []
+        self.__tree_walker = ProjectTreeWalker()
+        self.__skip_unchanged_trees = False
+        self.__code_unit_breakdown = False
 
     def set_file_line_counter_view(
         self,
@@ -48,6 +88,174 @@ class FileLineCounterController:
         """
         self.__file_line_counter_model = file_line_counter_model
 
+    def set_max_workers(self, max_workers: int):
+        """
+        Sets the number of worker processes used to compare the file
+        pairs of a directory. A value of 1 processes them sequentially.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1.")
+        self.__max_workers = max_workers
+
+    def get_max_workers(self):
+        """Returns the number of worker processes used for directories."""
+        return self.__max_workers
+
+    def set_metrics_cache(self, metrics_cache):
+        """
+        Sets the MetricsCache used to reuse the metrics of files whose
+        content was already analyzed. None disables caching.
+
+        A cache hit skips the comparison, so the files are not
+        reformatted nor annotated again.
+        """
+        self.__metrics_cache = metrics_cache
+
+    def get_metrics_cache(self):
+        """Returns the metrics cache, or None when caching is disabled."""
+        return self.__metrics_cache
+
+    def set_read_only(self, read_only: bool, output_directory=None):
+        """
+        Enables or disables the read-only analysis mode.
+
+        In read-only mode the compared files are never rewritten: long
+        lines are reflowed in memory and the annotated versions are
+        written under `output_directory`, mirroring their absolute
+        paths, or discarded when no output directory is given.
+        """
+        self.__read_only = read_only
+        self.__output_directory = \
+            Path(output_directory) if output_directory else None
+
+    def is_read_only(self):
+        """Returns whether the compared files are left untouched."""
+        return self.__read_only
+
+    def get_output_directory(self):
+        """Returns where read-only mode writes the annotated files."""
+        return self.__output_directory
+
+    def set_standard_rules(self, rules):
+        """
+        Selects, by name, the rules of the standard a file must comply
+        with to be counted. Raises ValueError for an unknown rule.
+        """
+        PythonStandardValidatorController([], rules)
+        self.__standard_rules = tuple(rules)
+
+    def get_standard_rules(self):
+        """Returns the names of the selected rules of the standard."""
+        return self.__standard_rules
+
+    def set_counting_engine(self, counting_engine):
+        """
+        Selects, by name, the engine that counts physical lines,
+        methods and classes: 'heuristic', the fast line prefix rules,
+        or 'tokenize', exact counts from Python's tokenizer.
+        Raises ValueError for an unknown engine.
+        """
+        if counting_engine not in self.COUNTING_ENGINES:
+            raise ValueError(
+                f"Unknown counting engine '{counting_engine}'. Available: "
+                f"{', '.join(self.COUNTING_ENGINES)}."
+            )
+        self.__counting_engine = counting_engine
+        self.__file_analyzer_controller = \
+            self.COUNTING_ENGINES[counting_engine]()
+
+    def get_counting_engine(self):
+        """Returns the name of the selected counting engine."""
+        return self.__counting_engine
+
+    def set_diff_engine(self, diff_engine):
+        """
+        Selects, by name, the algorithm that diffs the versions of a
+        file: 'difflib', Python's SequenceMatcher, or 'myers', a
+        linear-space Myers diff. Raises ValueError for an unknown
+        engine.
+        """
+        self.__file_comparer_controller.set_diff_engine(diff_engine)
+        self.__diff_engine = diff_engine
+
+    def get_diff_engine(self):
+        """Returns the name of the selected diff engine."""
+        return self.__diff_engine
+
+    def set_rename_detector(self, rename_detector):
+        """
+        Sets the RenameDetector that pairs the deleted and added files
+        of a directory comparison that are the same module moved or
+        renamed. None compares files by relative path only.
+        """
+        self.__rename_detector = rename_detector
+
+    def get_rename_detector(self):
+        """Returns the rename detector, or None when it is disabled."""
+        return self.__rename_detector
+
+    def get_detected_renames(self):
+        """
+        Returns the DetectedRename pairs of the last directory
+        comparison.
+        """
+        return list(self.__detected_renames)
+
+    def set_tree_walker(self, tree_walker):
+        """
+        Sets the ProjectTreeWalker that lists the Python files of the
+        compared directories: which directories it excludes, whether
+        it honours `.gitignore` files and how many threads it uses.
+        """
+        self.__tree_walker = tree_walker
+
+    def get_tree_walker(self):
+        """Returns the tree walker."""
+        return self.__tree_walker
+
+    def set_skip_unchanged_trees(self, skip_unchanged_trees: bool):
+        """
+        Enables or disables skipping the directories whose content hash
+        is the same in both versions of a directory comparison.
+
+        Their files are reported as unchanged without being compared
+        nor rewritten, with metrics taken from the metrics cache when
+        the whole subtree was seen before. The hashes of the files are
+        recorded in the metrics cache, when there is one, so the
+        compared trees are never written to.
+        """
+        self.__skip_unchanged_trees = skip_unchanged_trees
+
+    def is_skipping_unchanged_trees(self):
+        """Returns whether unchanged directories are skipped."""
+        return self.__skip_unchanged_trees
+
+    def set_code_unit_breakdown(self, code_unit_breakdown: bool):
+        """
+        Enables or disables the breakdown of the compared files by
+        top-level class and function.
+
+        The new version of a file is split in the same pass that counts
+        it, and the old version, already reformatted, is counted by the
+        same engine; the CodeUnitChange are stored with the results.
+        """
+        self.__code_unit_breakdown = code_unit_breakdown
+
+    def is_breaking_down_code_units(self):
+        """Returns whether the code unit breakdown is computed."""
+        return self.__code_unit_breakdown
+
+    def set_profiler(self, profiler):
+        """
+        Sets the StageProfiler that records the time, counters and
+        bytes of every stage of a comparison. None disables profiling.
+        """
+        self.__profiler = profiler or NullStageProfiler()
+
+    def get_profiler(self):
+        """Returns the profiler in use."""
+        return self.__profiler
+
     def get_file_line_counter_view(self):
         """Returns the current file line counter view."""
         return self.__file_line_counter_view
@@ -62,35 +270,267 @@ class FileLineCounterController:
         or a Python file, then counts it's physical lines in a class and sum 
         the total physical lines in the proyect.
         """
-        path_old_object = Path(old_path)
-        path_new_object = Path(new_path)
+        line_counting_results = self.collect_file_path_results(
+            old_path, new_path
+        )
 
-        line_counting_results = {}
+        self.publish_results(line_counting_results)
 
-        if path_old_object.is_dir():
+    def collect_file_path_results(
+        self,
+        old_path,
+        new_path,
+        on_result=None,
+        on_progress=None,
+        cancel_event=None
+    ):
+        """
+        Computes the results of comparing the given paths without
+        touching the model, so it can run in a background thread.
+        `old_path` can also be a snapshot manifest of the old tree.
+
+        `on_result(file, metrics)` is called for every processed file,
+        `on_progress(ProgressEvent)` after each one, and the comparison
+        stops early once `cancel_event` is set. The returned results,
+        partial when cancelled, include the 'Total' entry.
+        """
+        self.__profiler.start()
+        try:
+            return self.__collect_file_path_results(
+                Path(old_path),
+                Path(new_path),
+                ComparisonProgress(on_result, on_progress, cancel_event)
+            )
+        finally:
+            self.__profiler.stop()
+            self.__flush_metrics_cache()
+
+    def __collect_file_path_results(
+        self,
+        path_old_object,
+        path_new_object,
+        progress
+    ):
+        """
+        Computes the results of comparing the given paths.
+        """
+        line_counting_results = ComparisonResultStore()
+
+        if SnapshotManifest.is_manifest(path_old_object):
+            try:
+                manifest = SnapshotManifest.read(path_old_object)
+            except ValueError as e:
+                logging.error(e)
+                progress.start(1)
+                line_counting_results[path_old_object] = \
+                    ("error", "Not a valid snapshot manifest", "None")
+                progress.file_done(
+                    path_old_object, line_counting_results[path_old_object]
+                )
+            else:
+                self.__process_manifest(
+                    manifest,
+                    path_new_object,
+                    line_counting_results,
+                    progress
+                )
+        elif path_old_object.is_dir():
             self.__process_directory(
                 path_old_object,
                 path_new_object,
-                line_counting_results
+                line_counting_results,
+                progress
             )
         elif path_old_object.is_file():
+            progress.start(1)
             if path_old_object.suffix == ".py":
                 if self.file_exists_anywhere(path_old_object, path_new_object):
                     path_to_new_file = self.find_matching_file(
                         path_old_object,
                         path_new_object
                     )
-                    new_file_metrics = self.get_file_metrics(
-                        path_to_new_file, path_old_object
+                    self.__store_comparison(
+                        line_counting_results,
+                        path_old_object,
+                        self.get_file_comparison(
+                            path_to_new_file, path_old_object
+                        ),
+                        progress
                     )
-                    line_counting_results[path_old_object] = new_file_metrics
             else:
                 line_counting_results[path_old_object] = \
                     ("error","Not a Python file", "None")
+                progress.file_done(
+                    path_old_object, line_counting_results[path_old_object]
+                )
                 
         line_counting_results["Total"] = \
         self.calculate_total_physical_lines(line_counting_results)
 
+        return line_counting_results
+
+    def process_git_revisions(self, repository_path, old_revision,
+                              new_revision):
+        """
+        Compares two revisions of a git repository without checking
+        them out, and stores the results in the model.
+        """
+        line_counting_results = self.collect_git_revision_results(
+            repository_path, old_revision, new_revision
+        )
+
+        self.publish_results(line_counting_results)
+
+    def collect_git_revision_results(
+        self,
+        repository_path,
+        old_revision,
+        new_revision,
+        on_result=None,
+        on_progress=None,
+        cancel_event=None
+    ):
+        """
+        Computes the results of comparing two revisions of a git
+        repository, read straight from its object store.
+
+        Only the Python files whose blobs differ are read, and always
+        in memory: the repository is never written. When an output
+        directory is set, the annotated versions are written under
+        '<output directory>/<revision>/<path>'. The results are keyed
+        by the path of each file in the repository; the callbacks work
+        as in `collect_file_path_results`.
+        """
+        self.__profiler.start()
+        try:
+            with GitRevisionSource(
+                repository_path, old_revision, new_revision
+            ) as source:
+                return self.__collect_git_revision_results(
+                    source,
+                    ComparisonProgress(on_result, on_progress, cancel_event)
+                )
+        finally:
+            self.__profiler.stop()
+            self.__flush_metrics_cache()
+
+    def __collect_git_revision_results(self, source, progress):
+        """
+        Computes the metrics of every changed file of a git source.
+        """
+        line_counting_results = ComparisonResultStore()
+
+        with self.__profiler.stage("discovery"):
+            changes = source.get_changes()
+
+        progress.start(len(changes))
+
+        for change in changes:
+            if progress.is_cancelled():
+                break
+
+            file_path = Path(change.path)
+            if change.old_blob_id is None:
+                self.__profiler.add_count("files_added")
+                file_metrics = self.__get_cached_metrics(
+                    "basic",
+                    (),
+                    lambda: self.__compute_lines_basic_metrics(
+                        self.__read_blob_lines(
+                            source, change.new_blob_id, change.path
+                        )
+                    ),
+                    (change.new_blob_id,)
+                )
+            elif change.new_blob_id is None:
+                self.__profiler.add_count("files_deleted")
+                with self.__profiler.stage("analysis"):
+                    class_name = self.__file_analyzer_controller.extract_class(
+                        self.__read_blob_lines(
+                            source, change.old_blob_id, change.path
+                        )
+                    )
+                file_metrics = (f"Deleted ({class_name})", 0, 0, 0, 0)
+            else:
+                self.__profiler.add_count("files_compared")
+                file_metrics = self.__get_cached_metrics(
+                    "pair",
+                    (),
+                    lambda: self.__compute_lines_metrics(
+                        self.__read_blob_lines(
+                            source, change.old_blob_id, change.path
+                        ),
+                        self.__read_blob_lines(
+                            source, change.new_blob_id, change.path
+                        ),
+                        lambda: False,
+                        self.__get_revision_output_paths(source, change.path)
+                    ),
+                    (change.old_blob_id, change.new_blob_id)
+                )
+
+            self.__store_comparison(
+                line_counting_results,
+                file_path,
+                self.__split_code_unit_changes(file_metrics),
+                progress
+            )
+
+        line_counting_results["Total"] = \
+            self.calculate_total_physical_lines(line_counting_results)
+
+        return line_counting_results
+
+    def __read_blob_lines(self, source, blob_id, path):
+        """
+        Reads the lines of a blob of a git source.
+        """
+        with self.__profiler.stage("read"):
+            blob_lines = source.read_blob_lines(blob_id, path)
+        if self.__profiler.is_enabled():
+            self.__profiler.add_bytes_read(
+                sum(len(line.encode("utf-8")) for line in blob_lines)
+            )
+        return blob_lines
+
+    def __get_revision_output_paths(self, source, path):
+        """
+        Returns where the annotated old and new versions of a file of
+        a git source are written, or None without an output directory.
+        """
+        if self.__output_directory is None:
+            return None
+
+        return tuple(
+            self.__output_directory / revision.replace("/", "_") / path
+            for revision in (source.get_old_revision(),
+                             source.get_new_revision())
+        )
+
+    def publish_partial_result(self, file_path, metrics):
+        """
+        Adds the metrics of one file to the model while a comparison
+        is still running.
+        """
+        self.__file_line_counter_model.add_line_count_result(
+            file_path, metrics
+        )
+
+    def publish_partial_results(self, partial_results):
+        """
+        Adds several (file, metrics) entries to the model as a single
+        batch, so the view receives one coalesced delta.
+        """
+        with self.__file_line_counter_model.batch_updates():
+            for file_path, metrics in partial_results:
+                self.__file_line_counter_model.add_line_count_result(
+                    file_path, metrics
+                )
+
+    def publish_results(self, line_counting_results):
+        """
+        Stores the complete results of a comparison in the model.
+        """
         self.__file_line_counter_model.set_line_count_results(
             line_counting_results
         )
@@ -101,6 +541,9 @@ class FileLineCounterController:
         Sum the total added lines of all file classes processed.
         Sum the total deleted lines of all file classes processed.
         """
+        if isinstance(line_counting_results, ComparisonResultStore):
+            return line_counting_results.get_totals()
+
         total_physical_lines = 0
         total_added_lines = 0
         total_removed_lines = 0
@@ -122,106 +565,909 @@ class FileLineCounterController:
         self,
         old_directory: Path,
         new_directory: Path,
-        line_counting_results
+        line_counting_results,
+        progress=None
     ):
         """
         Recursively processes a directory to count lines
         in all Python classes.
         """
-        old_files = {
-            file.relative_to(old_directory): file for file in old_directory.rglob("*.py")
-        }
-        new_files = {
-            file.relative_to(new_directory): file for file in new_directory.rglob("*.py")
-        }
+        progress = progress or ComparisonProgress()
+
+        with self.__profiler.stage("discovery"):
+            old_files = {
+                file.relative_to(old_directory): file
+                for file in self.__tree_walker.walk(old_directory).files
+            }
+            new_files = {
+                file.relative_to(new_directory): file
+                for file in self.__tree_walker.walk(new_directory).files
+            }
+
+            file_pairs = [
+                (new_files[relative_path], old_files[relative_path])
+                for relative_path in sorted(old_files.keys() & new_files.keys())
+            ]
+
+            deleted_paths = old_files.keys() - new_files.keys()
+            added_paths = new_files.keys() - old_files.keys()
+
+        unchanged_trees = []
+        if self.__skip_unchanged_trees:
+            unchanged_trees = self.__find_unchanged_trees(
+                old_directory, old_files, new_directory, new_files
+            )
+            unchanged_paths = {
+                Path(relative_path)
+                for _, _, relative_paths in unchanged_trees
+                for relative_path in relative_paths
+            }
+            file_pairs = [
+                (new_file, old_file) for new_file, old_file in file_pairs
+                if old_file.relative_to(old_directory) not in unchanged_paths
+            ]
+
+        for rename in self.__detect_renames(
+            old_files, new_files, deleted_paths, added_paths
+        ):
+            file_pairs.append(
+                (new_files[rename.new_file], old_files[rename.old_file])
+            )
+
+        unchanged_count = sum(
+            len(relative_paths) for _, _, relative_paths in unchanged_trees
+        )
+        self.__profiler.add_count("files_compared", len(file_pairs))
+        self.__profiler.add_count("files_deleted", len(deleted_paths))
+        self.__profiler.add_count("files_added", len(added_paths))
+        progress.start(
+            unchanged_count + len(file_pairs) + len(deleted_paths) +
+            len(added_paths)
+        )
+
+        for directory, directory_hash, relative_paths in unchanged_trees:
+            tree_metrics = self.__get_unchanged_tree_metrics(
+                directory, directory_hash, relative_paths, new_files
+            )
+            for relative_path in relative_paths:
+                if progress.is_cancelled():
+                    return
+                old_file = old_files[Path(relative_path)]
+                line_counting_results[old_file] = tree_metrics[relative_path]
+                progress.file_done(old_file, tree_metrics[relative_path])
+
+        for (_, old_file), comparison in self.__compare_file_pairs(
+            file_pairs, progress
+        ):
+            self.__store_comparison(
+                line_counting_results, old_file, comparison, progress
+            )
 
-        for relative_path in old_files.keys() & new_files.keys():
+        for relative_path in sorted(deleted_paths):
+            if progress.is_cancelled():
+                return
             old_file = old_files[relative_path]
+            with self.__profiler.stage("analysis"):
+                class_name = self.__file_analyzer_controller.extract_class(
+                    self.iter_file_lines(old_file)
+                )
+            line_counting_results[old_file] = (f"Deleted ({class_name})", 0, 0, 0, 0)
+            progress.file_done(old_file, line_counting_results[old_file])
+
+        for relative_path in sorted(added_paths):
+            if progress.is_cancelled():
+                return
             new_file = new_files[relative_path]
-            file_metrics = self.get_file_metrics(new_file, old_file)
-            line_counting_results[old_file] = file_metrics
+            new_file_metrics = self.get_file_basic_metrics(new_file)
+            line_counting_results[new_file] = new_file_metrics
+            progress.file_done(new_file, new_file_metrics)
 
-        for relative_path in old_files.keys() - new_files.keys():
-            old_file = old_files[relative_path]
-            class_name = self.__file_analyzer_controller.extract_class(
-                self.get_file_lines(relative_path)
+    def __find_unchanged_trees(self, old_directory, old_files,
+                               new_directory, new_files):
+        """
+        Hashes both trees and returns the (directory, hash, relative
+        file paths) of the outermost directories that are the same in
+        both. Paths are relative to the compared roots, with '/'.
+        """
+        with self.__profiler.stage("tree_hashing"):
+            old_index = TreeHashIndex(
+                old_directory, old_files.values(), self.__metrics_cache
+            )
+            new_index = TreeHashIndex(
+                new_directory, new_files.values(), self.__metrics_cache
             )
-            line_counting_results[old_file] = (f"Deleted ({class_name})", 0, 0, 0, 0)
 
-        for relative_path in new_files.keys() - old_files.keys():
+        self.__profiler.add_count(
+            "files_hashed",
+            old_index.get_hashed_file_count() +
+            new_index.get_hashed_file_count()
+        )
+
+        unchanged_trees = [
+            (
+                directory,
+                old_index.get_directory_hash(directory),
+                old_index.get_files(directory)
+            )
+            for directory in old_index.get_unchanged_directories(new_index)
+        ]
+
+        self.__profiler.add_count("trees_unchanged", len(unchanged_trees))
+        self.__profiler.add_count(
+            "files_unchanged",
+            sum(len(relative_paths) for _, _, relative_paths in unchanged_trees)
+        )
+        return unchanged_trees
+
+    def __get_unchanged_tree_metrics(self, directory, directory_hash,
+                                     relative_paths, new_files):
+        """
+        Returns the metrics of every file of a directory that is the
+        same in both versions, by path relative to the compared root.
+
+        The metrics of the whole directory are cached under its hash,
+        keyed by the paths inside it, so a package seen before costs a
+        single lookup wherever it is. On a miss each file is read once
+        and compared with itself in memory.
+        """
+        prefix_length = len(directory) + 1 if directory else 0
+
+        tree_metrics = self.__get_cached_metrics(
+            "tree",
+            (),
+            lambda: [
+                [
+                    relative_path[prefix_length:],
+                    *self.__compute_identical_file_metrics(
+                        new_files[Path(relative_path)]
+                    )
+                ]
+                for relative_path in relative_paths
+            ],
+            (directory_hash,)
+        )
+
+        return {
+            directory + "/" + file_metrics[0] if directory
+            else file_metrics[0]: tuple(file_metrics[1:])
+            for file_metrics in tree_metrics
+        }
+
+    def __detect_renames(self, old_files, new_files, deleted_paths,
+                         added_paths):
+        """
+        Finds the deleted files that reappear among the added ones,
+        removes them from both sets of relative paths and returns the
+        DetectedRename pairs. `old_files` and `new_files` map relative
+        paths to files.
+        """
+        self.__detected_renames = []
+        if self.__rename_detector is None or not deleted_paths or \
+                not added_paths:
+            return []
+
+        with self.__profiler.stage("rename_detection"):
+            self.__detected_renames = self.__rename_detector.find_renames(
+                sorted(deleted_paths),
+                sorted(added_paths),
+                lambda relative_path: self.get_file_lines(
+                    old_files[relative_path]
+                    if relative_path in deleted_paths
+                    else new_files[relative_path]
+                )
+            )
+
+        for rename in self.__detected_renames:
+            deleted_paths.discard(rename.old_file)
+            added_paths.discard(rename.new_file)
+
+        self.__profiler.add_count(
+            "files_renamed", len(self.__detected_renames)
+        )
+        return list(self.__detected_renames)
+
+    def create_snapshot(self, directory):
+        """
+        Returns the SnapshotManifest of the Python files of a
+        directory, listed by the tree walker, with the metrics computed
+        with the current standard rules and counting engine.
+        """
+        directory = Path(directory).resolve()
+        entries = []
+
+        self.__profiler.start()
+        try:
+            with self.__profiler.stage("discovery"):
+                files = self.__tree_walker.walk(directory).files
+
+            for file_path in files:
+                entries.append(self.__compute_snapshot_entry(
+                    file_path.relative_to(directory).as_posix(), file_path
+                ))
+        finally:
+            self.__profiler.stop()
+            self.__flush_metrics_cache()
+
+        return SnapshotManifest(
+            directory, self.__get_snapshot_settings(), entries
+        )
+
+    def __compute_snapshot_entry(self, relative_path, file_path):
+        """
+        Computes the SnapshotEntry of a file.
+        """
+        stat_result = file_path.stat()
+        with self.__profiler.stage("read"):
+            content_hash = MetricsCache.hash_file(file_path)
+        self.__count_bytes_read(file_path)
+
+        class_name, physical_lines, methods, complies_with_standard = \
+            self.__get_cached_metrics(
+                "snapshot",
+                (),
+                lambda: self.__compute_snapshot_metrics(
+                    self.get_file_lines(file_path)
+                ),
+                (content_hash,)
+            )
+
+        return SnapshotEntry(
+            relative_path,
+            stat_result.st_size,
+            stat_result.st_mtime_ns,
+            content_hash,
+            class_name,
+            physical_lines,
+            methods,
+            complies_with_standard
+        )
+
+    def __compute_snapshot_metrics(self, file_lines):
+        """
+        Computes the class name, physical lines and methods of the
+        reformatted lines of a file, and whether they comply with the
+        standard.
+        """
+        with self.__profiler.stage("reformat"):
+            file_lines = self.__file_comparer_controller.format_long_lines(
+                file_lines
+            )
+
+        complies_with_standard = \
+            self.__validate_file_compliance_with_standard(file_lines)
+
+        with self.__profiler.stage("analysis"):
+            class_name, physical_lines, methods = \
+                self.__file_analyzer_controller.get_all_data(file_lines)
+
+        return class_name, physical_lines, methods, complies_with_standard
+
+    def __get_snapshot_settings(self):
+        """
+        Returns the settings that affect the metrics of a snapshot.
+        """
+        return {
+            "standard_rules": list(self.__standard_rules),
+            "counting_engine": self.__counting_engine,
+        }
+
+    def __process_manifest(self, manifest, new_directory,
+                           line_counting_results, progress):
+        """
+        Compares a new directory with a snapshot manifest of the old
+        one.
+
+        Only the old files whose content hash differs from their new
+        version are read, from the snapshot root. The unchanged files
+        reuse the metrics of the manifest when they were computed with
+        the current settings. The comparison always runs in memory, as
+        in read-only mode, so the snapshot tree is never rewritten.
+        """
+        old_root = manifest.get_root()
+        entries = {
+            Path(path): entry for path, entry in manifest.get_entries().items()
+        }
+        reuse_metrics = manifest.get_settings() == \
+            self.__get_snapshot_settings()
+
+        with self.__profiler.stage("discovery"):
+            new_files = {
+                file.relative_to(new_directory): file
+                for file in self.__tree_walker.walk(new_directory).files
+            }
+            old_files = {
+                relative_path: old_root / relative_path
+                for relative_path in entries
+            }
+
+            path_pairs = [
+                (relative_path, relative_path)
+                for relative_path in sorted(entries.keys() & new_files.keys())
+            ]
+
+            deleted_paths = entries.keys() - new_files.keys()
+            added_paths = new_files.keys() - entries.keys()
+
+        for rename in self.__detect_renames(
+            old_files, new_files, deleted_paths, added_paths
+        ):
+            path_pairs.append((rename.old_file, rename.new_file))
+
+        self.__profiler.add_count("files_deleted", len(deleted_paths))
+        self.__profiler.add_count("files_added", len(added_paths))
+        progress.start(len(path_pairs) + len(deleted_paths) + len(added_paths))
+
+        for old_path, new_path in path_pairs:
+            if progress.is_cancelled():
+                return
+            old_file = old_files[old_path]
+            self.__store_comparison(
+                line_counting_results,
+                old_file,
+                self.__split_code_unit_changes(
+                    self.__get_manifest_pair_metrics(
+                        entries[old_path], old_file, new_files[new_path],
+                        reuse_metrics
+                    )
+                ),
+                progress
+            )
+
+        for relative_path in sorted(deleted_paths):
+            if progress.is_cancelled():
+                return
+            old_file = old_files[relative_path]
+            line_counting_results[old_file] = \
+                (f"Deleted ({entries[relative_path].class_name})", 0, 0, 0, 0)
+            progress.file_done(old_file, line_counting_results[old_file])
+
+        for relative_path in sorted(added_paths):
+            if progress.is_cancelled():
+                return
             new_file = new_files[relative_path]
             new_file_metrics = self.get_file_basic_metrics(new_file)
             line_counting_results[new_file] = new_file_metrics
+            progress.file_done(new_file, new_file_metrics)
+
+    def __get_manifest_pair_metrics(self, entry, old_file, new_file,
+                                    reuse_metrics):
+        """
+        Returns the metrics of a new file compared with the snapshot
+        entry of its old version, reading the old file only when the
+        contents differ. A changed file whose old version is gone from
+        the snapshot root gets an error result.
+        """
+        with self.__profiler.stage("read"):
+            new_hash = MetricsCache.hash_file(new_file)
+        self.__count_bytes_read(new_file)
+
+        if new_hash == entry.sha256:
+            self.__profiler.add_count("files_unchanged")
+            if reuse_metrics:
+                return entry.get_unchanged_metrics()
+
+            return self.__get_cached_metrics(
+                "pair",
+                (),
+                lambda: self.__compute_identical_file_metrics(new_file),
+                (new_hash, new_hash)
+            )
+
+        try:
+            old_stat = old_file.stat()
+        except OSError as e:
+            logging.error(
+                f"{old_file} is in the snapshot but can't be read, so it "
+                f"is not compared: {e}"
+            )
+            return "error", "Old file missing from the snapshot", "None"
+
+        self.__profiler.add_count("files_compared")
+        content_ids = (entry.sha256, new_hash)
+        if not entry.is_stat_unchanged(old_stat):
+            logging.warning(
+                f"{old_file} changed since the snapshot was taken; it is "
+                f"compared as it is now."
+            )
+            content_ids = None
+
+        return self.__get_cached_metrics(
+            "pair",
+            (old_file, new_file),
+            lambda: self.__compute_file_metrics_in_memory(
+                new_file, old_file
+            ),
+            content_ids
+        )
+
+    def __compute_identical_file_metrics(self, file_path):
+        """
+        Computes the metrics of a file compared with an identical copy
+        of itself, reading it once.
+        """
+        file_lines = self.get_file_lines(file_path)
+        return self.__compute_lines_metrics(
+            file_lines, file_lines, lambda: True
+        )
+
+    def __compare_file_pairs(self, file_pairs, progress):
+        """
+        Yields every (new file, old file) pair with its metrics and
+        code unit changes.
+
+        When more than one worker is configured the pairs are fanned
+        out to a process pool. The metrics are yielded in the same
+        order as `file_pairs` so the results stay deterministic, and
+        no more pairs are processed once the progress is cancelled.
+        """
+        if self.__max_workers <= 1 or len(file_pairs) <= 1:
+            for new_file, old_file in file_pairs:
+                if progress.is_cancelled():
+                    return
+                yield (new_file, old_file), \
+                    self.get_file_comparison(new_file, old_file)
+            return
+
+        pending_pairs = file_pairs
+        cache_keys = cached_metrics = None
+
+        if self.__metrics_cache is not None:
+            cache_keys = [
+                self.__metrics_cache.make_key(
+                    self.__get_cache_kind("pair"), old_file, new_file
+                )
+                for new_file, old_file in file_pairs
+            ]
+            cached_metrics = [
+                self.__metrics_cache.get(key) for key in cache_keys
+            ]
+            pending_pairs = [
+                file_pair
+                for file_pair, metrics in zip(file_pairs, cached_metrics)
+                if metrics is None
+            ]
+            cache_hits = len(file_pairs) - len(pending_pairs)
+            self.__profiler.add_count("cache_hits", cache_hits)
+            self.__profiler.add_count("cache_misses", len(pending_pairs))
+        else:
+            cache_keys = cached_metrics = [None] * len(file_pairs)
+
+        get_pair_metrics = partial(
+            _get_file_pair_metrics,
+            read_only=self.__read_only,
+            output_directory=self.__output_directory,
+            standard_rules=self.__standard_rules,
+            counting_engine=self.__counting_engine,
+            diff_engine=self.__diff_engine,
+            code_unit_breakdown=self.__code_unit_breakdown,
+            profile=self.__profiler.is_enabled()
+        )
+        executor = ProcessPoolExecutor(max_workers=self.__max_workers)
+
+        try:
+            computed_results = executor.map(get_pair_metrics, pending_pairs)
+
+            for file_pair, key, metrics in zip(
+                file_pairs, cache_keys, cached_metrics
+            ):
+                if progress.is_cancelled():
+                    return
+                if metrics is None:
+                    comparison, worker_report = next(computed_results)
+                    if worker_report is not None:
+                        self.__profiler.merge_report(worker_report)
+                    if key is not None:
+                        self.__metrics_cache.put(
+                            key, self.__join_code_unit_changes(*comparison)
+                        )
+                    yield file_pair, comparison
+                else:
+                    yield file_pair, self.__split_code_unit_changes(metrics)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
 
     def get_file_basic_metrics(self, file_path):
         """
         Retrieves the physical line count of a Python class.
         Retrieves the number of methods in a Python class.
         """
-        file_lines = self.get_file_lines(file_path)
-        is_valid = self.__validate_file_compliance_with_standard(file_lines)
+        return self.__get_cached_metrics(
+            "basic",
+            (file_path,),
+            lambda: self.__compute_file_basic_metrics(file_path)
+        )
 
-        class_name = self.__file_analyzer_controller.extract_class(
-            file_lines
+    def __compute_file_basic_metrics(self, file_path):
+        """
+        Computes the metrics of a new file.
+        """
+        is_valid = self.__validate_file_path_compliance_with_standard(
+            file_path
         )
-        
+
         if not is_valid:
             return "New file doesn't comply with Standard", 0, 0, 0, 0
-        
-        new_lines = \
-            self.__file_analyzer_controller.count_physical_lines(file_lines)
-        methods_count = \
-            self.__file_analyzer_controller.count_methods(file_lines)
 
-        return f"New file ({class_name})", new_lines, methods_count, 0, new_lines
+        return self.__analyze_new_file(self.iter_file_lines(file_path))
+
+    def __compute_lines_basic_metrics(self, file_lines):
+        """
+        Computes the metrics of a new file given as a list of lines.
+        """
+        if not self.__validate_file_compliance_with_standard(file_lines):
+            return "New file doesn't comply with Standard", 0, 0, 0, 0
+
+        return self.__analyze_new_file(file_lines)
+
+    def __analyze_new_file(self, file_lines):
+        """
+        Counts a new file: all its physical lines are added lines.
+        """
+        with self.__profiler.stage("analysis"):
+            analysis = self.__file_analyzer_controller.analyze(file_lines)
+        new_lines = analysis.physical_lines
+
+        return f"New file ({analysis.class_name})", new_lines, \
+            analysis.methods, 0, new_lines
 
     def get_file_metrics(self, new_file_path, old_file_path):
         """
         Retrieves the physical line count of a Python class.
         Retrieves the class name and methods count of a Python class.
         """
-        self.__file_comparer_controller.format_file_long_lines(old_file_path)
-        self.__file_comparer_controller.format_file_long_lines(new_file_path)
+        return self.get_file_comparison(new_file_path, old_file_path)[0]
 
-        file_lines_old_file = self.get_file_lines(old_file_path)
-        file_lines_new_file = self.get_file_lines(new_file_path)
+    def get_file_comparison(self, new_file_path, old_file_path):
+        """
+        Returns the metrics of a pair of versions of a file and the
+        CodeUnitChange of its top-level classes and functions, which
+        are empty unless the code unit breakdown is enabled.
+        """
+        return self.__split_code_unit_changes(self.__get_cached_metrics(
+            "pair",
+            (old_file_path, new_file_path),
+            lambda: self.__compute_file_metrics(new_file_path, old_file_path)
+        ))
 
-        is_valid_old_file = self.__validate_file_compliance_with_standard(file_lines_old_file)
-        is_valid_new_file = self.__validate_file_compliance_with_standard(file_lines_new_file)
-           
-        if is_valid_old_file and is_valid_new_file:
-            class_name, physical_line_count, methods_count = \
-                self.__file_analyzer_controller.get_all_data(file_lines_new_file)
+    def __store_comparison(self, line_counting_results, file_path,
+                           comparison, progress):
+        """
+        Stores the metrics and code unit changes of a compared file and
+        reports it as done.
+        """
+        metrics, code_unit_changes = comparison
+        line_counting_results[file_path] = metrics
+        if code_unit_changes:
+            line_counting_results.set_code_unit_changes(
+                file_path, code_unit_changes
+            )
+        progress.file_done(file_path, metrics)
 
-            added_lines, removed_lines = \
-                    self.__file_comparer_controller.compare_files(
-                        old_file_path,
-                        new_file_path
-                    )
+    def __join_code_unit_changes(self, metrics, code_unit_changes):
+        """
+        Appends the code unit changes to the metrics of a pair as a
+        list of rows, the form they are cached in.
+        """
+        if not self.__code_unit_breakdown:
+            return metrics
+
+        return tuple(metrics) + (
+            [list(change) for change in code_unit_changes],
+        )
+
+    def __split_code_unit_changes(self, metrics):
+        """
+        Splits the metrics of a pair from the code unit changes joined
+        to them, if any.
+        """
+        if len(metrics) <= 5:
+            return tuple(metrics), ()
+
+        return tuple(metrics[:5]), tuple(
+            CodeUnitChange(*change) for change in metrics[5]
+        )
+
+    def __get_cached_metrics(self, kind, file_paths, compute_metrics,
+                             content_ids=None):
+        """
+        Returns the metrics of the given files from the metrics cache,
+        computing and storing them on a miss. Without a cache the
+        metrics are always computed. When `content_ids` are given the
+        key is built from them instead of hashing the files.
+
+        The key is taken before computing, because the comparison
+        rewrites the files being compared.
+        """
+        if self.__metrics_cache is None:
+            return compute_metrics()
+
+        if content_ids is not None:
+            key = self.__metrics_cache.make_content_key(
+                self.__get_cache_kind(kind), *content_ids
+            )
+        else:
+            key = self.__metrics_cache.make_key(
+                self.__get_cache_kind(kind), *file_paths
+            )
+        metrics = self.__metrics_cache.get(key)
+
+        if metrics is None:
+            self.__profiler.add_count("cache_misses")
+            metrics = compute_metrics()
+            self.__metrics_cache.put(key, metrics)
+        else:
+            self.__profiler.add_count("cache_hits")
+
+        return metrics
+
+    def __flush_metrics_cache(self):
+        """
+        Saves the entries used by a comparison in the metrics cache.
+        """
+        if self.__metrics_cache is not None:
+            self.__metrics_cache.flush()
+
+    def __get_cache_kind(self, kind):
+        """
+        Adds the selected rules, counting engine, diff engine and code
+        unit breakdown to a kind of metrics, so results computed
+        differently are not reused.
+        """
+        kind = f"{kind}|{','.join(self.__standard_rules)}|" \
+            f"{self.__counting_engine}|{self.__diff_engine}"
+        if self.__code_unit_breakdown:
+            kind += "|units"
+        return kind
 
-            self.__file_comparer_controller.add_modification_comments(
-                old_file_path, 
+    def __compute_file_metrics(self, new_file_path, old_file_path):
+        """
+        Computes the metrics of a pair of versions of a file.
+        """
+        if self.__read_only:
+            return self.__compute_file_metrics_in_memory(
+                new_file_path, old_file_path
+            )
+
+        with self.__profiler.stage("reformat"):
+            self.__file_comparer_controller.format_file_long_lines(
+                old_file_path
+            )
+            self.__file_comparer_controller.format_file_long_lines(
                 new_file_path
             )
+        self.__count_bytes_written(old_file_path, new_file_path)
 
-            return class_name, physical_line_count, \
-            methods_count, added_lines, removed_lines
+        is_valid_old_file = self.__validate_file_path_compliance_with_standard(
+            old_file_path
+        )
+        is_valid_new_file = is_valid_old_file and \
+            self.__validate_file_path_compliance_with_standard(new_file_path)
+           
+        if is_valid_old_file and is_valid_new_file:
+            with self.__profiler.stage("analysis"):
+                analysis = self.__file_analyzer_controller.analyze(
+                    self.iter_file_lines(new_file_path)
+                )
+                code_unit_changes = self.__compare_code_units(
+                    lambda: self.iter_file_lines(old_file_path), analysis
+                )
+
+            with self.__profiler.stage("diff"):
+                diff_result = self.__file_comparer_controller.diff_files(
+                    old_file_path,
+                    new_file_path
+                )
+            self.__count_bytes_read(old_file_path, new_file_path)
+
+            with self.__profiler.stage("annotation"):
+                self.__file_comparer_controller.add_modification_comments(
+                    old_file_path,
+                    new_file_path,
+                    diff_result
+                )
+            if diff_result.has_changes():
+                self.__count_bytes_written(old_file_path, new_file_path)
+
+            return self.__join_code_unit_changes((
+                analysis.class_name, analysis.physical_lines,
+                analysis.methods, diff_result.added_lines,
+                diff_result.removed_lines
+            ), code_unit_changes)
 
         return "Doesn't comply with Standard", 0, 0, 0, 0
     
+    def __compute_file_metrics_in_memory(self, new_file_path, old_file_path):
+        """
+        Computes the same metrics as the default mode without writing
+        to the compared files.
+        """
+        annotated_paths = None
+        if self.__output_directory is not None:
+            annotated_paths = tuple(
+                self.__get_mirrored_output_path(file_path)
+                for file_path in (old_file_path, new_file_path)
+            )
+
+        return self.__compute_lines_metrics(
+            self.get_file_lines(old_file_path),
+            self.get_file_lines(new_file_path),
+            lambda: self.__file_comparer_controller.files_are_identical(
+                Path(old_file_path), Path(new_file_path)
+            ),
+            annotated_paths
+        )
+
+    def __compute_lines_metrics(self, old_file_lines, new_file_lines,
+                                are_identical, annotated_paths=None):
+        """
+        Computes the metrics of two versions of a file given as lists
+        of lines. `are_identical()` tells whether the diff can be
+        skipped, and the annotated versions are written to the
+        (old, new) `annotated_paths` when given.
+        """
+        with self.__profiler.stage("reformat"):
+            old_file_lines = \
+                self.__file_comparer_controller.format_long_lines(
+                    old_file_lines
+                )
+            new_file_lines = \
+                self.__file_comparer_controller.format_long_lines(
+                    new_file_lines
+                )
+
+        is_valid_old_file = \
+            self.__validate_file_compliance_with_standard(old_file_lines)
+        is_valid_new_file = is_valid_old_file and \
+            self.__validate_file_compliance_with_standard(new_file_lines)
+
+        if not (is_valid_old_file and is_valid_new_file):
+            return "Doesn't comply with Standard", 0, 0, 0, 0
+
+        with self.__profiler.stage("analysis"):
+            analysis = self.__file_analyzer_controller.analyze(new_file_lines)
+            code_unit_changes = self.__compare_code_units(
+                lambda: old_file_lines, analysis
+            )
+        class_name, physical_line_count, methods_count = \
+            analysis.class_name, analysis.physical_lines, analysis.methods
+
+        with self.__profiler.stage("diff"):
+            if are_identical():
+                return self.__join_code_unit_changes(
+                    (class_name, physical_line_count, methods_count, 0, 0),
+                    code_unit_changes
+                )
+
+            diff_result = self.__file_comparer_controller.diff_lines(
+                old_file_lines, new_file_lines
+            )
+
+        if annotated_paths is not None and diff_result.has_changes():
+            with self.__profiler.stage("annotation"):
+                self.__write_annotated_files(annotated_paths, diff_result)
+
+        return self.__join_code_unit_changes((
+            class_name, physical_line_count, methods_count,
+            diff_result.added_lines, diff_result.removed_lines
+        ), code_unit_changes)
+
+    def __compare_code_units(self, get_old_file_lines, new_analysis):
+        """
+        Compares the units of the analysis of a new file with those of
+        its old version, counted only when the code unit breakdown is
+        enabled.
+        """
+        if not self.__code_unit_breakdown:
+            return ()
+
+        return compare_code_units(
+            self.__file_analyzer_controller.analyze(
+                get_old_file_lines()
+            ).units,
+            new_analysis.units
+        )
+
+    def __get_mirrored_output_path(self, file_path):
+        """
+        Returns where the annotated version of a file is written: its
+        absolute path mirrored under the output directory.
+        """
+        absolute_path = Path(file_path).resolve()
+        return self.__output_directory / \
+            absolute_path.relative_to(absolute_path.anchor)
+
+    def __write_annotated_files(self, annotated_paths, diff_result):
+        """
+        Writes the annotated old and new versions of a file to the
+        given output paths.
+        """
+        annotated_files = zip(
+            annotated_paths,
+            self.__file_comparer_controller.render_modification_comments(
+                diff_result
+            )
+        )
+
+        for output_path, annotated_lines in annotated_files:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+
+            with output_path.open("w", encoding="utf-8") as output_file:
+                output_file.writelines(annotated_lines)
+            self.__count_bytes_written(output_path)
+
     def get_file_lines(self, file_path):
         """
         Reads the lines of a given file.
         """
+        with self.__profiler.stage("read"):
+            file_reader = FileReader(file_path)
+            file_lines = file_reader.read_file()
+        self.__count_bytes_read(file_path)
+        return file_lines
+
+    def iter_file_lines(self, file_path):
+        """
+        Streams the lines of a given file without loading it whole.
+        The time spent reading is part of the stage that consumes them.
+        """
+        self.__count_bytes_read(file_path)
         file_reader = FileReader(file_path)
-        return file_reader.read_file()
+        return file_reader.iter_lines()
 
     def __validate_file_compliance_with_standard(self, file_lines):
         """
         Validates whether a file complies with Python coding standards.
         """
-        standard_validator = PythonStandardValidatorController(file_lines)
-        return standard_validator.validate_compliance_with_standard()
+        with self.__profiler.stage("validation"):
+            standard_validator = PythonStandardValidatorController(
+                file_lines, self.__standard_rules
+            )
+            return standard_validator.validate_compliance_with_standard()
+
+    def __validate_file_path_compliance_with_standard(self, file_path):
+        """
+        Validates a file on disk, scanning its memory-mapped content
+        so it is never loaded whole.
+        """
+        self.__count_bytes_read(file_path)
+        with ExitStack() as file_stack:
+            with self.__profiler.stage("read"):
+                file_buffer = file_stack.enter_context(
+                    FileReader(file_path).open_buffer()
+                )
+            return self.__validate_file_compliance_with_standard(file_buffer)
+
+    def __count_bytes_read(self, *file_paths):
+        """
+        Adds the size of the given files to the bytes read, only when
+        profiling is enabled.
+        """
+        if self.__profiler.is_enabled():
+            self.__profiler.add_bytes_read(self.__get_total_size(file_paths))
+
+    def __count_bytes_written(self, *file_paths):
+        """
+        Adds the size of the given files to the bytes written, only
+        when profiling is enabled.
+        """
+        if self.__profiler.is_enabled():
+            self.__profiler.add_bytes_written(
+                self.__get_total_size(file_paths)
+            )
+
+    def __get_total_size(self, file_paths):
+        """
+        Returns the total size of the files that exist.
+        """
+        total_size = 0
+
+        for file_path in file_paths:
+            try:
+                total_size += Path(file_path).stat().st_size
+            except OSError:
+                pass
+
+        return total_size
     
     def file_exists_anywhere(
         self,
@@ -243,10 +1489,10 @@ class FileLineCounterController:
         if not old_file.is_file():
             return False
 
-        old_file_name = old_file.name
-
-        return any(
-            file.name == old_file_name for file in new_project_root.rglob("*.py")
+        return ProjectFileIndex.for_root(
+            new_project_root, walker=self.__tree_walker
+        ).contains(
+            old_file.name
         )
     
     def find_matching_file(
@@ -258,6 +1504,9 @@ class FileLineCounterController:
         Searches recursively in `new_project_root` for a file with the same name 
         as `old_file` and returns its full path if found.
 
+        When several files share that name, the collision is logged and
+        the first path in sorted order is returned.
+
         Args:
             old_file (Path): Path to the original file (only the name is used).
             new_project_root (Path): Root directory of the new project.
@@ -269,13 +1518,22 @@ class FileLineCounterController:
         if not old_file.is_file():
             return None
 
-        old_file_name = old_file.name
+        matching_files = ProjectFileIndex.for_root(
+            new_project_root, walker=self.__tree_walker
+        ).find(old_file.name)
 
-        for file in new_project_root.rglob("*.py"):
-            if file.name == old_file_name:
-                return file
+        if not matching_files:
+            return None
 
-        return None
+        if len(matching_files) > 1:
+            logging.warning(
+                f"{old_file.name} matches {len(matching_files)} files in "
+                f"{new_project_root}: "
+                f"{', '.join(str(file) for file in matching_files)}. "
+                f"Using {matching_files[0]}."
+            )
+
+        return matching_files[0]
 
     def manage_model_changes(self):
         """
@@ -285,6 +1543,40 @@ class FileLineCounterController:
         line_counting_results = \
             self.__file_line_counter_model.get_line_count_results()
 
-        self.__file_line_counter_view.show_metric_results(
-            line_counting_results
-        )
+        with self.__profiler.stage("render"):
+            self.__file_line_counter_view.show_metric_results(
+                line_counting_results
+            )
+
+    def manage_model_deltas(self, delta):
+        """
+        Forwards the incremental changes of the model to the view.
+        """
+        with self.__profiler.stage("render"):
+            self.__file_line_counter_view.apply_metric_deltas(delta)
+
+
+def _get_file_pair_metrics(file_pair, read_only=False, output_directory=None,
+                           standard_rules=None, counting_engine="heuristic",
+                           diff_engine="difflib", code_unit_breakdown=False,
+                           profile=False):
+    """
+    Computes the metrics of a (new file, old file) pair inside a
+    worker process. The view and model are not sent to the workers.
+
+    Returns the metrics with their code unit changes and, when
+    `profile` is set, the report of the stages run by the worker, or
+    None.
+    """
+    new_file, old_file = file_pair
+    controller = FileLineCounterController()
+    controller.set_read_only(read_only, output_directory)
+    if standard_rules is not None:
+        controller.set_standard_rules(standard_rules)
+    controller.set_counting_engine(counting_engine)
+    controller.set_diff_engine(diff_engine)
+    controller.set_code_unit_breakdown(code_unit_breakdown)
+    if profile:
+        controller.set_profiler(StageProfiler())
+    comparison = controller.get_file_comparison(new_file, old_file)
+    return comparison, controller.get_profiler().get_report()
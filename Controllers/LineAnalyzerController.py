@@ -1,6 +1,40 @@
-class LineAnalyzerController:
+import re
+
+from typing import NamedTuple
+
+from Utils.CodeUnitBreakdown import CodeUnitTracker
+from Utils.CountingEngine import CountingEngine
+
+TOP_LEVEL_DEFINITION = re.compile(r"(class|def|async\s+def)\s+(\w+)")
+
+class LineAnalysisResult(NamedTuple):
+    """
+    Compact record with the metrics gathered by a single pass
+    over a file's content.
+    """
+    physical_lines: int
+    methods: int
+    class_names: tuple
+    in_docstring: bool
+    methods_by_class: tuple = ()
+    units: tuple = ()
+
+    @property
+    def class_name(self):
+        """Returns the first class name found or 'No class'."""
+        return self.class_names[0] if self.class_names else "No class"
+
+
+class LineAnalyzerController(CountingEngine):
     """
     Analyzes a code's content to count physical lines of code.
+
+    The content can be a list of lines or any iterator of lines, such
+    as `FileReader.iter_lines`, so files are never required to be
+    loaded whole. Each method walks the content once.
+
+    This is the fast heuristic engine: it looks at the start of each
+    line only. TokenLineAnalyzerController is the exact alternative.
     """
 
     def count_physical_lines(self, content):
@@ -61,12 +95,87 @@ class LineAnalyzerController:
             
         return "No class" 
     
-    def get_all_data(self, content):
+    def analyze(self, content):
         """
-        Get all data from the file.
+        Computes the physical lines, methods count, class names and
+        docstring state of the content in a single pass.
+
+        The rules applied to each line are the same ones used by
+        `count_physical_lines`, `count_methods` and `extract_class`,
+        so the results match calling them one after the other.
+        The same pass splits the counts among the top-level classes
+        and functions, which start at a non-indented physical line.
+
+        Args:
+            content (Iterable[str]): Lines of the file to analyze.
+
+        Returns:
+            LineAnalysisResult: The metrics of the content.
         """
-        physical_lines = self.count_physical_lines(content)
-        methods = self.count_methods(content)
-        class_name = self.extract_class(content)
+        physical_line_count = 0
+        methods_count = 0
+        class_names = []
+        in_docstring = False
+        unit_tracker = CodeUnitTracker()
+
+        for line in content:
+            stripped_line = line.strip()
+            is_method = stripped_line.startswith("def ")
+
+            if is_method:
+                methods_count += 1
+            elif stripped_line.startswith("class "):
+                class_names.append(line[6:-2])
+
+            is_physical_line = False
+
+            if not stripped_line or stripped_line.startswith("#"):
+                pass
+            elif (stripped_line.startswith('"""') and
+                  stripped_line.endswith('"""') and
+                  len(stripped_line) > 3):
+                pass
+            elif stripped_line.startswith('"""'):
+                in_docstring = not in_docstring
+            elif not in_docstring:
+                is_physical_line = True
+
+            starts_unit = False
+            if is_physical_line and not line[0].isspace():
+                starts_unit = self.__start_top_level_statement(
+                    unit_tracker, stripped_line
+                )
+
+            if is_method and not starts_unit:
+                unit_tracker.add_method()
+
+            if is_physical_line:
+                physical_line_count += 1
+                unit_tracker.add_lines(1)
+
+        return LineAnalysisResult(
+            physical_line_count,
+            methods_count,
+            tuple(class_names),
+            in_docstring,
+            units=unit_tracker.get_units()
+        )
+
+    def __start_top_level_statement(self, unit_tracker, stripped_line):
+        """
+        Reports a non-indented line to the unit tracker. Returns
+        whether it opens a class or function.
+        """
+        if stripped_line.startswith("@"):
+            unit_tracker.start_top_level_statement(CodeUnitTracker.DECORATOR)
+            return False
+
+        definition = TOP_LEVEL_DEFINITION.match(stripped_line)
+        if definition is None:
+            unit_tracker.start_top_level_statement()
+            return False
 
-        return class_name, physical_lines, methods
\ No newline at end of file
+        kind = CodeUnitTracker.CLASS if definition.group(1) == "class" \
+            else CodeUnitTracker.FUNCTION
+        unit_tracker.start_top_level_statement(kind, definition.group(2))
+        return True
@@ -0,0 +1,186 @@
+from Utils.DiffEngine import DiffEngine
+
+class MyersDiffController(DiffEngine):
+    """
+    Diff engine implementing the linear-space variant of Myers'
+    O(ND) difference algorithm.
+
+    Lines are interned to integers before diffing, so every comparison
+    made by the algorithm is an integer comparison instead of a string
+    comparison. The result is a shortest edit script, and the running
+    time depends on the number of differences rather than on how often
+    lines such as blank lines or `pass` repeat.
+    """
+
+    def get_opcodes(self, old_lines, new_lines):
+        """
+        Returns the opcodes that transform `old_lines` into `new_lines`.
+        """
+        old_ids, new_ids = self.__intern_lines(old_lines, new_lines)
+        matching_blocks = self.__get_matching_blocks(old_ids, new_ids)
+
+        return self.__blocks_to_opcodes(
+            matching_blocks, len(old_ids), len(new_ids)
+        )
+
+    def __intern_lines(self, old_lines, new_lines):
+        """
+        Maps every distinct line to an integer identifier.
+        """
+        line_ids = {}
+        old_ids = [line_ids.setdefault(line, len(line_ids))
+                   for line in old_lines]
+        new_ids = [line_ids.setdefault(line, len(line_ids))
+                   for line in new_lines]
+
+        return old_ids, new_ids
+
+    def __get_matching_blocks(self, a, b):
+        """
+        Returns the sorted (i, j, size) runs of equal lines on a
+        shortest edit path between `a` and `b`.
+
+        Ranges are split at their middle snake and processed with an
+        explicit stack, so memory stays linear and deep recursions are
+        avoided.
+        """
+        matches = []
+        pending_ranges = [(0, len(a), 0, len(b))]
+
+        while pending_ranges:
+            a_lo, a_hi, b_lo, b_hi = pending_ranges.pop()
+
+            while a_lo < a_hi and b_lo < b_hi and a[a_lo] == b[b_lo]:
+                matches.append((a_lo, b_lo, 1))
+                a_lo += 1
+                b_lo += 1
+
+            while a_lo < a_hi and b_lo < b_hi and \
+                    a[a_hi - 1] == b[b_hi - 1]:
+                a_hi -= 1
+                b_hi -= 1
+                matches.append((a_hi, b_hi, 1))
+
+            if a_lo == a_hi or b_lo == b_hi:
+                continue
+
+            x_start, y_start, x_end, y_end = self.__find_middle_snake(
+                a, a_lo, a_hi, b, b_lo, b_hi
+            )
+
+            if x_end > x_start:
+                matches.append((x_start, y_start, x_end - x_start))
+
+            pending_ranges.append((a_lo, x_start, b_lo, y_start))
+            pending_ranges.append((x_end, a_hi, y_end, b_hi))
+
+        matches.sort()
+        return self.__merge_adjacent_blocks(matches)
+
+    def __find_middle_snake(self, a, a_lo, a_hi, b, b_lo, b_hi):
+        """
+        Finds the middle snake of a shortest edit path between
+        a[a_lo:a_hi] and b[b_lo:b_hi], searching forwards and backwards
+        at the same time.
+
+        Returns the absolute (x_start, y_start, x_end, y_end)
+        coordinates of the snake.
+        """
+        n = a_hi - a_lo
+        m = b_hi - b_lo
+        delta = n - m
+        is_odd = delta % 2 == 1
+        max_d = (n + m + 1) // 2
+        offset = max_d + 1
+        forward = [0] * (2 * offset + 1)
+        backward = [0] * (2 * offset + 1)
+
+        for d in range(max_d + 1):
+            for k in range(-d, d + 1, 2):
+                if k == -d or (k != d and
+                               forward[offset + k - 1] <
+                               forward[offset + k + 1]):
+                    x = forward[offset + k + 1]
+                else:
+                    x = forward[offset + k - 1] + 1
+
+                y = x - k
+                x_start, y_start = x, y
+
+                while x < n and y < m and a[a_lo + x] == b[b_lo + y]:
+                    x += 1
+                    y += 1
+
+                forward[offset + k] = x
+                reverse_k = delta - k
+
+                if is_odd and -(d - 1) <= reverse_k <= d - 1 and \
+                        x + backward[offset + reverse_k] >= n:
+                    return (a_lo + x_start, b_lo + y_start,
+                            a_lo + x, b_lo + y)
+
+            for k in range(-d, d + 1, 2):
+                if k == -d or (k != d and
+                               backward[offset + k - 1] <
+                               backward[offset + k + 1]):
+                    x = backward[offset + k + 1]
+                else:
+                    x = backward[offset + k - 1] + 1
+
+                y = x - k
+                x_start, y_start = x, y
+
+                while x < n and y < m and \
+                        a[a_hi - x - 1] == b[b_hi - y - 1]:
+                    x += 1
+                    y += 1
+
+                backward[offset + k] = x
+                forward_k = delta - k
+
+                if not is_odd and -d <= forward_k <= d and \
+                        x + forward[offset + forward_k] >= n:
+                    return (a_hi - x, b_hi - y,
+                            a_hi - x_start, b_hi - y_start)
+
+        raise AssertionError("No middle snake found.")
+
+    def __merge_adjacent_blocks(self, matches):
+        """
+        Joins sorted matching runs that continue each other.
+        """
+        merged_blocks = []
+
+        for i, j, size in matches:
+            if merged_blocks:
+                last_i, last_j, last_size = merged_blocks[-1]
+
+                if last_i + last_size == i and last_j + last_size == j:
+                    merged_blocks[-1] = (last_i, last_j, last_size + size)
+                    continue
+
+            merged_blocks.append((i, j, size))
+
+        return merged_blocks
+
+    def __blocks_to_opcodes(self, matching_blocks, n, m):
+        """
+        Converts matching blocks into SequenceMatcher-style opcodes.
+        """
+        opcodes = []
+        i = j = 0
+
+        for block_i, block_j, size in matching_blocks + [(n, m, 0)]:
+            if i < block_i and j < block_j:
+                opcodes.append(('replace', i, block_i, j, block_j))
+            elif i < block_i:
+                opcodes.append(('delete', i, block_i, j, block_j))
+            elif j < block_j:
+                opcodes.append(('insert', i, block_i, j, block_j))
+
+            i, j = block_i + size, block_j + size
+
+            if size:
+                opcodes.append(('equal', block_i, i, block_j, j))
+
+        return opcodes
@@ -1,8 +1,22 @@
+import mmap
+import re
+
 from Utils.ProgrammingLanguageStandardValidator import (
     ProgrammingLanguageStandardValidator)
 
+from Utils.PythonStandardRules import (
+    LineLengthRule,
+    NestingDepthRule,
+    TabIndentationRule,
+    TrailingWhitespaceRule,
+)
 from Utils.Constants import MAX_CHAR_PER_LINE_STD
 
+LONG_LINE_CANDIDATE = re.compile(
+    rb"[^\n]{%d,}" % (MAX_CHAR_PER_LINE_STD + 1)
+)
+NEWLINE_COUNT_CHUNK_BYTES = 1024 * 1024
+
 class PythonStandardValidatorController(ProgrammingLanguageStandardValidator):
     """
     Controller class for validating Python file compliance with PEP 8.
@@ -11,30 +25,142 @@ class PythonStandardValidatorController(ProgrammingLanguageStandardValidator):
     to check specific Pythoncode formatting rules, such as line length.
     """
 
-    def __init__(self, file):
+    STANDARD_RULES = {
+        LineLengthRule.name: LineLengthRule,
+        TrailingWhitespaceRule.name: TrailingWhitespaceRule,
+        TabIndentationRule.name: TabIndentationRule,
+        NestingDepthRule.name: NestingDepthRule,
+    }
+    DEFAULT_RULES = (LineLengthRule.name,)
+
+    def __init__(self, file, rules=None):
         """
         Initializes the PythonStandardValidatorController with
-        the specified file.
+        the specified file, given as a list or an iterator of lines,
+        or as the raw UTF-8 content (bytes, bytearray or mmap).
+        An iterator is consumed by the validation.
+
+        `rules` are the names of the STANDARD_RULES to check; only
+        the line length is checked by default.
         """
-        super().__init__(file)
+        super().__init__(file, rules)
 
     def validate_compliance_with_standard(self):
         """
         Validates the compliance of the file with PEP 8 standards.
 
         This method checks if all lines in the file comply with
-        the maximum allowedline length (79 characters).
-        If any line exceeds this length, the validation fails.
+        the selected rules, by default the maximum allowed line
+        length (79 characters).
+        If any line breaks a rule, the validation fails.
+        The check stops at the first violation.
+        """
+        for _ in self.iter_violations():
+            return False
+
+        return True
+
+    def get_violations(self):
         """
-        return self.__validate_length_of_line()
+        Returns a RuleViolation for every place where the file breaks
+        one of the selected rules, in line order per rule.
+        """
+        return list(self.iter_violations())
 
-    def __validate_length_of_line(self):
+    def iter_violations(self):
         """
-        Checks the length of each line in the file to ensure
-        it does not exceed the PEP 8 limit of 79 characters.
+        Yields the violations of the selected rules, lazily.
         """
-        for line in self.file:
-            if len(line.strip()) > MAX_CHAR_PER_LINE_STD:
-                return False
+        return self.__iter_violations_of(self.get_rules())
 
-        return True
+    def get_line_length_violations(self):
+        """
+        Returns a RuleViolation for every line longer than the PEP 8
+        limit of 79 characters, whichever rules are selected.
+        """
+        return list(self.__iter_violations_of((LineLengthRule,)))
+
+    def __iter_violations_of(self, rule_classes):
+        """
+        Yields the violations of some rules.
+
+        When the line length is the only rule, a raw buffer is scanned
+        without decoding it; otherwise its lines are decoded one at a
+        time and every rule is checked in the same pass.
+        """
+        if not self.__is_buffer(self.file):
+            return self.iter_rule_violations(self.file, rule_classes)
+
+        if tuple(rule_classes) == (LineLengthRule,):
+            return self.__find_long_lines_in_buffer(self.file)
+
+        return self.iter_rule_violations(
+            self.__iter_buffer_lines(self.file), rule_classes
+        )
+
+    def __is_buffer(self, file):
+        """
+        Checks whether the file is given as its raw content.
+        """
+        return isinstance(file, (bytes, bytearray, mmap.mmap))
+
+    def __iter_buffer_lines(self, buffer):
+        """
+        Yields the decoded lines of a raw buffer one at a time, keeping
+        their line breaks. Windows line endings are normalized to '\\n'
+        as text mode does.
+        """
+        start = 0
+        size = len(buffer)
+
+        while start < size:
+            end = buffer.find(b"\n", start)
+            end = size if end == -1 else end + 1
+            line = buffer[start:end].decode("utf-8", errors="replace")
+
+            if line.endswith("\r\n"):
+                line = line[:-2] + "\n"
+
+            yield line
+            start = end
+
+    def __find_long_lines_in_buffer(self, buffer):
+        """
+        Yields the line length violations of a raw UTF-8 buffer.
+
+        A regular expression finds, in C, the lines with more than 79
+        bytes; a line can't have more characters than bytes, so every
+        other line is accepted without being sliced or decoded. Only
+        those candidates are decoded and checked by LineLengthRule.
+        Line numbers are obtained by counting the newlines before each
+        candidate.
+        """
+        line_length_rule = LineLengthRule()
+        line_number = 1
+        counted_until = 0
+
+        for candidate in LONG_LINE_CANDIDATE.finditer(buffer):
+            start = candidate.start()
+            line_number += self.__count_newlines(buffer, counted_until, start)
+            counted_until = start
+
+            yield from line_length_rule.visit_line(
+                line_number,
+                candidate.group().decode("utf-8", errors="replace")
+            )
+
+    def __count_newlines(self, buffer, start, end):
+        """
+        Counts the line breaks of a part of a buffer. An mmap has no
+        `count`, so it is sliced in chunks of NEWLINE_COUNT_CHUNK_BYTES
+        that are counted in C without copying the whole part at once.
+        """
+        if not isinstance(buffer, mmap.mmap):
+            return buffer.count(b"\n", start, end)
+
+        return sum(
+            buffer[
+                chunk_start:min(chunk_start + NEWLINE_COUNT_CHUNK_BYTES, end)
+            ].count(b"\n")
+            for chunk_start in range(start, end, NEWLINE_COUNT_CHUNK_BYTES)
+        )
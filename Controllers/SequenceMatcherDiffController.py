@@ -0,0 +1,17 @@
+from difflib import SequenceMatcher
+
+from Utils.DiffEngine import DiffEngine
+
+class SequenceMatcherDiffController(DiffEngine):
+    """
+    Diff engine backed by `difflib.SequenceMatcher`.
+
+    It is the historical behaviour of the comparer and stays the
+    default engine.
+    """
+
+    def get_opcodes(self, old_lines, new_lines):
+        """
+        Returns the opcodes computed by SequenceMatcher.
+        """
+        return SequenceMatcher(None, old_lines, new_lines).get_opcodes()
@@ -0,0 +1,209 @@
+import tokenize
+
+from itertools import chain
+
+from Controllers.LineAnalyzerController import (
+    LineAnalysisResult,
+    LineAnalyzerController,
+)
+from Utils.CodeUnitBreakdown import CodeUnitTracker
+from Utils.CountingEngine import CountingEngine
+
+NON_CODE_TOKENS = {
+    tokenize.COMMENT,
+    tokenize.NL,
+    tokenize.NEWLINE,
+    tokenize.INDENT,
+    tokenize.DEDENT,
+    tokenize.ENDMARKER,
+}
+
+class TokenLineAnalyzerController(CountingEngine):
+    """
+    Counts physical lines, methods and classes with Python's tokenizer.
+
+    Unlike the heuristic LineAnalyzerController it understands the
+    code: every line covered by a code token is a physical line,
+    including the inner lines of multi-line strings and brackets, while
+    comments, blank lines and docstrings (statements made only of
+    strings, with any kind of quotes) are not counted. Methods are
+    `def` and `async def` statements, and each is attributed to the
+    class whose body directly contains it, so files with several
+    classes are reported class by class. The same pass splits the
+    counts among the top-level classes and functions.
+
+    The content is tokenized in one linear pass. If the tokenizer
+    fails, for example on an inconsistent dedent, the lines that were
+    not tokenized are counted with the heuristic engine.
+    """
+
+    def __init__(self):
+        """
+        Initializes the engine used for the lines that can't be
+        tokenized.
+        """
+        self.__fallback_analyzer = LineAnalyzerController()
+
+    def analyze(self, content):
+        """
+        Computes the physical lines, methods count, class names and
+        methods per class of the content in a single pass.
+
+        Args:
+            content (Iterable[str]): Lines of the file to analyze.
+
+        Returns:
+            LineAnalysisResult: The metrics of the content.
+            `methods_by_class` holds (class name, methods) pairs in
+            the order the classes are defined.
+        """
+        lines = iter(content)
+        last_line = [""]
+
+        def readline():
+            last_line[0] = next(lines, "")
+            return last_line[0]
+
+        physical_line_count = 0
+        methods_count = 0
+        class_names = []
+        methods_by_class = []
+        last_counted_row = 0
+        unit_tracker = CodeUnitTracker()
+
+        blocks = []
+        pending_block = None
+        statement_rows = []
+        statement_tokens = []
+
+        try:
+            for token in tokenize.generate_tokens(readline):
+                if token.type not in NON_CODE_TOKENS:
+                    statement_tokens.append(token)
+                    statement_rows.append((token.start[0], token.end[0]))
+                    continue
+
+                if token.type == tokenize.INDENT:
+                    blocks.append(pending_block)
+                    pending_block = None
+                elif token.type == tokenize.DEDENT:
+                    if blocks:
+                        blocks.pop()
+                elif token.type == tokenize.NEWLINE and statement_tokens:
+                    block = self.__classify_statement(
+                        statement_tokens, blocks, class_names,
+                        methods_by_class
+                    )
+                    if not blocks:
+                        self.__start_top_level_statement(
+                            unit_tracker, statement_tokens, block
+                        )
+                    if block is not None and block[0] == "def":
+                        methods_count += 1
+                        if blocks:
+                            unit_tracker.add_method()
+                    pending_block = block if \
+                        statement_tokens[-1].string == ":" else None
+
+                    if not self.__is_docstring(statement_tokens):
+                        new_lines, last_counted_row = self.__count_rows(
+                            statement_rows, last_counted_row
+                        )
+                        physical_line_count += new_lines
+                        unit_tracker.add_lines(new_lines)
+
+                    statement_rows = []
+                    statement_tokens = []
+        except (tokenize.TokenError, SyntaxError):
+            new_lines, last_counted_row = self.__count_rows(
+                statement_rows, last_counted_row
+            )
+            physical_line_count += new_lines
+            unit_tracker.add_lines(new_lines)
+
+            remaining = self.__fallback_analyzer.analyze(
+                chain((last_line[0],), lines)
+            )
+            physical_line_count += remaining.physical_lines
+            methods_count += remaining.methods
+            class_names.extend(remaining.class_names)
+            units = unit_tracker.get_units() + remaining.units
+        else:
+            units = unit_tracker.get_units()
+
+        return LineAnalysisResult(
+            physical_line_count,
+            methods_count,
+            tuple(class_names),
+            False,
+            tuple(map(tuple, methods_by_class)),
+            units
+        )
+
+    def __classify_statement(self, tokens, blocks, class_names,
+                             methods_by_class):
+        """
+        Records the class or method defined by a logical line and
+        returns its block, ('class', index) or ('def', name), or None
+        for any other statement.
+        """
+        first_index = 1 if tokens[0].string == "async" and \
+            len(tokens) > 1 else 0
+
+        keyword = tokens[first_index].string
+        if keyword not in ("class", "def") or \
+                len(tokens) <= first_index + 1 or \
+                tokens[first_index + 1].type != tokenize.NAME:
+            return None
+
+        name = tokens[first_index + 1].string
+
+        if keyword == "class":
+            class_names.append(name)
+            methods_by_class.append([name, 0])
+            return "class", len(methods_by_class) - 1
+
+        if blocks and blocks[-1] is not None and blocks[-1][0] == "class":
+            methods_by_class[blocks[-1][1]][1] += 1
+
+        return "def", name
+
+    def __start_top_level_statement(self, unit_tracker, tokens, block):
+        """
+        Reports a top-level logical line and the block it defines, if
+        any, to the unit tracker.
+        """
+        if tokens[0].string == "@":
+            unit_tracker.start_top_level_statement(CodeUnitTracker.DECORATOR)
+        elif block is None:
+            unit_tracker.start_top_level_statement()
+        elif block[0] == "class":
+            unit_tracker.start_top_level_statement(
+                CodeUnitTracker.CLASS, tokens[1].string
+            )
+        else:
+            unit_tracker.start_top_level_statement(
+                CodeUnitTracker.FUNCTION, block[1]
+            )
+
+    def __count_rows(self, token_rows, last_counted_row):
+        """
+        Counts the rows covered by the (start, end) rows of some tokens
+        that were not counted yet. Returns the count and the last
+        counted row.
+        """
+        row_count = 0
+
+        for start_row, end_row in token_rows:
+            first_row = max(start_row, last_counted_row + 1)
+            if end_row >= first_row:
+                row_count += end_row - first_row + 1
+                last_counted_row = end_row
+
+        return row_count, last_counted_row
+
+    def __is_docstring(self, tokens):
+        """
+        Checks whether a logical line is made only of strings.
+        """
+        return all(token.type == tokenize.STRING for token in tokens)
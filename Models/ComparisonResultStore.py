@@ -0,0 +1,274 @@
+import sys
+
+from array import array
+from collections.abc import MutableMapping
+from enum import IntEnum
+from pathlib import Path
+
+class FileStatus(IntEnum):
+    """
+    The outcome of processing one file of a comparison.
+    """
+    MODIFIED = 0
+    NEW = 1
+    DELETED = 2
+    NON_COMPLIANT = 3
+    NEW_NON_COMPLIANT = 4
+    NOT_PYTHON = 5
+    OTHER = 6
+
+
+NON_COMPLIANT_TEXT = "Doesn't comply with Standard"
+NEW_NON_COMPLIANT_TEXT = "New file doesn't comply with Standard"
+NOT_PYTHON_METRICS = ("error", "Not a Python file", "None")
+
+
+class ComparisonResultStore(MutableMapping):
+    """
+    Columnar storage for the results of a comparison.
+
+    Instead of one tuple of mixed strings and integers per file, every
+    count lives in an integer array, the outcome in an array of
+    FileStatus values and the class names in a table of unique names.
+    File paths are kept once as interned strings. The 'Total' entry is
+    not stored with the files: it is computed with sums over the count
+    arrays.
+
+    The store behaves like the results dictionary it replaces: it maps
+    each file to the same (class name, physical lines, methods, added
+    lines, removed lines) tuple, so models and views can use it as is.
+    The CodeUnitChange of the classes and functions of a file, when the
+    comparison computed them, are kept beside its metrics.
+    """
+
+    TOTAL_KEY = "Total"
+
+    def __init__(self, results=None):
+        """
+        Initializes an empty store, optionally filled from a results
+        dictionary.
+        """
+        self.__keys = []
+        self.__key_is_path = array("B")
+        self.__rows_by_key = {}
+        self.__statuses = array("B")
+        self.__class_ids = array("I")
+        self.__physical_lines = array("q")
+        self.__methods = array("q")
+        self.__added_lines = array("q")
+        self.__removed_lines = array("q")
+        self.__class_names = []
+        self.__class_ids_by_name = {}
+        self.__other_metrics = {}
+        self.__code_unit_changes = {}
+        self.__removed_rows = set()
+        self.__has_total = False
+
+        if results:
+            self.update(results)
+
+    def __setitem__(self, file_path, metrics):
+        """
+        Stores the metrics of a file. Assigning the 'Total' key only
+        enables the computed total entry.
+        """
+        if file_path == self.TOTAL_KEY:
+            self.__has_total = True
+            return
+
+        status, class_name, counts = self.__parse_metrics(metrics)
+        key = sys.intern(str(file_path))
+        row = self.__rows_by_key.get(key)
+
+        if row is None:
+            row = len(self.__keys)
+            self.__keys.append(key)
+            self.__key_is_path.append(isinstance(file_path, Path))
+            self.__statuses.append(status)
+            self.__class_ids.append(self.__intern_class_name(class_name))
+            for column, count in zip(self.__count_columns(), counts):
+                column.append(count)
+            self.__rows_by_key[key] = row
+        else:
+            self.__statuses[row] = status
+            self.__class_ids[row] = self.__intern_class_name(class_name)
+            for column, count in zip(self.__count_columns(), counts):
+                column[row] = count
+            self.__other_metrics.pop(row, None)
+            self.__code_unit_changes.pop(row, None)
+
+        if status == FileStatus.OTHER:
+            self.__other_metrics[row] = tuple(metrics)
+
+    def __getitem__(self, file_path):
+        """
+        Returns the metrics tuple of a file, or the computed total.
+        """
+        if file_path == self.TOTAL_KEY:
+            if not self.__has_total:
+                raise KeyError(file_path)
+            return self.get_totals()
+
+        row = self.__rows_by_key.get(str(file_path))
+        if row is None:
+            raise KeyError(file_path)
+
+        return self.__build_metrics(row)
+
+    def __delitem__(self, file_path):
+        """
+        Removes a file. Its row is left as a hole in the arrays and
+        skipped from then on.
+        """
+        if file_path == self.TOTAL_KEY:
+            if not self.__has_total:
+                raise KeyError(file_path)
+            self.__has_total = False
+            return
+
+        row = self.__rows_by_key.pop(str(file_path), None)
+        if row is None:
+            raise KeyError(file_path)
+
+        self.__removed_rows.add(row)
+        self.__other_metrics.pop(row, None)
+        self.__code_unit_changes.pop(row, None)
+        for column in self.__count_columns():
+            column[row] = 0
+
+    def __iter__(self):
+        """
+        Yields the files in insertion order, then 'Total' when enabled.
+        """
+        for row, key in enumerate(self.__keys):
+            if row not in self.__removed_rows:
+                yield Path(key) if self.__key_is_path[row] else key
+
+        if self.__has_total:
+            yield self.TOTAL_KEY
+
+    def __len__(self):
+        """Returns the number of files, plus one for 'Total'."""
+        return len(self.__rows_by_key) + self.__has_total
+
+    def __contains__(self, file_path):
+        """Checks whether a file, or 'Total', is in the store."""
+        if file_path == self.TOTAL_KEY:
+            return self.__has_total
+        return str(file_path) in self.__rows_by_key
+
+    def get_status(self, file_path):
+        """Returns the FileStatus of a file."""
+        row = self.__rows_by_key.get(str(file_path))
+        if row is None:
+            raise KeyError(file_path)
+        return FileStatus(self.__statuses[row])
+
+    def set_code_unit_changes(self, file_path, code_unit_changes):
+        """
+        Stores the CodeUnitChange of a file already in the store. They
+        are dropped when the metrics of the file are replaced.
+        """
+        row = self.__rows_by_key.get(str(file_path))
+        if row is None:
+            raise KeyError(file_path)
+        self.__code_unit_changes[row] = tuple(code_unit_changes)
+
+    def get_code_unit_changes(self, file_path):
+        """
+        Returns the CodeUnitChange of a file, or an empty tuple when
+        none were computed.
+        """
+        row = self.__rows_by_key.get(str(file_path))
+        if row is None:
+            raise KeyError(file_path)
+        return self.__code_unit_changes.get(row, ())
+
+    def count_by_status(self):
+        """
+        Returns how many files ended with each FileStatus.
+        """
+        counts = {status: 0 for status in FileStatus}
+        for row in self.__rows_by_key.values():
+            counts[FileStatus(self.__statuses[row])] += 1
+        return counts
+
+    def get_totals(self):
+        """
+        Returns the total entry: the sums of physical, added and
+        removed lines over every file.
+        """
+        return "", sum(self.__physical_lines), "", \
+            sum(self.__added_lines), sum(self.__removed_lines)
+
+    def __count_columns(self):
+        """Returns the integer arrays in metrics order."""
+        return (self.__physical_lines, self.__methods,
+                self.__added_lines, self.__removed_lines)
+
+    def __intern_class_name(self, class_name):
+        """
+        Returns the identifier of a class name, adding it to the table
+        of names the first time it is seen.
+        """
+        class_id = self.__class_ids_by_name.get(class_name)
+
+        if class_id is None:
+            class_id = len(self.__class_names)
+            self.__class_names.append(class_name)
+            self.__class_ids_by_name[class_name] = class_id
+
+        return class_id
+
+    def __parse_metrics(self, metrics):
+        """
+        Splits a metrics tuple into its status, class name and counts.
+        Tuples that do not follow any known shape are kept as they are.
+        """
+        metrics = tuple(metrics)
+
+        if metrics == NOT_PYTHON_METRICS:
+            return FileStatus.NOT_PYTHON, "", (0, 0, 0, 0)
+
+        if len(metrics) != 5 or not isinstance(metrics[0], str) or \
+                not all(isinstance(count, int) for count in metrics[1:]):
+            return FileStatus.OTHER, "", (0, 0, 0, 0)
+
+        class_name, counts = metrics[0], metrics[1:]
+
+        if class_name == NON_COMPLIANT_TEXT:
+            return FileStatus.NON_COMPLIANT, "", counts
+        if class_name == NEW_NON_COMPLIANT_TEXT:
+            return FileStatus.NEW_NON_COMPLIANT, "", counts
+        if class_name.startswith("New file (") and class_name.endswith(")"):
+            return FileStatus.NEW, class_name[10:-1], counts
+        if class_name.startswith("Deleted (") and class_name.endswith(")"):
+            return FileStatus.DELETED, class_name[9:-1], counts
+
+        return FileStatus.MODIFIED, class_name, counts
+
+    def __build_metrics(self, row):
+        """
+        Rebuilds the metrics tuple of a row.
+        """
+        status = self.__statuses[row]
+
+        if status == FileStatus.OTHER:
+            return self.__other_metrics[row]
+        if status == FileStatus.NOT_PYTHON:
+            return NOT_PYTHON_METRICS
+
+        class_name = self.__class_names[self.__class_ids[row]]
+        counts = tuple(column[row] for column in self.__count_columns())
+
+        if status == FileStatus.NON_COMPLIANT:
+            class_name = NON_COMPLIANT_TEXT
+        elif status == FileStatus.NEW_NON_COMPLIANT:
+            class_name = NEW_NON_COMPLIANT_TEXT
+        elif status == FileStatus.NEW:
+            class_name = f"New file ({class_name})"
+        elif status == FileStatus.DELETED:
+            class_name = f"Deleted ({class_name})"
+
+        return (class_name,) + counts
+
@@ -1,3 +1,17 @@
+from contextlib import contextmanager
+from typing import NamedTuple
+
+class LineCountDelta(NamedTuple):
+    """
+    The changes made to the line count results since the last
+    notification: files added or updated with their metrics and the
+    files removed.
+    """
+    added: dict
+    updated: dict
+    removed: list
+
+
 class FileLineCounterModel:
     """Model class responsible for storing and managing file line count."""
 
@@ -10,14 +24,68 @@ class FileLineCounterModel:
         """
         self.__file_line_counter_controller = file_line_counter_controller
         self.__line_count_results = None
+        self.__pending_changes = {}
+        self.__batch_depth = 0
+        self.__delta_listeners = []
 
     def set_line_count_results(self, line_count_results):
         """
         Sets the line count results and notifies the controller of the update.
         """
         self.__line_count_results = line_count_results
+        self.__pending_changes.clear()
         self.inform_changes_to_controller()
 
+    def add_line_count_result(self, file_path, metrics):
+        """
+        Adds the metrics of one file and notifies the change as a delta.
+        """
+        self.__apply_change(file_path, metrics)
+
+    def update_line_count_result(self, file_path, metrics):
+        """
+        Replaces the metrics of one file and notifies the change as a
+        delta.
+        """
+        self.__apply_change(file_path, metrics)
+
+    def remove_line_count_result(self, file_path):
+        """
+        Removes the metrics of one file and notifies the change as a
+        delta. Unknown files are ignored.
+        """
+        if not self.__line_count_results or \
+                file_path not in self.__line_count_results:
+            return
+
+        del self.__line_count_results[file_path]
+        self.__record_change(file_path, "removed", None)
+
+    @contextmanager
+    def batch_updates(self):
+        """
+        Groups the changes made inside the block into a single delta.
+
+        Several changes to the same file are coalesced: adding and then
+        removing a file cancels out, and only the latest metrics of a
+        file are reported. Batches can be nested; the delta is sent when
+        the outermost one ends.
+        """
+        self.__batch_depth += 1
+        try:
+            yield self
+        finally:
+            self.__batch_depth -= 1
+            if self.__batch_depth == 0:
+                self.__flush_changes()
+
+    def add_delta_listener(self, listener):
+        """
+        Registers a callable that receives every LineCountDelta, for
+        consumers other than the controller such as exporters.
+        """
+        self.__delta_listeners.append(listener)
+
     def get_line_count_results(self):
         """Returns the stored line count results.
         """
@@ -26,3 +94,64 @@ class FileLineCounterModel:
     def inform_changes_to_controller(self):
         """Notifies the controller that the model's data has changed."""
         self.__file_line_counter_controller.manage_model_changes()
+
+    def inform_delta_to_controller(self, delta):
+        """Notifies the controller and listeners of a LineCountDelta."""
+        self.__file_line_counter_controller.manage_model_deltas(delta)
+
+        for listener in self.__delta_listeners:
+            listener(delta)
+
+    def __apply_change(self, file_path, metrics):
+        """
+        Stores the metrics of a file and records whether it was added
+        or updated.
+        """
+        if self.__line_count_results is None:
+            self.__line_count_results = {}
+
+        change = "updated" if file_path in self.__line_count_results \
+            else "added"
+        self.__line_count_results[file_path] = metrics
+        self.__record_change(file_path, change, metrics)
+
+    def __record_change(self, file_path, change, metrics):
+        """
+        Coalesces a change with the pending one for the same file and
+        flushes it when no batch is open.
+        """
+        previous = self.__pending_changes.get(file_path)
+
+        if previous is not None:
+            previous_change = previous[0]
+
+            if previous_change == "added" and change == "removed":
+                del self.__pending_changes[file_path]
+                change = None
+            elif previous_change == "added":
+                change = "added"
+            elif previous_change == "removed" and change == "added":
+                change = "updated"
+
+        if change is not None:
+            self.__pending_changes[file_path] = (change, metrics)
+
+        if self.__batch_depth == 0:
+            self.__flush_changes()
+
+    def __flush_changes(self):
+        """
+        Sends the pending changes as a single delta.
+        """
+        if not self.__pending_changes:
+            return
+
+        delta = LineCountDelta({}, {}, [])
+        for file_path, (change, metrics) in self.__pending_changes.items():
+            if change == "removed":
+                delta.removed.append(file_path)
+            else:
+                getattr(delta, change)[file_path] = metrics
+
+        self.__pending_changes.clear()
+        self.inform_delta_to_controller(delta)
@@ -0,0 +1,130 @@
+from typing import NamedTuple
+
+class CodeUnitMetrics(NamedTuple):
+    """
+    The metrics of one top-level class or function of a file.
+
+    `physical_lines` includes its decorators, and `methods` counts the
+    function definitions nested in it at any depth.
+    """
+    kind: str
+    name: str
+    physical_lines: int
+    methods: int
+
+
+class CodeUnitChange(NamedTuple):
+    """
+    How a top-level class or function changed between two versions of
+    a file. The counts of the missing side are 0 for added or removed
+    units.
+    """
+    kind: str
+    name: str
+    old_physical_lines: int
+    new_physical_lines: int
+    old_methods: int
+    new_methods: int
+
+    @property
+    def line_growth(self):
+        """Returns how many physical lines the unit gained."""
+        return self.new_physical_lines - self.old_physical_lines
+
+
+class CodeUnitTracker:
+    """
+    Splits the counts of a single pass over a file among its top-level
+    classes and functions.
+
+    The counting engine reports every top-level statement it finds and
+    then the lines and methods that belong to it; they are added to the
+    class or function that is open, or dropped for module-level code.
+    """
+
+    CLASS = "class"
+    FUNCTION = "function"
+    DECORATOR = "decorator"
+
+    def __init__(self):
+        """
+        Initializes a tracker with no units.
+        """
+        self.__units = []
+        self.__current_unit = None
+        self.__in_decorators = False
+        self.__decorator_lines = 0
+
+    def start_top_level_statement(self, kind=None, name=None):
+        """
+        Opens a new unit for a CLASS or FUNCTION statement, keeps
+        DECORATOR lines for the unit that follows them and closes the
+        open unit for any other (None) statement.
+        """
+        if kind == self.DECORATOR:
+            self.__current_unit = None
+            self.__in_decorators = True
+            return
+
+        if kind in (self.CLASS, self.FUNCTION):
+            self.__current_unit = [kind, name, self.__decorator_lines, 0]
+            self.__units.append(self.__current_unit)
+        else:
+            self.__current_unit = None
+
+        self.__in_decorators = False
+        self.__decorator_lines = 0
+
+    def add_lines(self, line_count):
+        """
+        Adds physical lines to the open unit.
+        """
+        if self.__current_unit is not None:
+            self.__current_unit[2] += line_count
+        elif self.__in_decorators:
+            self.__decorator_lines += line_count
+
+    def add_method(self):
+        """
+        Adds a nested function definition to the open unit.
+        """
+        if self.__current_unit is not None:
+            self.__current_unit[3] += 1
+
+    def get_units(self):
+        """
+        Returns the CodeUnitMetrics of the units in file order.
+        """
+        return tuple(CodeUnitMetrics(*unit) for unit in self.__units)
+
+
+def compare_code_units(old_units, new_units):
+    """
+    Matches the units of two versions of a file by kind and name and
+    returns a CodeUnitChange for each, in the order of the new version
+    followed by the removed units. Units defined several times with
+    the same name are matched in order.
+    """
+    old_by_key = {}
+    for unit in old_units:
+        old_by_key.setdefault((unit.kind, unit.name), []).append(unit)
+
+    changes = []
+    for unit in new_units:
+        matches = old_by_key.get((unit.kind, unit.name))
+        old_unit = matches.pop(0) if matches else None
+        changes.append(CodeUnitChange(
+            unit.kind, unit.name,
+            old_unit.physical_lines if old_unit else 0,
+            unit.physical_lines,
+            old_unit.methods if old_unit else 0,
+            unit.methods
+        ))
+
+    for removed_units in old_by_key.values():
+        for unit in removed_units:
+            changes.append(CodeUnitChange(
+                unit.kind, unit.name, unit.physical_lines, 0, unit.methods, 0
+            ))
+
+    return tuple(changes)
@@ -0,0 +1,83 @@
+import time
+
+from typing import NamedTuple, Optional
+
+class ProgressEvent(NamedTuple):
+    """
+    A snapshot of the progress of a comparison.
+    """
+    files_done: int
+    files_total: int
+    current_file: Optional[str]
+    eta_seconds: Optional[float]
+
+
+class ComparisonProgress():
+    """
+    Tracks the progress of a comparison and forwards every processed
+    file to optional listeners.
+
+    `on_result` receives each (file, metrics) entry as soon as it is
+    computed and `on_progress` receives a ProgressEvent after it. The
+    comparison stops early once `cancel_event` is set. The listeners
+    are called from the thread running the comparison.
+    """
+
+    def __init__(self, on_result=None, on_progress=None, cancel_event=None):
+        """
+        Initializes the tracker with its listeners.
+        """
+        self.__on_result = on_result
+        self.__on_progress = on_progress
+        self.__cancel_event = cancel_event
+        self.__files_done = 0
+        self.__files_total = 0
+        self.__start_time = time.monotonic()
+
+    def start(self, files_total):
+        """
+        Adds `files_total` files to the amount of work to do and
+        reports the progress.
+        """
+        self.__files_total += files_total
+        self.__notify_progress(None)
+
+    def is_cancelled(self):
+        """Checks whether the comparison was asked to stop."""
+        return self.__cancel_event is not None and \
+            self.__cancel_event.is_set()
+
+    def file_done(self, file_path, metrics):
+        """
+        Records a processed file and notifies the listeners.
+        """
+        self.__files_done += 1
+
+        if self.__on_result is not None:
+            self.__on_result(file_path, metrics)
+
+        self.__notify_progress(str(file_path))
+
+    def get_files_done(self):
+        """Returns how many files have been processed."""
+        return self.__files_done
+
+    def __notify_progress(self, current_file):
+        """
+        Sends a ProgressEvent with the estimated remaining time.
+        """
+        if self.__on_progress is None:
+            return
+
+        eta_seconds = None
+        if self.__files_done:
+            elapsed = time.monotonic() - self.__start_time
+            remaining = max(0, self.__files_total - self.__files_done)
+            eta_seconds = elapsed / self.__files_done * remaining
+
+        self.__on_progress(ProgressEvent(
+            self.__files_done,
+            self.__files_total,
+            current_file,
+            eta_seconds
+        ))
@@ -1,3 +1,21 @@
 THRESHOLD = 0.33
 MAX_LINE_LENGTH = 80
-MAX_CHAR_PER_LINE_STD = 79
\ No newline at end of file
+MAX_CHAR_PER_LINE_STD = 79
+MAX_WORKERS = 1
+MMAP_THRESHOLD_BYTES = 64 * 1024 * 1024
+METRICS_CACHE_VERSION = 1
+METRICS_CACHE_MAX_ENTRIES = 100000
+WORKER_POLL_INTERVAL_MS = 100
+MAX_NESTING_DEPTH = 6
+RENAME_SIMILARITY_THRESHOLD = 0.5
+RENAME_SHINGLE_SIZE = 2
+MINHASH_BANDS = 20
+MINHASH_ROWS_PER_BAND = 3
+MINHASH_MAX_BUCKET_FILES = 32
+RENAME_MIN_SHINGLES = 3
+DEFAULT_EXCLUDE_PATTERNS = (
+    ".git/", ".hg/", ".svn/", ".venv/", "venv/", "node_modules/",
+    "__pycache__/", "build/", "dist/", ".tox/", ".nox/", ".eggs/",
+    "*.egg-info/", ".mypy_cache/", ".pytest_cache/", "site-packages/",
+)
+SNAPSHOT_MANIFEST_VERSION = 1
@@ -0,0 +1,32 @@
+from abc import ABC, abstractmethod
+
+class CountingEngine(ABC):
+    """
+    An abstract base class for the algorithms that count the physical
+    lines, methods and classes of a file.
+
+    The content is given as a list of lines or any iterator of lines,
+    such as `FileReader.iter_lines`, and is walked only once.
+    """
+
+    @abstractmethod
+    def analyze(self, content):
+        """
+        Abstract method that must be implemented by subclasses
+        to return the LineAnalysisResult of the content.
+        """
+        pass
+
+    def extract_class(self, content):
+        """
+        Returns the name of the first class of the content.
+        """
+        return self.analyze(content).class_name
+
+    def get_all_data(self, content):
+        """
+        Get all data from the file.
+        """
+        result = self.analyze(content)
+
+        return result.class_name, result.physical_lines, result.methods
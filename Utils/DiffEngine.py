@@ -0,0 +1,21 @@
+from abc import ABC, abstractmethod
+
+class DiffEngine(ABC):
+    """
+    An abstract base class for line diff algorithms.
+
+    A diff engine compares two lists of lines and describes how to turn
+    the first one into the second one with opcodes in the same format
+    as `difflib.SequenceMatcher.get_opcodes`: tuples of
+    (tag, i1, i2, j1, j2) where tag is 'equal', 'replace', 'delete'
+    or 'insert'.
+    """
+
+    @abstractmethod
+    def get_opcodes(self, old_lines, new_lines):
+        """
+        Abstract method that must be implemented by subclasses 
+        to return the opcodes that transform `old_lines` into
+        `new_lines`.
+        """
+        pass
@@ -0,0 +1,58 @@
+from typing import NamedTuple
+
+class DiffHunk(NamedTuple):
+    """
+    A changed region between two versions of a file.
+
+    `line_tags` holds the severity tag of each old/new line pair of a
+    'replace' hunk, in order; it is empty for other hunks.
+    """
+    tag: str
+    old_start: int
+    old_end: int
+    new_start: int
+    new_end: int
+    severity: str
+    line_tags: tuple = ()
+
+
+class DiffResult():
+    """
+    The result of diffing two versions of a file.
+
+    It keeps the lines and opcodes of the comparison together with the
+    added and removed line counts and the severity of each changed
+    hunk, so counting and annotating can share a single diff.
+    """
+
+    def __init__(self, old_lines, new_lines, opcodes, hunks):
+        """
+        Initializes the DiffResult with the compared lines, the
+        opcodes produced by the diff engine and the changed hunks.
+        """
+        self.old_lines = old_lines
+        self.new_lines = new_lines
+        self.opcodes = opcodes
+        self.hunks = hunks
+        self.added_lines = sum(
+            hunk.new_end - hunk.new_start for hunk in hunks
+        )
+        self.removed_lines = sum(
+            hunk.old_end - hunk.old_start for hunk in hunks
+        )
+
+    @classmethod
+    def identical(cls):
+        """
+        Returns the result of comparing two identical files, without
+        their lines.
+        """
+        return cls([], [], [], [])
+
+    def has_changes(self):
+        """Checks whether the two versions differ."""
+        return bool(self.hunks)
+
+    def count_major_hunks(self):
+        """Returns how many hunks are major changes."""
+        return sum(1 for hunk in self.hunks if hunk.severity == "major")
@@ -1,4 +1,15 @@
+import codecs
 import logging
+import mmap
+import os
+import re
+
+from contextlib import contextmanager
+
+from Utils.Constants import MMAP_THRESHOLD_BYTES
+
+LINE_BREAK = re.compile(rb"\r\n|\r|\n")
+DECODE_CHECK_CHUNK_BYTES = 1024 * 1024
 
 class FileReader():
     """
@@ -7,13 +18,21 @@ class FileReader():
     This class provides methods to read a file's content while handling 
     errors such as missing files or unexpected exceptions. Errors are 
     logged for debugging purposes.
+
+    Besides reading the whole file, the lines can be streamed one at a
+    time so memory stays bounded on very large files. Files bigger than
+    MMAP_THRESHOLD_BYTES are streamed from a memory map.
     """
 
-    def __init__(self, file_path):
+    def __init__(self, file_path, use_mmap=None):
         """
         Reads the content of the file and returns it as a list of lines.
+
+        `use_mmap` forces (True) or disables (False) the memory-mapped
+        mode of `iter_lines`. When None, it depends on the file size.
         """
         self.__file_path = file_path
+        self.__use_mmap = use_mmap
 
     def read_file(self):
         """
@@ -30,3 +49,120 @@ class FileReader():
             logging.error(f"Error al leer el archivo {self.__file_path}: {e}")
 
         return []
+
+    def read_bytes(self):
+        """
+        Reads the raw content of the file.
+        Errors are handled and logged like in `read_file`; an empty
+        bytes object is returned when the file can't be read.
+        """
+        try:
+            with open(self.__file_path, "rb") as file:
+                return file.read()
+        except FileNotFoundError:
+            logging.error(f"El archivo {self.__file_path} no existe.")
+        except Exception as e:
+            logging.error(f"Error al leer el archivo {self.__file_path}: {e}")
+
+        return b""
+
+    @contextmanager
+    def open_buffer(self):
+        """
+        Maps the raw content of the file into memory, read-only, so it
+        can be scanned (for example with a bytes regular expression)
+        without being read whole. Yields the mmap, or an empty bytes
+        object for an empty file.
+        Errors are handled and logged like in `read_file`; an empty
+        bytes object is yielded when the file can't be read.
+        """
+        buffer = b""
+        file = None
+
+        try:
+            file = open(self.__file_path, "rb")
+            if os.fstat(file.fileno()).st_size > 0:
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            logging.error(f"El archivo {self.__file_path} no existe.")
+        except Exception as e:
+            logging.error(f"Error al leer el archivo {self.__file_path}: {e}")
+
+        try:
+            yield buffer
+        finally:
+            if isinstance(buffer, mmap.mmap):
+                buffer.close()
+            if file is not None:
+                file.close()
+
+    def iter_lines(self):
+        """
+        Yields the lines of the file one at a time, with the same
+        content `read_file` would return, without keeping the whole
+        file in memory. Both modes end lines at '\\n', '\\r\\n' or '\\r'
+        and normalize them to '\\n'.
+        Errors are handled and logged like in `read_file`. The file is
+        checked to be valid UTF-8 before its first line is yielded, so
+        a file that can't be decoded yields nothing, as `read_file`
+        returns no lines for it.
+        """
+        try:
+            if self.__should_use_mmap():
+                yield from self.__iter_mmap_lines()
+            else:
+                with open(self.__file_path, "rb") as file:
+                    self.__check_decodes(iter(
+                        lambda: file.read(DECODE_CHECK_CHUNK_BYTES), b""
+                    ))
+                with open(self.__file_path, "r", encoding="utf-8") as file:
+                    yield from file
+        except FileNotFoundError:
+            logging.error(f"El archivo {self.__file_path} no existe.")
+        except Exception as e:
+            logging.error(f"Error al leer el archivo {self.__file_path}: {e}")
+
+    def __should_use_mmap(self):
+        """
+        Decides whether the file is streamed from a memory map.
+        """
+        if self.__use_mmap is not None:
+            return self.__use_mmap
+
+        return os.path.getsize(self.__file_path) >= MMAP_THRESHOLD_BYTES
+
+    def __iter_mmap_lines(self):
+        """
+        Yields the decoded lines of the file from a read-only memory map.
+        Line endings are normalized to '\\n' as text mode does.
+        """
+        with open(self.__file_path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return
+
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                size = len(buffer)
+                self.__check_decodes(
+                    buffer[start:start + DECODE_CHECK_CHUNK_BYTES]
+                    for start in range(0, size, DECODE_CHECK_CHUNK_BYTES)
+                )
+                start = 0
+
+                for line_break in LINE_BREAK.finditer(buffer):
+                    yield buffer[start:line_break.start()].decode("utf-8") + \
+                        "\n"
+                    start = line_break.end()
+
+                if start < size:
+                    yield buffer[start:].decode("utf-8")
+
+    def __check_decodes(self, chunks):
+        """
+        Decodes raw chunks of the file as UTF-8 without keeping the
+        text, raising UnicodeDecodeError when they are not valid.
+        """
+        decoder = codecs.getincrementaldecoder("utf-8")()
+
+        for chunk in chunks:
+            decoder.decode(chunk)
+        decoder.decode(b"", final=True)
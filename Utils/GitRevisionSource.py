@@ -0,0 +1,161 @@
+import io
+import logging
+import subprocess
+
+from typing import NamedTuple, Optional
+
+NULL_BLOB_ID = "0" * 40
+
+class GitFileChange(NamedTuple):
+    """
+    A Python file that differs between two revisions: its path in the
+    repository, the git status letter ('A', 'D', 'M' or 'T') and the
+    blob IDs of both sides, None for the missing side.
+    """
+    path: str
+    status: str
+    old_blob_id: Optional[str]
+    new_blob_id: Optional[str]
+
+
+class GitRevisionSource:
+    """
+    Reads two revisions of a project straight from a git object store,
+    without checking them out.
+
+    The changed Python files are listed from `git diff-tree`, which
+    compares the trees by object ID, so files whose blobs are identical
+    in both revisions are never listed nor read. The contents of the
+    changed blobs are streamed one at a time from a single
+    `git cat-file --batch` process.
+    """
+
+    def __init__(self, repository_path, old_revision, new_revision):
+        """
+        Initializes the source for a local repository and two
+        revisions (commits, tags, branches...).
+        """
+        self.__repository_path = str(repository_path)
+        self.__old_revision = old_revision
+        self.__new_revision = new_revision
+        self.__cat_file_process = None
+
+    def get_old_revision(self):
+        """Returns the old revision."""
+        return self.__old_revision
+
+    def get_new_revision(self):
+        """Returns the new revision."""
+        return self.__new_revision
+
+    def get_changes(self):
+        """
+        Returns the GitFileChange of every Python file that differs
+        between the revisions, sorted by path. Raises ValueError when
+        the repository or a revision can't be read.
+        """
+        output = self.__run_git(
+            "diff-tree", "-r", "-z", "--no-renames",
+            self.__old_revision, self.__new_revision, "--", "*.py"
+        )
+        fields = output.split(b"\0")
+        changes = []
+
+        for index in range(0, len(fields) - 1, 2):
+            _, _, old_blob_id, new_blob_id, status = \
+                fields[index].decode("ascii").lstrip(":").split(" ")
+            path = fields[index + 1].decode("utf-8", errors="surrogateescape")
+
+            if old_blob_id == new_blob_id:
+                continue
+
+            changes.append(GitFileChange(
+                path,
+                status[0],
+                None if old_blob_id == NULL_BLOB_ID else old_blob_id,
+                None if new_blob_id == NULL_BLOB_ID else new_blob_id
+            ))
+
+        return sorted(changes)
+
+    def read_blob(self, blob_id):
+        """
+        Returns the raw content of a blob, read through the shared
+        `git cat-file --batch` process.
+        """
+        process = self.__get_cat_file_process()
+        process.stdin.write(blob_id.encode("ascii") + b"\n")
+        process.stdin.flush()
+
+        header = process.stdout.readline().decode("ascii").split()
+        if len(header) != 3 or header[1] != "blob":
+            raise ValueError(f"Can't read blob {blob_id}: {' '.join(header)}")
+
+        content = process.stdout.read(int(header[2]))
+        process.stdout.read(1)
+        return content
+
+    def read_blob_lines(self, blob_id, path=""):
+        """
+        Returns the lines of a blob decoded as the files on disk are
+        read by FileReader: UTF-8 with universal newlines. Errors are
+        logged and an empty list is returned.
+        """
+        try:
+            with io.TextIOWrapper(
+                io.BytesIO(self.read_blob(blob_id)), encoding="utf-8"
+            ) as blob_file:
+                return blob_file.readlines()
+        except Exception as e:
+            logging.error(f"Error al leer el archivo {path} ({blob_id}): {e}")
+
+        return []
+
+    def close(self):
+        """
+        Stops the `git cat-file` process, if it was started.
+        """
+        if self.__cat_file_process is not None:
+            self.__cat_file_process.stdin.close()
+            self.__cat_file_process.wait()
+            self.__cat_file_process.stdout.close()
+            self.__cat_file_process = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+    def __get_cat_file_process(self):
+        """
+        Starts the `git cat-file --batch` process on first use.
+        """
+        if self.__cat_file_process is None:
+            self.__cat_file_process = subprocess.Popen(
+                ["git", "-C", self.__repository_path, "cat-file", "--batch"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE
+            )
+
+        return self.__cat_file_process
+
+    def __run_git(self, *arguments):
+        """
+        Runs a git command in the repository and returns its output.
+        """
+        try:
+            completed_process = subprocess.run(
+                ["git", "-C", self.__repository_path, *arguments],
+                capture_output=True,
+                check=True
+            )
+        except FileNotFoundError as e:
+            raise ValueError("git is not installed.") from e
+        except subprocess.CalledProcessError as e:
+            raise ValueError(
+                e.stderr.decode("utf-8", errors="replace").strip()
+            ) from e
+
+        return completed_process.stdout
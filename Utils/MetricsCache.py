@@ -0,0 +1,244 @@
+import hashlib
+import json
+import sqlite3
+import time
+
+from Utils.Constants import MAX_CHAR_PER_LINE_STD
+from Utils.Constants import MAX_LINE_LENGTH
+from Utils.Constants import METRICS_CACHE_MAX_ENTRIES
+from Utils.Constants import METRICS_CACHE_VERSION
+from Utils.Constants import THRESHOLD
+
+class MetricsCache():
+    """
+    A persistent cache for the metrics computed for a file or a pair
+    of files.
+
+    Entries are stored in a SQLite database and keyed by the content
+    hash of the files plus the analyzer version and the settings that
+    affect the metrics, so a cached result is only reused for
+    byte-identical inputs analyzed the same way. The cache keeps at
+    most `max_entries` entries and evicts the least recently used ones.
+
+    Writes are batched: new entries stay in an open transaction and the
+    time each entry was last used is kept in memory, and both are
+    committed by `flush`, which callers run once per comparison, and by
+    `close`. A run that stores many entries commits once.
+
+    The database also records the content hash, size and modification
+    time of the files hashed for tree comparisons, so the hashes are
+    kept out of the compared trees.
+    """
+
+    FILE_HASH_BATCH_SIZE = 500
+
+    def __init__(self, cache_path, max_entries=METRICS_CACHE_MAX_ENTRIES):
+        """
+        Opens (or creates) the cache stored at `cache_path`.
+        """
+        self.__max_entries = max_entries
+        self.__hits = 0
+        self.__misses = 0
+        self.__connection = sqlite3.connect(str(cache_path))
+        self.__connection.execute(
+            "CREATE TABLE IF NOT EXISTS metrics ("
+            "key TEXT PRIMARY KEY, "
+            "metrics TEXT NOT NULL, "
+            "last_used INTEGER NOT NULL)"
+        )
+        self.__connection.execute(
+            "CREATE INDEX IF NOT EXISTS metrics_last_used "
+            "ON metrics (last_used)"
+        )
+        self.__connection.execute(
+            "CREATE TABLE IF NOT EXISTS file_hashes ("
+            "path TEXT PRIMARY KEY, "
+            "size INTEGER NOT NULL, "
+            "mtime_ns INTEGER NOT NULL, "
+            "sha256 TEXT NOT NULL, "
+            "recorded_at_ns INTEGER NOT NULL)"
+        )
+        self.__connection.commit()
+        self.__entry_count, last_used = self.__connection.execute(
+            "SELECT COUNT(*), MAX(last_used) FROM metrics"
+        ).fetchone()
+        self.__last_used = last_used or 0
+        self.__pending_uses = {}
+        self.__has_pending_writes = False
+
+    @staticmethod
+    def hash_file(file_path):
+        """
+        Returns the SHA-256 hex digest of the content of a file.
+        """
+        digest = hashlib.sha256()
+
+        with open(file_path, "rb") as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                digest.update(chunk)
+
+        return digest.hexdigest()
+
+    def make_key(self, kind, *file_paths):
+        """
+        Builds the cache key of the metrics of `kind` computed for the
+        given files, in order.
+        """
+        return self.make_content_key(
+            kind, *(self.hash_file(file_path) for file_path in file_paths)
+        )
+
+    def make_content_key(self, kind, *content_ids):
+        """
+        Builds the cache key of the metrics of `kind` computed for
+        contents identified by a hash, such as git blob IDs, without
+        reading them.
+        """
+        digest = hashlib.sha256()
+        digest.update(
+            f"{METRICS_CACHE_VERSION}|{MAX_LINE_LENGTH}|"
+            f"{MAX_CHAR_PER_LINE_STD}|{THRESHOLD}|{kind}".encode("utf-8")
+        )
+
+        for content_id in content_ids:
+            digest.update(b"|" + content_id.encode("ascii"))
+
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        Returns the cached metrics tuple for `key`, or None when the key
+        is not cached.
+        """
+        row = self.__connection.execute(
+            "SELECT metrics FROM metrics WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is None:
+            self.__misses += 1
+            return None
+
+        self.__hits += 1
+        self.__pending_uses[key] = self.__next_use_time()
+        return tuple(json.loads(row[0]))
+
+    def put(self, key, metrics):
+        """
+        Stores the metrics tuple for `key`, evicting the least recently
+        used entries when the cache is full. The entry is committed by
+        the next `flush`.
+        """
+        row = (json.dumps(list(metrics)), self.__next_use_time(), key)
+        self.__pending_uses.pop(key, None)
+
+        try:
+            self.__connection.execute(
+                "INSERT INTO metrics (metrics, last_used, key) "
+                "VALUES (?, ?, ?)",
+                row
+            )
+            self.__entry_count += 1
+        except sqlite3.IntegrityError:
+            self.__connection.execute(
+                "UPDATE metrics SET metrics = ?, last_used = ? WHERE key = ?",
+                row
+            )
+
+        if self.__entry_count > self.__max_entries:
+            self.__save_pending_uses()
+            self.__connection.execute(
+                "DELETE FROM metrics WHERE key IN ("
+                "SELECT key FROM metrics ORDER BY last_used LIMIT ?)",
+                (self.__entry_count - self.__max_entries,)
+            )
+            self.__entry_count = self.__max_entries
+
+        self.__has_pending_writes = True
+
+    def get_file_hashes(self, file_paths):
+        """
+        Returns the recorded (size, modification time, SHA-256, time
+        recorded) of the given absolute file paths, by path. Files that
+        were never recorded are left out.
+        """
+        file_paths = [str(file_path) for file_path in file_paths]
+        file_hashes = {}
+
+        for start in range(0, len(file_paths), self.FILE_HASH_BATCH_SIZE):
+            batch = file_paths[start:start + self.FILE_HASH_BATCH_SIZE]
+            rows = self.__connection.execute(
+                "SELECT path, size, mtime_ns, sha256, recorded_at_ns "
+                "FROM file_hashes WHERE path IN "
+                f"({', '.join('?' * len(batch))})",
+                batch
+            )
+            for path, *file_hash in rows:
+                file_hashes[path] = tuple(file_hash)
+
+        return file_hashes
+
+    def put_file_hashes(self, file_hashes):
+        """
+        Records the (size, modification time, SHA-256) of files given
+        by absolute path, with the current time. They are committed by
+        the next `flush`.
+        """
+        recorded_at_ns = time.time_ns()
+        self.__connection.executemany(
+            "INSERT OR REPLACE INTO file_hashes "
+            "(path, size, mtime_ns, sha256, recorded_at_ns) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [
+                (str(path), size, mtime_ns, sha256, recorded_at_ns)
+                for path, (size, mtime_ns, sha256) in file_hashes.items()
+            ]
+        )
+        self.__has_pending_writes = True
+
+    def flush(self):
+        """
+        Commits the entries stored since the last flush and saves when
+        the entries read since then were used.
+        """
+        if self.__pending_uses:
+            self.__save_pending_uses()
+            self.__has_pending_writes = True
+
+        if self.__has_pending_writes:
+            self.__connection.commit()
+            self.__has_pending_writes = False
+
+    def get_hits(self):
+        """Returns the number of lookups answered from the cache."""
+        return self.__hits
+
+    def get_misses(self):
+        """Returns the number of lookups not found in the cache."""
+        return self.__misses
+
+    def __len__(self):
+        """Returns the number of cached entries."""
+        return self.__entry_count
+
+    def close(self):
+        """Commits the pending writes and closes the underlying database."""
+        self.flush()
+        self.__connection.close()
+
+    def __next_use_time(self):
+        """
+        Returns the time of a new use, always later than the previous
+        one so entries used in the same clock tick keep their order.
+        """
+        self.__last_used = max(time.time_ns(), self.__last_used + 1)
+        return self.__last_used
+
+    def __save_pending_uses(self):
+        """
+        Writes the pending use times, without committing.
+        """
+        self.__connection.executemany(
+            "UPDATE metrics SET last_used = ? WHERE key = ?",
+            [(last_used, key) for key, last_used in self.__pending_uses.items()]
+        )
+        self.__pending_uses.clear()
@@ -2,24 +2,82 @@ from abc import ABC, abstractmethod
 
 class ProgrammingLanguageStandardValidator(ABC):
     """
-    An abstract base class for validating 
+    An abstract base class for validating
     compliance with a programming language standard.
 
-    This class provides an interface for checking 
-    whether a given file adheres to a specific programming 
+    This class provides an interface for checking
+    whether a given file adheres to a specific programming
     language's standard.
+
+    A standard is made of rules (see StandardRule) registered by name
+    in STANDARD_RULES. The selected rules are checked together in a
+    single pass over the lines of the file.
     """
 
-    def __init__(self, file):
+    STANDARD_RULES = {}
+    DEFAULT_RULES = ()
+
+    def __init__(self, file, rules=None):
         """
-        Initializes the validator with the given file.
+        Initializes the validator with the given file and the names
+        of the rules to check, DEFAULT_RULES when None.
         """
         self.file = file
+        self.set_rules(self.DEFAULT_RULES if rules is None else rules)
+
+    @classmethod
+    def register_rule(cls, rule_class):
+        """
+        Adds a rule to the rules of this standard, under its name.
+        Can be used as a class decorator.
+        """
+        cls.STANDARD_RULES = {**cls.STANDARD_RULES, rule_class.name: rule_class}
+        return rule_class
+
+    def set_rules(self, rules):
+        """
+        Selects the rules to check, given by name or as rule classes.
+        Raises ValueError for an unknown rule name.
+        """
+        rule_classes = []
+
+        for rule in rules:
+            if isinstance(rule, str):
+                if rule not in self.STANDARD_RULES:
+                    raise ValueError(
+                        f"Unknown rule '{rule}'. Available: "
+                        f"{', '.join(self.STANDARD_RULES)}."
+                    )
+                rule = self.STANDARD_RULES[rule]
+            rule_classes.append(rule)
+
+        self.__rule_classes = tuple(rule_classes)
+
+    def get_rules(self):
+        """Returns the classes of the selected rules."""
+        return self.__rule_classes
+
+    def iter_rule_violations(self, lines, rule_classes=None):
+        """
+        Walks the lines once, handing every line to each selected
+        rule, or to each of `rule_classes` when given, and yields the
+        violations as they are found.
+        """
+        if rule_classes is None:
+            rule_classes = self.__rule_classes
+        rules = [rule_class() for rule_class in rule_classes]
+
+        for line_number, line in enumerate(lines, start=1):
+            for rule in rules:
+                yield from rule.visit_line(line_number, line)
+
+        for rule in rules:
+            yield from rule.finish()
 
     @abstractmethod
     def validate_compliance_with_standard(self):
         """
-        Abstract method that must be implemented by subclasses 
+        Abstract method that must be implemented by subclasses
         to check if the given file complies with the programming
         language standard.
         """
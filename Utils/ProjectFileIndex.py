@@ -0,0 +1,98 @@
+import os
+
+from pathlib import Path
+
+from Utils.ProjectTreeWalker import ProjectTreeWalker
+
+class ProjectFileIndex():
+    """
+    An index of the Python files of a project, grouped by file name.
+
+    The index is built with a single walk of the project root and
+    cached per root and walker settings. A cached index is reused until
+    the modification time of any of the indexed directories or of their
+    `.gitignore` files changes, which happens whenever a file or
+    directory is added, removed or renamed.
+    """
+
+    __indexes = {}
+
+    def __init__(self, project_root, suffix=".py", walker=None):
+        """
+        Builds the index for the given project root, listing its files
+        with a ProjectTreeWalker (the default one when None).
+        """
+        self.__project_root = Path(project_root)
+        self.__suffix = suffix
+        self.__walker = walker or ProjectTreeWalker()
+        self.__files_by_name = {}
+        self.__directory_mtimes = {}
+        self.__build()
+
+    @classmethod
+    def for_root(cls, project_root, suffix=".py", walker=None):
+        """
+        Returns the cached index of `project_root`, rebuilding it when
+        the project tree has changed since it was built.
+        """
+        walker = walker or ProjectTreeWalker()
+        key = (Path(project_root).resolve(), suffix, walker.get_settings())
+        index = cls.__indexes.get(key)
+
+        if index is None or not index.is_up_to_date():
+            index = cls(project_root, suffix, walker)
+            cls.__indexes[key] = index
+
+        return index
+
+    @classmethod
+    def clear_cache(cls):
+        """Discards every cached index."""
+        cls.__indexes.clear()
+
+    def __build(self):
+        """
+        Walks the project root and groups the matching files by name.
+        """
+        walked_tree = self.__walker.walk(self.__project_root, self.__suffix)
+        self.__directory_mtimes = walked_tree.watched_mtimes
+
+        for file_path in walked_tree.files:
+            self.__files_by_name.setdefault(file_path.name, []).append(
+                file_path
+            )
+
+    def is_up_to_date(self):
+        """
+        Checks whether none of the indexed directories has been
+        modified, removed or replaced since the index was built.
+        """
+        for directory, mtime in self.__directory_mtimes.items():
+            try:
+                if os.stat(directory).st_mtime_ns != mtime:
+                    return False
+            except OSError:
+                return False
+
+        return bool(self.__directory_mtimes)
+
+    def find(self, file_name):
+        """
+        Returns every indexed path whose name is `file_name`, sorted.
+        """
+        return list(self.__files_by_name.get(file_name, ()))
+
+    def contains(self, file_name):
+        """Checks whether a file named `file_name` is indexed."""
+        return file_name in self.__files_by_name
+
+    def get_collisions(self):
+        """
+        Returns the file names that appear more than once in the
+        project, mapped to all of their paths.
+        """
+        return {
+            file_name: list(paths)
+            for file_name, paths in self.__files_by_name.items()
+            if len(paths) > 1
+        }
@@ -0,0 +1,311 @@
+import os
+import re
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import NamedTuple
+
+from Utils.Constants import DEFAULT_EXCLUDE_PATTERNS
+
+IGNORE_FILE_NAME = ".gitignore"
+
+class IgnoreRule(NamedTuple):
+    """
+    A parsed `.gitignore` pattern: the directory it was read from,
+    relative to the walked root ('' for the root), the compiled
+    pattern, whether it re-includes paths ('!') and whether it only
+    applies to directories (trailing '/').
+    """
+    base: str
+    regex: re.Pattern
+    negated: bool
+    directory_only: bool
+
+
+class IgnoreRules:
+    """
+    An immutable list of `.gitignore`-style rules.
+
+    As in git, a pattern without a slash matches a name at any depth
+    below the directory it was read from, a pattern with a slash is
+    anchored to that directory, '**' matches any number of directories
+    and the last matching rule decides.
+    """
+
+    def __init__(self, rules=()):
+        """Initializes the rules from parsed IgnoreRule."""
+        self.__rules = tuple(rules)
+
+    @classmethod
+    def parse(cls, patterns, base=""):
+        """
+        Returns the rules of some `.gitignore` lines, read from the
+        directory `base` (a path relative to the walked root).
+        """
+        return cls().extended(patterns, base)
+
+    def extended(self, patterns, base=""):
+        """
+        Returns new rules with the patterns of the `.gitignore` lines
+        read from `base` added after these.
+        """
+        rules = list(self.__rules)
+
+        for pattern in patterns:
+            rule = self.__parse_pattern(pattern.rstrip("\n"), base)
+            if rule is not None:
+                rules.append(rule)
+
+        return IgnoreRules(rules)
+
+    def is_ignored(self, relative_path, is_directory):
+        """
+        Checks whether a path, relative to the walked root and written
+        with '/', is ignored.
+        """
+        for rule in reversed(self.__rules):
+            if rule.directory_only and not is_directory:
+                continue
+
+            if rule.base:
+                if not relative_path.startswith(rule.base + "/"):
+                    continue
+                path = relative_path[len(rule.base) + 1:]
+            else:
+                path = relative_path
+
+            if rule.regex.fullmatch(path):
+                return not rule.negated
+
+        return False
+
+    def __bool__(self):
+        return bool(self.__rules)
+
+    def __parse_pattern(self, pattern, base):
+        """
+        Parses one `.gitignore` line, or returns None for blank lines
+        and comments.
+        """
+        if pattern.endswith("\\ "):
+            pattern = pattern.rstrip(" ") + " "
+        else:
+            pattern = pattern.rstrip(" ")
+
+        if not pattern or pattern.startswith("#"):
+            return None
+
+        negated = pattern.startswith("!")
+        if negated:
+            pattern = pattern[1:]
+        elif pattern.startswith("\\"):
+            pattern = pattern[1:]
+
+        directory_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        if not pattern:
+            return None
+
+        anchored = "/" in pattern
+        pattern = pattern.lstrip("/")
+        expression = self.__translate(pattern)
+        if not anchored:
+            expression = "(?:.*/)?" + expression
+
+        return IgnoreRule(
+            base, re.compile(expression, re.DOTALL), negated, directory_only
+        )
+
+    def __translate(self, pattern):
+        """
+        Translates a `.gitignore` glob into a regular expression.
+        """
+        expression = []
+        index = 0
+
+        while index < len(pattern):
+            character = pattern[index]
+
+            if pattern.startswith("**/", index) and \
+                    (index == 0 or pattern[index - 1] == "/"):
+                expression.append("(?:.*/)?")
+                index += 3
+            elif pattern.startswith("**", index) and \
+                    index + 2 == len(pattern) and \
+                    (index == 0 or pattern[index - 1] == "/"):
+                expression.append(".*")
+                index += 2
+            elif character == "*":
+                expression.append("[^/]*")
+                index += 1
+            elif character == "?":
+                expression.append("[^/]")
+                index += 1
+            elif character == "[" and "]" in pattern[index + 2:]:
+                closing = pattern.index("]", index + 2)
+                character_class = pattern[index + 1:closing]
+                if character_class.startswith("!"):
+                    character_class = "^" + character_class[1:]
+                expression.append(
+                    "[" + character_class.replace("\\", "\\\\") + "]"
+                )
+                index = closing + 1
+            elif character == "\\" and index + 1 < len(pattern):
+                expression.append(re.escape(pattern[index + 1]))
+                index += 2
+            else:
+                expression.append(re.escape(character))
+                index += 1
+
+        return "".join(expression)
+
+
+class WalkedTree(NamedTuple):
+    """
+    The result of a walk: the matching files, sorted, and the
+    modification time of every scanned directory and read
+    `.gitignore`, to tell when the walk is out of date.
+    """
+    files: list
+    watched_mtimes: dict
+
+
+class ProjectTreeWalker:
+    """
+    Lists the files of a project with `os.scandir`.
+
+    Directories matching the exclude patterns (virtual environments,
+    `node_modules`, `__pycache__`, build output... by default) or the
+    `.gitignore` files found along the way are never entered. With
+    more than one thread the directories are scanned concurrently,
+    which mostly helps on network filesystems where every listing
+    waits on the server.
+    """
+
+    def __init__(self, exclude_patterns=DEFAULT_EXCLUDE_PATTERNS,
+                 use_gitignore=True, max_threads=1):
+        """
+        Initializes the walker. `exclude_patterns` use the
+        `.gitignore` syntax and apply from the walked root.
+        """
+        if max_threads < 1:
+            raise ValueError("max_threads must be at least 1.")
+
+        self.__exclude_patterns = tuple(exclude_patterns)
+        self.__exclude_rules = IgnoreRules.parse(self.__exclude_patterns)
+        self.__use_gitignore = use_gitignore
+        self.__max_threads = max_threads
+
+    def get_exclude_patterns(self):
+        """Returns the exclude patterns."""
+        return self.__exclude_patterns
+
+    def get_max_threads(self):
+        """Returns the number of threads used to scan directories."""
+        return self.__max_threads
+
+    def get_settings(self):
+        """
+        Returns the settings that decide which files are listed, to
+        tell apart the results of differently configured walkers.
+        """
+        return self.__exclude_patterns, self.__use_gitignore
+
+    def walk(self, root, suffix=".py"):
+        """
+        Returns the WalkedTree of the files under `root` whose name
+        ends with `suffix`.
+        """
+        root = Path(root)
+        files = []
+        watched_mtimes = {}
+
+        if self.__max_threads == 1:
+            pending = [(str(root), "", self.__exclude_rules)]
+            while pending:
+                directory_files, subdirectories, directory_mtimes = \
+                    self.__scan_directory(*pending.pop(), suffix)
+                files.extend(directory_files)
+                watched_mtimes.update(directory_mtimes)
+                pending.extend(subdirectories)
+        else:
+            with ThreadPoolExecutor(self.__max_threads) as executor:
+                futures = {executor.submit(
+                    self.__scan_directory, str(root), "",
+                    self.__exclude_rules, suffix
+                )}
+                while futures:
+                    done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        directory_files, subdirectories, directory_mtimes = \
+                            future.result()
+                        files.extend(directory_files)
+                        watched_mtimes.update(directory_mtimes)
+                        futures.update(
+                            executor.submit(
+                                self.__scan_directory, *subdirectory, suffix
+                            )
+                            for subdirectory in subdirectories
+                        )
+
+        return WalkedTree(sorted(files), watched_mtimes)
+
+    def __scan_directory(self, directory, relative_directory, rules, suffix):
+        """
+        Scans one directory. Returns its matching files, the
+        (directory, relative directory, rules) of the subdirectories
+        to scan and the modification times to watch.
+        """
+        watched_mtimes = {}
+        files = []
+        subdirectories = []
+
+        try:
+            watched_mtimes[directory] = os.stat(directory).st_mtime_ns
+            with os.scandir(directory) as iterator:
+                entries = list(iterator)
+        except OSError:
+            return files, subdirectories, watched_mtimes
+
+        if self.__use_gitignore:
+            rules = self.__read_ignore_file(
+                directory, relative_directory, rules, watched_mtimes
+            )
+
+        for entry in entries:
+            relative_path = f"{relative_directory}/{entry.name}" \
+                if relative_directory else entry.name
+
+            try:
+                is_directory = entry.is_dir(follow_symlinks=False)
+                if not is_directory and not entry.name.endswith(suffix):
+                    continue
+                if rules and rules.is_ignored(relative_path, is_directory):
+                    continue
+
+                if is_directory:
+                    subdirectories.append((entry.path, relative_path, rules))
+                elif entry.is_file():
+                    files.append(Path(entry.path))
+            except OSError:
+                continue
+
+        return files, subdirectories, watched_mtimes
+
+    def __read_ignore_file(self, directory, relative_directory, rules,
+                           watched_mtimes):
+        """
+        Returns the rules extended with the `.gitignore` of a
+        directory, if it has one.
+        """
+        ignore_file = os.path.join(directory, IGNORE_FILE_NAME)
+
+        try:
+            with open(ignore_file, encoding="utf-8",
+                      errors="replace") as ignore_lines:
+                rules = rules.extended(ignore_lines, relative_directory)
+            watched_mtimes[ignore_file] = os.stat(ignore_file).st_mtime_ns
+        except OSError:
+            pass
+
+        return rules
@@ -0,0 +1,128 @@
+from Utils.StandardRule import RuleViolation, StandardRule
+from Utils.Constants import MAX_CHAR_PER_LINE_STD, MAX_NESTING_DEPTH
+
+class LineLengthRule(StandardRule):
+    """
+    Lines can't be longer than 79 characters, not counting the
+    surrounding whitespace.
+    """
+
+    name = "line-length"
+
+    def visit_line(self, line_number, line):
+        """
+        Checks the length of a line. Lines short enough before
+        stripping are accepted without creating a stripped copy.
+        """
+        if len(line) <= MAX_CHAR_PER_LINE_STD:
+            return ()
+
+        length = len(line.strip())
+        if length <= MAX_CHAR_PER_LINE_STD:
+            return ()
+
+        return (self.build_violation(line_number, length),)
+
+    @classmethod
+    def build_violation(cls, line_number, length):
+        """
+        Builds the violation of a line of the given stripped length.
+        """
+        return RuleViolation(
+            cls.name, line_number,
+            f"Line too long ({length} > {MAX_CHAR_PER_LINE_STD} characters)"
+        )
+
+
+class TrailingWhitespaceRule(StandardRule):
+    """
+    Lines can't end with spaces or tabs.
+    """
+
+    name = "trailing-whitespace"
+
+    def visit_line(self, line_number, line):
+        """
+        Checks the end of a line, ignoring its line break.
+        """
+        content = line.rstrip("\r\n")
+
+        if content == content.rstrip(" \t"):
+            return ()
+
+        return (RuleViolation(self.name, line_number, "Trailing whitespace"),)
+
+
+class TabIndentationRule(StandardRule):
+    """
+    Indentation must use spaces, not tabs.
+    """
+
+    name = "tab-indentation"
+
+    def visit_line(self, line_number, line):
+        """
+        Checks the leading whitespace of a line.
+        """
+        indentation = line[:len(line) - len(line.lstrip(" \t"))]
+
+        if "\t" not in indentation:
+            return ()
+
+        return (RuleViolation(
+            self.name, line_number, "Indentation contains tabs"
+        ),)
+
+
+class NestingDepthRule(StandardRule):
+    """
+    Code can't be indented more than MAX_NESTING_DEPTH levels of four
+    spaces.
+
+    Only the lines that start a statement are measured: blank lines,
+    comments, docstring contents and the continuation lines of
+    brackets or backslashes may be aligned freely.
+    """
+
+    name = "nesting-depth"
+
+    def __init__(self):
+        """
+        Initializes the state kept between lines.
+        """
+        self.__open_brackets = 0
+        self.__in_docstring = False
+        self.__continues = False
+
+    def visit_line(self, line_number, line):
+        """
+        Measures the indentation of a line that starts a statement.
+        """
+        stripped_line = line.strip()
+        is_continuation = self.__open_brackets > 0 or self.__continues or \
+            self.__in_docstring
+
+        if stripped_line.count('"""') % 2 == 1:
+            self.__in_docstring = not self.__in_docstring
+        elif not self.__in_docstring:
+            code = stripped_line.split("#", 1)[0]
+            self.__open_brackets = max(0, self.__open_brackets
+                                       + sum(map(code.count, "([{"))
+                                       - sum(map(code.count, ")]}")))
+            self.__continues = code.rstrip().endswith("\\")
+
+        if is_continuation or not stripped_line or \
+                stripped_line.startswith("#"):
+            return ()
+
+        expanded_line = line.expandtabs(4)
+        indentation = len(expanded_line) - len(expanded_line.lstrip())
+        depth = indentation // 4
+
+        if depth <= MAX_NESTING_DEPTH:
+            return ()
+
+        return (RuleViolation(
+            self.name, line_number,
+            f"Nesting too deep ({depth} > {MAX_NESTING_DEPTH} levels)"
+        ),)
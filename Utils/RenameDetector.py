@@ -0,0 +1,198 @@
+import hashlib
+
+from typing import NamedTuple
+
+from Utils.Constants import (
+    MINHASH_BANDS,
+    MINHASH_MAX_BUCKET_FILES,
+    MINHASH_ROWS_PER_BAND,
+    RENAME_MIN_SHINGLES,
+    RENAME_SHINGLE_SIZE,
+    RENAME_SIMILARITY_THRESHOLD,
+)
+
+class DetectedRename(NamedTuple):
+    """
+    A file of the old version matched to a file of the new version
+    with the Jaccard similarity of their line shingles.
+    """
+    old_file: object
+    new_file: object
+    similarity: float
+
+
+class RenameDetector:
+    """
+    Finds which deleted files reappear, moved or renamed, among the
+    added files of a comparison.
+
+    Each file is reduced to the set of its shingles, runs of
+    `shingle_size` consecutive non-blank lines with the surrounding
+    whitespace removed. A MinHash signature of the set is split into
+    bands that are hashed into buckets (locality-sensitive hashing), so
+    only files that share a bucket are compared instead of every pair.
+    The signature uses one-permutation hashing: each shingle is hashed
+    once and keeps the minimum of one of the signature bins, and empty
+    bins borrow the value of the next filled one, so building it costs
+    one pass over the shingles instead of one per signature value.
+    The candidates are checked with their exact Jaccard similarity and
+    matched greedily from the most similar pair down, each file at most
+    once.
+
+    Files with fewer than `min_shingles` shingles, such as boilerplate
+    `__init__.py` files, are too small to tell apart and are never
+    matched. Buckets holding more than `max_bucket_files` files of
+    either version are ignored, so many near-identical files (generated
+    stubs...) don't turn the candidates into every pair; such files
+    are still paired through the other bands they share.
+    """
+
+    def __init__(self, threshold=RENAME_SIMILARITY_THRESHOLD,
+                 shingle_size=RENAME_SHINGLE_SIZE, bands=MINHASH_BANDS,
+                 rows_per_band=MINHASH_ROWS_PER_BAND,
+                 min_shingles=RENAME_MIN_SHINGLES,
+                 max_bucket_files=MINHASH_MAX_BUCKET_FILES):
+        """
+        Initializes the detector. Pairs are reported when at least
+        `threshold` of their shingles are shared.
+        """
+        self.__threshold = threshold
+        self.__shingle_size = shingle_size
+        self.__bands = bands
+        self.__rows_per_band = rows_per_band
+        self.__min_shingles = min_shingles
+        self.__max_bucket_files = max_bucket_files
+
+    def find_renames(self, old_files, new_files, read_lines):
+        """
+        Returns the DetectedRename of the `old_files` that match one of
+        the `new_files`, sorted by old file. `read_lines(file)` returns
+        the lines of a file.
+        """
+        old_shingles = {
+            file: self.get_shingles(read_lines(file)) for file in old_files
+        }
+        new_shingles = {
+            file: self.get_shingles(read_lines(file)) for file in new_files
+        }
+
+        buckets = {}
+        for side, shingles_by_file in ((0, old_shingles), (1, new_shingles)):
+            for file, shingles in shingles_by_file.items():
+                if len(shingles) < self.__min_shingles:
+                    continue
+                for band_key in self.__get_band_keys(shingles):
+                    buckets.setdefault(band_key, ([], []))[side].append(file)
+
+        candidates = set()
+        for old_bucket, new_bucket in buckets.values():
+            if len(old_bucket) > self.__max_bucket_files or \
+                    len(new_bucket) > self.__max_bucket_files:
+                continue
+            for old_file in old_bucket:
+                for new_file in new_bucket:
+                    candidates.add((old_file, new_file))
+
+        scored_pairs = []
+        for old_file, new_file in candidates:
+            old_count = len(old_shingles[old_file])
+            new_count = len(new_shingles[new_file])
+            # The similarity is at most the ratio of the set sizes.
+            if min(old_count, new_count) < \
+                    self.__threshold * max(old_count, new_count):
+                continue
+
+            similarity = self.get_similarity(
+                old_shingles[old_file], new_shingles[new_file]
+            )
+            if similarity >= self.__threshold:
+                scored_pairs.append((
+                    -similarity,
+                    getattr(old_file, "name", None) !=
+                    getattr(new_file, "name", None),
+                    str(old_file),
+                    str(new_file),
+                    old_file,
+                    new_file
+                ))
+
+        renames = []
+        matched_old_files = set()
+        matched_new_files = set()
+        for negative_similarity, _, _, _, old_file, new_file in \
+                sorted(scored_pairs, key=lambda pair: pair[:4]):
+            if old_file in matched_old_files or new_file in matched_new_files:
+                continue
+            matched_old_files.add(old_file)
+            matched_new_files.add(new_file)
+            renames.append(
+                DetectedRename(old_file, new_file, -negative_similarity)
+            )
+
+        return sorted(renames, key=lambda rename: str(rename.old_file))
+
+    def get_shingles(self, lines):
+        """
+        Returns the set of hashed shingles of some lines.
+        """
+        normalized_lines = [line.strip() for line in lines if line.strip()]
+
+        if not normalized_lines:
+            return frozenset()
+
+        shingle_count = max(1, len(normalized_lines) - self.__shingle_size + 1)
+        return frozenset(
+            self.__hash_shingle(
+                normalized_lines[index:index + self.__shingle_size]
+            )
+            for index in range(shingle_count)
+        )
+
+    def get_similarity(self, first_shingles, second_shingles):
+        """
+        Returns the Jaccard similarity of two sets of shingles.
+        """
+        if not first_shingles and not second_shingles:
+            return 1.0
+
+        shared_count = len(first_shingles & second_shingles)
+        return shared_count / \
+            (len(first_shingles) + len(second_shingles) - shared_count)
+
+    def __get_band_keys(self, shingles):
+        """
+        Computes the MinHash signature of some shingles and returns
+        one bucket key per band.
+        """
+        bin_count = self.__bands * self.__rows_per_band
+        bins = [None] * bin_count
+
+        for shingle in shingles:
+            bin_index = shingle % bin_count
+            value = shingle // bin_count
+            if bins[bin_index] is None or value < bins[bin_index]:
+                bins[bin_index] = value
+
+        signature = []
+        for bin_index in range(bin_count):
+            distance = 0
+            while bins[(bin_index + distance) % bin_count] is None:
+                distance += 1
+            signature.append(
+                (bins[(bin_index + distance) % bin_count], distance)
+            )
+
+        return [
+            (band, tuple(signature[band * self.__rows_per_band:
+                                   (band + 1) * self.__rows_per_band]))
+            for band in range(self.__bands)
+        ]
+
+    def __hash_shingle(self, shingle_lines):
+        """
+        Hashes a shingle to an integer, the same in every process.
+        """
+        digest = hashlib.blake2b(
+            "\n".join(shingle_lines).encode("utf-8"), digest_size=8
+        ).digest()
+        return int.from_bytes(digest, "big")
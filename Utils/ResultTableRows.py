@@ -0,0 +1,149 @@
+class ResultTableRows():
+    """
+    Keeps the rows of the result table and the order in which they are
+    shown, so a view can ask only for the page of rows that is visible.
+
+    Rows can be sorted and filtered by column. The 'Total' row, when
+    present, is kept out of sorting and filtering and always shown last.
+    """
+
+    def __init__(self, rows=(), total_row=None):
+        """
+        Initializes the rows of the table.
+        """
+        self.__sort_column = None
+        self.__sort_descending = False
+        self.__filter_column = None
+        self.__filter_text = ""
+        self.set_rows(rows, total_row)
+
+    def set_rows(self, rows, total_row=None):
+        """
+        Replaces the rows of the table, keeping the current sorting and
+        filtering.
+        """
+        self.__rows = list(rows)
+        self.__total_row = total_row
+        self.__refresh()
+
+    def upsert_rows(self, rows):
+        """
+        Adds new rows and replaces the rows with the same first column
+        value, keeping the position of the replaced ones.
+        """
+        positions = {row[0]: index for index, row in enumerate(self.__rows)}
+
+        for row in rows:
+            if row[0] in positions:
+                self.__rows[positions[row[0]]] = row
+            else:
+                positions[row[0]] = len(self.__rows)
+                self.__rows.append(row)
+
+        self.__refresh()
+
+    def remove_rows(self, keys):
+        """
+        Removes the rows whose first column value is in `keys`.
+        """
+        keys = set(keys)
+        self.__rows = [row for row in self.__rows if row[0] not in keys]
+        self.__refresh()
+
+    def set_total_row(self, total_row):
+        """Replaces the total row shown last."""
+        self.__total_row = total_row
+        self.__refresh()
+
+    def sort_by(self, column_index):
+        """
+        Sorts the rows by a column. Sorting again by the same column
+        reverses the order. Numeric values sort numerically and before
+        text values.
+        """
+        if self.__sort_column == column_index:
+            self.__sort_descending = not self.__sort_descending
+        else:
+            self.__sort_column = column_index
+            self.__sort_descending = False
+
+        self.__refresh()
+
+    def set_filter(self, column_index, text):
+        """
+        Shows only the rows whose column contains `text`, ignoring case.
+        A `column_index` of None searches every column; an empty text
+        removes the filter.
+        """
+        self.__filter_column = column_index
+        self.__filter_text = text.strip().lower()
+        self.__refresh()
+
+    def get_sort_state(self):
+        """
+        Returns the sorted column index, or None, and whether the order
+        is descending.
+        """
+        return self.__sort_column, self.__sort_descending
+
+    def get_page(self, first_row, row_count):
+        """
+        Returns the visible rows from `first_row`, at most `row_count`.
+        """
+        return self.__visible_rows[first_row:first_row + row_count]
+
+    def __len__(self):
+        """Returns the number of visible rows."""
+        return len(self.__visible_rows)
+
+    def __refresh(self):
+        """
+        Recomputes the visible rows after a change of data, sorting or
+        filtering.
+        """
+        visible_rows = self.__rows
+
+        if self.__filter_text:
+            visible_rows = [
+                row for row in visible_rows if self.__matches_filter(row)
+            ]
+
+        if self.__sort_column is not None:
+            visible_rows = sorted(
+                visible_rows,
+                key=lambda row: self.__sort_key(row[self.__sort_column]),
+                reverse=self.__sort_descending
+            )
+        else:
+            visible_rows = list(visible_rows)
+
+        if self.__total_row is not None:
+            visible_rows.append(self.__total_row)
+
+        self.__visible_rows = visible_rows
+
+    def __matches_filter(self, row):
+        """
+        Checks whether a row contains the filter text.
+        """
+        values = row if self.__filter_column is None \
+            else (row[self.__filter_column],)
+
+        return any(
+            self.__filter_text in str(value).lower() for value in values
+        )
+
+    def __sort_key(self, value):
+        """
+        Builds a sort key that orders numbers before text.
+        """
+        if isinstance(value, bool):
+            return 1, str(value)
+
+        if isinstance(value, (int, float)):
+            return 0, value
+
+        try:
+            return 0, float(value)
+        except (TypeError, ValueError):
+            return 1, str(value).lower()
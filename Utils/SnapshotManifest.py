@@ -0,0 +1,156 @@
+import json
+import re
+
+from pathlib import Path
+from typing import NamedTuple
+
+from Utils.Constants import SNAPSHOT_MANIFEST_VERSION
+
+SNAPSHOT_MANIFEST_FORMAT = "proyecto-amarillo-snapshot"
+SNAPSHOT_MANIFEST_SNIFF_BYTES = 4096
+
+_FORMAT_PATTERN = re.compile(
+    rb'"format"\s*:\s*"' + SNAPSHOT_MANIFEST_FORMAT.encode("ascii") + rb'"'
+)
+
+class SnapshotEntry(NamedTuple):
+    """
+    A Python file of a snapshot: its path relative to the tree root
+    (written with '/'), size, modification time, SHA-256 of its
+    content and the metrics of its reformatted lines.
+    """
+    path: str
+    size: int
+    mtime_ns: int
+    sha256: str
+    class_name: str
+    physical_lines: int
+    methods: int
+    complies_with_standard: bool
+
+    def get_unchanged_metrics(self):
+        """
+        Returns the metrics of comparing the file with an identical
+        copy of itself.
+        """
+        if not self.complies_with_standard:
+            return "Doesn't comply with Standard", 0, 0, 0, 0
+
+        return self.class_name, self.physical_lines, self.methods, 0, 0
+
+    def is_stat_unchanged(self, stat_result):
+        """
+        Checks whether a file still has the size and modification time
+        recorded in the snapshot.
+        """
+        return stat_result.st_size == self.size and \
+            stat_result.st_mtime_ns == self.mtime_ns
+
+
+class SnapshotManifest:
+    """
+    A record of a project tree that can stand in for the tree as the
+    old side of a comparison.
+
+    The manifest lists every Python file of the tree with its content
+    hash and metrics, plus the settings the metrics were computed with
+    (standard rules and counting engine). Comparing a new tree against
+    it only needs the old files whose hash differs from the new
+    version; the rest are answered from the manifest. It is stored as
+    JSON.
+    """
+
+    def __init__(self, root, settings, entries=()):
+        """
+        Initializes a manifest of the tree at `root` from its
+        SnapshotEntry.
+        """
+        self.__root = Path(root)
+        self.__settings = dict(settings)
+        self.__entries = {entry.path: entry for entry in entries}
+
+    def get_root(self):
+        """Returns the root of the snapshot tree."""
+        return self.__root
+
+    def get_settings(self):
+        """Returns the settings the metrics were computed with."""
+        return dict(self.__settings)
+
+    def get_entries(self):
+        """Returns the SnapshotEntry of every file, by path."""
+        return dict(self.__entries)
+
+    def get(self, path):
+        """Returns the SnapshotEntry of a path, or None."""
+        return self.__entries.get(path)
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def write(self, manifest_path):
+        """
+        Writes the manifest as JSON.
+        """
+        with open(manifest_path, "w", encoding="utf-8") as manifest_file:
+            json.dump({
+                "format": SNAPSHOT_MANIFEST_FORMAT,
+                "version": SNAPSHOT_MANIFEST_VERSION,
+                "root": str(self.__root),
+                "settings": self.__settings,
+                "files": [
+                    entry._asdict()
+                    for _, entry in sorted(self.__entries.items())
+                ],
+            }, manifest_file, indent=1)
+
+    @classmethod
+    def read(cls, manifest_path):
+        """
+        Reads a manifest written by `write`. Raises ValueError when the
+        file is not a manifest of this version.
+        """
+        try:
+            with open(manifest_path, encoding="utf-8") as manifest_file:
+                data = json.load(manifest_file)
+        except (OSError, UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ValueError(f"Can't read manifest {manifest_path}: {e}") \
+                from e
+
+        if not isinstance(data, dict) or \
+                data.get("format") != SNAPSHOT_MANIFEST_FORMAT:
+            raise ValueError(f"{manifest_path} is not a snapshot manifest.")
+        if data.get("version") != SNAPSHOT_MANIFEST_VERSION:
+            raise ValueError(
+                f"Unsupported snapshot manifest version {data.get('version')}"
+                f" in {manifest_path}."
+            )
+
+        try:
+            return cls(
+                data["root"],
+                data["settings"],
+                [SnapshotEntry(**entry) for entry in data["files"]]
+            )
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Malformed manifest {manifest_path}: {e}") \
+                from e
+
+    @staticmethod
+    def is_manifest(file_path):
+        """
+        Checks whether a path is a snapshot manifest file by looking
+        for the manifest format near the start of a JSON file, without
+        parsing it. Other JSON files are not manifests.
+        """
+        file_path = Path(file_path)
+        if file_path.suffix != ".json":
+            return False
+
+        try:
+            with open(file_path, "rb") as manifest_file:
+                head = manifest_file.read(SNAPSHOT_MANIFEST_SNIFF_BYTES)
+        except OSError:
+            return False
+
+        return _FORMAT_PATTERN.search(head) is not None
@@ -0,0 +1,216 @@
+import cProfile
+import pstats
+import threading
+import time
+
+from contextlib import nullcontext
+
+class StageProfiler:
+    """
+    Collects where the time of a run goes.
+
+    Code wraps each stage of its work (reading, reformatting,
+    validation, diffing...) in `with profiler.stage(name):`, and reports
+    counters and the bytes it reads and writes. `get_report` returns
+    all of it as a JSON-friendly dictionary. With `use_cprofile` the
+    run is also recorded by cProfile and can be saved with `dump_stats`.
+
+    Stages can be nested, such as reading a file while hashing a tree.
+    The seconds of a stage exclude the stages opened inside it, in the
+    same thread, so every instant is counted once and the stages never
+    add up to more than the time they were open.
+
+    NullStageProfiler has the same interface and does nothing, so the
+    instrumented code costs almost nothing when profiling is off.
+    """
+
+    def __init__(self, use_cprofile=False):
+        """
+        Initializes an empty profiler.
+        """
+        self.__stage_calls = {}
+        self.__stage_seconds = {}
+        self.__counters = {}
+        self.__bytes_read = 0
+        self.__bytes_written = 0
+        self.__wall_seconds = 0.0
+        self.__started_at = None
+        self.__open_stages = threading.local()
+        self.__cprofile = cProfile.Profile() if use_cprofile else None
+
+    def is_enabled(self):
+        """Returns whether the profiler records anything."""
+        return True
+
+    def start(self):
+        """
+        Starts timing the whole run and, when enabled, cProfile.
+        """
+        self.__started_at = time.perf_counter()
+        if self.__cprofile is not None:
+            self.__cprofile.enable()
+
+    def stop(self):
+        """
+        Stops timing the whole run and cProfile.
+        """
+        if self.__cprofile is not None:
+            self.__cprofile.disable()
+        if self.__started_at is not None:
+            self.__wall_seconds += time.perf_counter() - self.__started_at
+            self.__started_at = None
+
+    def stage(self, name):
+        """
+        Returns a context manager that adds the time spent inside it,
+        minus the time of the stages nested in it, to the stage `name`.
+        """
+        open_timers = getattr(self.__open_stages, "timers", None)
+        if open_timers is None:
+            open_timers = self.__open_stages.timers = []
+
+        return _StageTimer(self, name, open_timers)
+
+    def add_stage_time(self, name, seconds, calls=1):
+        """
+        Adds time measured elsewhere to a stage.
+        """
+        self.__stage_calls[name] = self.__stage_calls.get(name, 0) + calls
+        self.__stage_seconds[name] = \
+            self.__stage_seconds.get(name, 0.0) + seconds
+
+    def add_count(self, name, amount=1):
+        """Adds to the counter `name`."""
+        self.__counters[name] = self.__counters.get(name, 0) + amount
+
+    def add_bytes_read(self, byte_count):
+        """Adds to the bytes read from disk."""
+        self.__bytes_read += byte_count
+
+    def add_bytes_written(self, byte_count):
+        """Adds to the bytes written to disk."""
+        self.__bytes_written += byte_count
+
+    def merge_report(self, report):
+        """
+        Adds the report of another profiler, for example one that ran
+        in a worker process, to this one.
+        """
+        for name, stage in report["stages"].items():
+            self.add_stage_time(name, stage["seconds"], stage["calls"])
+        for name, amount in report["counters"].items():
+            self.add_count(name, amount)
+        self.add_bytes_read(report["bytes_read"])
+        self.add_bytes_written(report["bytes_written"])
+
+    def get_report(self):
+        """
+        Returns the run report: calls and seconds per stage, counters,
+        bytes read and written and the wall time of the run.
+        """
+        return {
+            "wall_seconds": round(self.__wall_seconds, 6),
+            "stages": {
+                name: {
+                    "calls": self.__stage_calls[name],
+                    "seconds": round(self.__stage_seconds[name], 6),
+                }
+                for name in sorted(
+                    self.__stage_seconds,
+                    key=self.__stage_seconds.get,
+                    reverse=True
+                )
+            },
+            "counters": dict(sorted(self.__counters.items())),
+            "bytes_read": self.__bytes_read,
+            "bytes_written": self.__bytes_written,
+        }
+
+    def dump_stats(self, file_path):
+        """
+        Writes the cProfile statistics to a file that can be loaded
+        with `pstats.Stats`. Raises ValueError when cProfile is off.
+        """
+        if self.__cprofile is None:
+            raise ValueError("cProfile was not enabled for this profiler.")
+
+        pstats.Stats(self.__cprofile).dump_stats(file_path)
+
+
+class _StageTimer:
+    """
+    Context manager that measures one call of a stage. The timers open
+    in a thread form a stack; a timer passes its whole time to the one
+    it is nested in, which leaves it out of its own.
+    """
+
+    __slots__ = ("__profiler", "__name", "__open_timers", "__started_at",
+                 "__nested_seconds")
+
+    def __init__(self, profiler, name, open_timers):
+        self.__profiler = profiler
+        self.__name = name
+        self.__open_timers = open_timers
+
+    def __enter__(self):
+        self.__nested_seconds = 0.0
+        self.__open_timers.append(self)
+        self.__started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        seconds = time.perf_counter() - self.__started_at
+        self.__open_timers.pop()
+        if self.__open_timers:
+            self.__open_timers[-1].add_nested_time(seconds)
+
+        self.__profiler.add_stage_time(
+            self.__name, seconds - self.__nested_seconds
+        )
+        return False
+
+    def add_nested_time(self, seconds):
+        """Leaves the time of a nested stage out of this one."""
+        self.__nested_seconds += seconds
+
+
+class NullStageProfiler:
+    """
+    A profiler that records nothing. Every method returns at once and
+    `stage` always returns the same reusable empty context manager.
+    """
+
+    __NULL_STAGE = nullcontext()
+
+    def is_enabled(self):
+        """Returns whether the profiler records anything."""
+        return False
+
+    def start(self):
+        """Does nothing."""
+
+    def stop(self):
+        """Does nothing."""
+
+    def stage(self, name):
+        """Returns an empty context manager."""
+        return self.__NULL_STAGE
+
+    def add_stage_time(self, name, seconds, calls=1):
+        """Does nothing."""
+
+    def add_count(self, name, amount=1):
+        """Does nothing."""
+
+    def add_bytes_read(self, byte_count):
+        """Does nothing."""
+
+    def add_bytes_written(self, byte_count):
+        """Does nothing."""
+
+    def merge_report(self, report):
+        """Does nothing."""
+
+    def get_report(self):
+        """Returns None: nothing was recorded."""
+        return None
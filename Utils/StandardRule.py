@@ -0,0 +1,41 @@
+from abc import ABC, abstractmethod
+from typing import NamedTuple
+
+class RuleViolation(NamedTuple):
+    """
+    A place where a file breaks a rule of the standard: the name of the
+    rule, the 1-based line number and a short description.
+    """
+    rule: str
+    line_number: int
+    message: str
+
+
+class StandardRule(ABC):
+    """
+    An abstract base class for one rule of a programming language
+    standard.
+
+    A rule does not read the file by itself. The validator walks the
+    lines once and hands each of them to every selected rule, so adding
+    rules does not add passes over the file. A new instance is created
+    for every validation, so a rule may keep state between lines.
+    """
+
+    name = ""
+
+    @abstractmethod
+    def visit_line(self, line_number, line):
+        """
+        Abstract method that must be implemented by subclasses
+        to check one line. Returns the violations found on it,
+        or an empty tuple.
+        """
+        pass
+
+    def finish(self):
+        """
+        Called after the last line. Returns the violations that can
+        only be known at the end of the file.
+        """
+        return ()
@@ -0,0 +1,163 @@
+import hashlib
+
+from pathlib import Path
+
+from Utils.MetricsCache import MetricsCache
+
+class TreeHashIndex:
+    """
+    Content hashes of the files of a project tree and of each of its
+    directories.
+
+    The hash of a directory covers the names and hashes of its files
+    and subdirectories (a Merkle tree), so two directories with the
+    same hash hold the same files with the same contents, however deep.
+
+    File hashes are recorded in a MetricsCache, never in the tree, and
+    reused while the size and modification time of a file are
+    unchanged, so only new or modified files are read to build the
+    index again. Files modified in the same instant their hash was
+    recorded are always hashed again, since their modification time
+    can't tell later changes apart.
+    """
+
+    def __init__(self, root, files, metrics_cache=None):
+        """
+        Builds the index of the given files of the tree at `root`,
+        reusing the hashes recorded in `metrics_cache`, or hashing
+        every file when it is None.
+        """
+        self.__root = Path(root)
+        self.__metrics_cache = metrics_cache
+        self.__file_hashes = {}
+        self.__directory_hashes = {}
+        self.__hashed_file_count = 0
+        self.__build(files)
+
+    def get_file_hash(self, relative_path):
+        """
+        Returns the SHA-256 of a file given by its path relative to the
+        root, written with '/', or None when it is not indexed.
+        """
+        return self.__file_hashes.get(relative_path)
+
+    def get_directory_hash(self, relative_directory):
+        """
+        Returns the hash of a directory relative to the root ('' for
+        the root), or None when it holds no indexed file.
+        """
+        return self.__directory_hashes.get(relative_directory)
+
+    def get_hashed_file_count(self):
+        """
+        Returns how many files had to be read because their cached hash
+        could not be trusted.
+        """
+        return self.__hashed_file_count
+
+    def get_files(self, relative_directory):
+        """
+        Returns the indexed files below a directory, relative to the
+        root and sorted.
+        """
+        if not relative_directory:
+            return sorted(self.__file_hashes)
+
+        prefix = relative_directory + "/"
+        return sorted(
+            relative_path for relative_path in self.__file_hashes
+            if relative_path.startswith(prefix)
+        )
+
+    def get_unchanged_directories(self, other_index):
+        """
+        Returns the outermost directories whose hash is the same in
+        another index, sorted. Their subdirectories are not listed.
+        """
+        unchanged_directories = []
+
+        for directory in sorted(self.__directory_hashes):
+            if self.__has_ancestor_in(directory, unchanged_directories):
+                continue
+            if other_index.get_directory_hash(directory) == \
+                    self.__directory_hashes[directory]:
+                unchanged_directories.append(directory)
+
+        return unchanged_directories
+
+    def __build(self, files):
+        """
+        Hashes the files, reusing the cached hashes that can be
+        trusted, then hashes the directories from the deepest up.
+        """
+        files = [Path(file_path) for file_path in files]
+        absolute_paths = [str(file_path.absolute()) for file_path in files]
+        recorded_files = self.__metrics_cache.get_file_hashes(absolute_paths) \
+            if self.__metrics_cache is not None else {}
+        hashed_files = {}
+
+        for file_path, absolute_path in zip(files, absolute_paths):
+            relative_path = file_path.relative_to(self.__root).as_posix()
+            stat_result = file_path.stat()
+            recorded_file = recorded_files.get(absolute_path)
+
+            if recorded_file is not None and \
+                    recorded_file[0] == stat_result.st_size and \
+                    recorded_file[1] == stat_result.st_mtime_ns and \
+                    stat_result.st_mtime_ns < recorded_file[3]:
+                file_hash = recorded_file[2]
+            else:
+                file_hash = MetricsCache.hash_file(file_path)
+                hashed_files[absolute_path] = \
+                    (stat_result.st_size, stat_result.st_mtime_ns, file_hash)
+
+            self.__file_hashes[relative_path] = file_hash
+
+        self.__hashed_file_count = len(hashed_files)
+        self.__hash_directories()
+
+        if hashed_files and self.__metrics_cache is not None:
+            self.__metrics_cache.put_file_hashes(hashed_files)
+
+    def __hash_directories(self):
+        """
+        Computes the hash of every directory from its entries.
+        """
+        entries_by_directory = {}
+
+        for relative_path, file_hash in self.__file_hashes.items():
+            directory, _, name = relative_path.rpartition("/")
+            entries_by_directory.setdefault(directory, []).append(
+                f"file {name} {file_hash}"
+            )
+            while directory:
+                directory = directory.rpartition("/")[0]
+                entries_by_directory.setdefault(directory, [])
+
+        for directory in sorted(
+            entries_by_directory, key=lambda path: -path.count("/")
+            if path else 1
+        ):
+            directory_hash = hashlib.sha256(
+                "\n".join(sorted(entries_by_directory[directory]))
+                .encode("utf-8", errors="surrogateescape")
+            ).hexdigest()
+            self.__directory_hashes[directory] = directory_hash
+
+            if directory:
+                parent, _, name = directory.rpartition("/")
+                entries_by_directory[parent].append(
+                    f"directory {name} {directory_hash}"
+                )
+
+    def __has_ancestor_in(self, directory, directories):
+        """
+        Checks whether a directory is, or is below, one of some
+        directories.
+        """
+        for ancestor in directories:
+            if not ancestor or directory == ancestor or \
+                    directory.startswith(ancestor + "/"):
+                return True
+
+        return False
@@ -0,0 +1,120 @@
+import csv
+import json
+import sys
+
+from Models.ComparisonResultStore import ComparisonResultStore
+from Utils.Constants import THRESHOLD
+
+class FileLineCounterReportView:
+    """
+    A non-graphical view that writes the metric results as JSON or CSV.
+
+    It implements the same `show_metric_results` interface as
+    FileLineCounterView, so the controller and model drive it without
+    any change, but it never imports customtkinter and needs no display.
+    """
+
+    FIELDS = ["file", "class_name", "physical_lines", "methods",
+              "added_lines", "removed_lines", "major_changes"]
+
+    def __init__(self, output_format="json", output_stream=None):
+        """
+        Initializes the report view.
+
+        `output_format` is either 'json' or 'csv'. The report is written
+        to `output_stream`, or to the standard output when it is None.
+        """
+        if output_format not in ("json", "csv"):
+            raise ValueError(f"Unsupported output format: {output_format}")
+
+        self.__output_format = output_format
+        self.__output_stream = output_stream
+        self.__file_line_counter_controller = None
+
+    def show_metric_results(self, metric_results):
+        """
+        Writes one record per file plus the total in the chosen format.
+
+        JSON records also list the code unit changes of the files that
+        have them, under 'units'.
+        """
+        records = [
+            self.build_record(file_name, metrics)
+            for file_name, metrics in metric_results.items()
+        ]
+        output_stream = self.__output_stream or sys.stdout
+
+        if self.__output_format == "json":
+            if isinstance(metric_results, ComparisonResultStore):
+                self.__add_code_unit_changes(records, metric_results)
+            json.dump({"results": records}, output_stream, indent=2)
+            output_stream.write("\n")
+        else:
+            writer = csv.DictWriter(output_stream, fieldnames=self.FIELDS)
+            writer.writeheader()
+            writer.writerows(records)
+
+        output_stream.flush()
+
+    def apply_metric_deltas(self, delta):
+        """
+        Ignores incremental changes; the report is written once with
+        the complete results.
+        """
+
+    def build_record(self, file_name, metrics):
+        """
+        Converts a results entry into a dictionary keyed by FIELDS.
+
+        `major_changes` uses the same rule as the graphical table and is
+        None when the entry has no numeric counts.
+        """
+        metrics = tuple(metrics) + ("",) * (5 - len(metrics))
+        class_name, physical_count, method_count, \
+            added_lines, removed_lines = metrics[:5]
+
+        try:
+            major_changes = int(physical_count) * THRESHOLD < (
+                int(added_lines) + int(removed_lines)
+            )
+        except (TypeError, ValueError):
+            major_changes = None
+
+        return {
+            "file": str(file_name),
+            "class_name": class_name,
+            "physical_lines": physical_count,
+            "methods": method_count,
+            "added_lines": added_lines,
+            "removed_lines": removed_lines,
+            "major_changes": major_changes,
+        }
+
+    def build_code_unit_record(self, code_unit_change):
+        """
+        Converts a CodeUnitChange into a dictionary.
+        """
+        record = code_unit_change._asdict()
+        record["line_growth"] = code_unit_change.line_growth
+        return record
+
+    def __add_code_unit_changes(self, records, metric_results):
+        """
+        Adds the 'units' of every file record with code unit changes.
+        """
+        for record, file_name in zip(records, metric_results):
+            if file_name == ComparisonResultStore.TOTAL_KEY:
+                continue
+            code_unit_changes = metric_results.get_code_unit_changes(file_name)
+            if code_unit_changes:
+                record["units"] = [
+                    self.build_code_unit_record(change)
+                    for change in code_unit_changes
+                ]
+
+    def set_controller(self, controller):
+        """
+        Sets the controller for handling file path processing
+        and metric retrieval.
+        """
+        self.__file_line_counter_controller = controller
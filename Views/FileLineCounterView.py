@@ -1,9 +1,18 @@
 import logging
+import queue
+import threading
 
 import customtkinter as ctk
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from Utils.Constants import THRESHOLD
+from Utils.Constants import WORKER_POLL_INTERVAL_MS
+from Views.VirtualResultTable import VirtualResultTable
+
+RESULT_TABLE_HEADERS = ["File", "Class", "Methods",
+                        "Physical Lines", "Deleted Lines",
+                        "Added Lines", "Major Changes"]
 
 logging.basicConfig(level=logging.INFO)
 
@@ -34,6 +43,10 @@ class FileLineCounterView(ctk.CTk):
 
         self.__create_widgets()
         self.__file_line_counter_controller = file_line_counter_controller
+        self.__comparison_executor = ThreadPoolExecutor(max_workers=1)
+        self.__worker_events = queue.Queue()
+        self.__cancel_event = None
+        self.protocol("WM_DELETE_WINDOW", self.__close_window)
 
     def __create_widgets(self):
         """
@@ -77,24 +90,50 @@ class FileLineCounterView(ctk.CTk):
         )
         self.file_button.pack(pady=10)
 
+        self.progress_bar = ctk.CTkProgressBar(self.main_frame, width=300)
+        self.progress_bar.set(0)
+
+        self.progress_label = ctk.CTkLabel(self.main_frame, text="")
+
+        self.cancel_button = ctk.CTkButton(
+            self.main_frame,
+            text="Cancel",
+            command=self.cancel_comparison,
+            width=300,
+            height=35,
+            corner_radius=10,
+            fg_color="#8b1e1e",
+        )
+
     def process_file_path_from_user(self):
         """
         Handles the button click event to process the file path entered
         by the user.
 
         This method retrieves the file path from the input field and
-        calls the controllerto process the file and calculate the metrics.
+        starts the comparison in a background thread, so the window keeps
+        responding while the metrics are calculated. Progress and partial
+        results are posted back to the Tk loop.
 
         If the file path is not valid, it displays an error message.
         """
         new_file_path = self.new_path_entry.get().strip()
         old_file_path = self.old_path_entry.get().strip()
 
+        if self.__cancel_event is not None:
+            return
+
         if new_file_path and old_file_path:
-            self.__file_line_counter_controller.process_file_path(
+            self.__cancel_event = threading.Event()
+            self.__show_progress_widgets()
+            self.__file_line_counter_controller.publish_results({})
+            self.__comparison_executor.submit(
+                self.__run_comparison,
                 old_file_path,
-                new_file_path
+                new_file_path,
+                self.__cancel_event
             )
+            self.after(WORKER_POLL_INTERVAL_MS, self.__poll_worker_events)
         else:
             self.file_label = ctk.CTkLabel(
                 self.main_frame,
@@ -103,21 +142,141 @@ class FileLineCounterView(ctk.CTk):
             )
             self.file_label.pack()
 
+    def cancel_comparison(self):
+        """
+        Asks the running comparison to stop after the current file.
+        """
+        if self.__cancel_event is not None:
+            self.__cancel_event.set()
+            self.progress_label.configure(text="Cancelling...")
+
+    def __close_window(self):
+        """
+        Stops the running comparison and its thread before closing the
+        window, so the process doesn't outlive it.
+        """
+        if self.__cancel_event is not None:
+            self.__cancel_event.set()
+        self.__comparison_executor.shutdown(wait=False, cancel_futures=True)
+        self.destroy()
+
+    def __run_comparison(self, old_file_path, new_file_path, cancel_event):
+        """
+        Runs the comparison in the background thread. It never touches
+        the widgets; every event is queued for the Tk loop.
+        """
+        try:
+            results = \
+                self.__file_line_counter_controller.collect_file_path_results(
+                    old_file_path,
+                    new_file_path,
+                    on_result=lambda file_path, metrics:
+                        self.__worker_events.put(
+                            ("result", (file_path, metrics))
+                        ),
+                    on_progress=lambda event:
+                        self.__worker_events.put(("progress", event)),
+                    cancel_event=cancel_event
+                )
+            self.__worker_events.put(("done", results))
+        except Exception as error:
+            logging.exception("Comparison failed")
+            self.__worker_events.put(("error", error))
+
+    def __poll_worker_events(self):
+        """
+        Applies the events posted by the background comparison and
+        schedules itself again until the comparison finishes.
+        """
+        finished = False
+        partial_results = []
+
+        try:
+            while True:
+                kind, payload = self.__worker_events.get_nowait()
+
+                if kind == "progress":
+                    self.__update_progress(payload)
+                elif kind == "result":
+                    partial_results.append(payload)
+                elif kind == "done":
+                    finished = True
+                    self.__finish_comparison()
+                    partial_results.append(("Total", payload["Total"]))
+                elif kind == "error":
+                    finished = True
+                    self.__finish_comparison()
+                    self.file_label = ctk.CTkLabel(
+                        self.main_frame,
+                        text=f"Comparison failed: {payload}",
+                        text_color="red"
+                    )
+                    self.file_label.pack()
+        except queue.Empty:
+            pass
+
+        if partial_results:
+            self.__file_line_counter_controller.publish_partial_results(
+                partial_results
+            )
+
+        if not finished:
+            self.after(WORKER_POLL_INTERVAL_MS, self.__poll_worker_events)
+
+    def __update_progress(self, event):
+        """
+        Shows the files done, the current file and the estimated time
+        left of a ProgressEvent.
+        """
+        if event.files_total:
+            self.progress_bar.set(event.files_done / event.files_total)
+
+        text = f"{event.files_done}/{event.files_total} files"
+        if event.eta_seconds is not None:
+            text += f" - about {int(event.eta_seconds)} s left"
+        if event.current_file:
+            text += f"\n{Path(event.current_file).name}"
+
+        self.progress_label.configure(text=text)
+
+    def __show_progress_widgets(self):
+        """
+        Shows the progress widgets and disables the compare button.
+        """
+        self.file_button.configure(state="disabled")
+        self.progress_bar.set(0)
+        self.progress_label.configure(text="Starting comparison...")
+        self.progress_bar.pack(pady=(10, 0))
+        self.progress_label.pack(pady=5)
+        self.cancel_button.pack(pady=5)
+
+    def __finish_comparison(self):
+        """
+        Hides the progress widgets and allows a new comparison.
+        """
+        self.__cancel_event = None
+        self.progress_bar.pack_forget()
+        self.progress_label.pack_forget()
+        self.cancel_button.pack_forget()
+        self.file_button.configure(state="normal")
+
     def show_metric_results(self, metric_results):
         """
         Displays the metric results in a new window.
-        This method generates a new window containing a scrollable table
+        This method generates a new window containing a virtualized table
         displaying the filename along with its physical line and methods 
-        counts.
+        counts. Only the visible rows are drawn, and the table can be
+        sorted and filtered by column.
         """
         self.__create_result_window()
-        canvas, table_frame = self.__create_scrollable_table()
 
-        self.__populate_table_headers(table_frame)
-        self.__populate_table_data(table_frame, metric_results)
+        rows, total_row = self.__build_table_rows(metric_results)
 
-        table_frame.update_idletasks()
-        canvas.config(scrollregion=canvas.bbox("all"))
+        self.result_table = VirtualResultTable(
+            self.result_window, RESULT_TABLE_HEADERS
+        )
+        self.result_table.pack(fill="both", expand=True, padx=10, pady=10)
+        self.result_table.set_rows(rows, total_row)
 
     def __create_result_window(self):
         """
@@ -133,7 +292,7 @@ class FileLineCounterView(ctk.CTk):
         custom_title = f"{old_path_name} vs {new_path_name}"
         self.result_window = ctk.CTkToplevel(self)
         self.result_window.title(custom_title)
-        self.result_window.geometry("600x400")
+        self.result_window.geometry("1000x700")
 
         title_label = ctk.CTkLabel(
             self.result_window,
@@ -143,105 +302,63 @@ class FileLineCounterView(ctk.CTk):
         )
         title_label.pack(pady=(20, 10))
 
-    def __create_scrollable_table(self):
-        """
-        Creates a scrollable table for displaying metric results.
-        Adds both vertical and horizontal scrollbars.
+    def __build_table_rows(self, metric_results):
         """
-        outer_frame = ctk.CTkFrame(self.result_window)
-        outer_frame.pack(fill="both", expand=True)
-
-        canvas = ctk.CTkCanvas(outer_frame)
-        canvas.pack(side="left", fill="both", expand=True)
+        Converts the metric results into table rows.
 
-        v_scrollbar = ctk.CTkScrollbar(outer_frame, command=canvas.yview)
-        v_scrollbar.pack(side="right", fill="y")
-
-        h_scrollbar = ctk.CTkScrollbar(self.result_window, command=canvas.xview, orientation="horizontal")
-        h_scrollbar.pack(side="bottom", fill="x")
-
-        canvas.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
-
-        table_frame = ctk.CTkFrame(canvas)
-        canvas.create_window((0, 0), window=table_frame, anchor="nw")
+        Each row has the filename, class, methods and physical line
+        counts, the deleted and added lines and whether the file has
+        major changes. The 'Total' entry is returned separately so it
+        stays at the bottom of the table.
+        """
+        rows = []
+        total_row = None
 
-        def on_frame_configure(event):
-            canvas.configure(scrollregion=canvas.bbox("all"))
+        for file_name, metrics in metric_results.items():
+            row = self.__build_table_row(file_name, metrics)
 
-        table_frame.bind("<Configure>", on_frame_configure)
+            if file_name == "Total":
+                total_row = row
+            else:
+                rows.append(row)
 
-        return canvas, table_frame
+        return rows, total_row
 
-    def __populate_table_headers(self, table_frame):
+    def __build_table_row(self, file_name, metrics):
         """
-        Adds headers to the result table.
-
-        The table headers include 'Filename', 'Class',
-        'Total Methods', 'Physical Lines per Class'
-        and 'Total Physical Lines in the Program'.
+        Converts the metrics of one file into a table row.
         """
-        headers = ["File", "Class", "Methods", 
-                    "Physical Lines", "Deleted Lines",
-                    "Added Lines", "Major Changes"
-                ]
-        row_padding, col_padding = 5, 10
+        metrics = tuple(metrics) + ("",) * (5 - len(metrics))
+        class_name, physical_count, method_count, \
+            added_lines, removed_lines = metrics[:5]
+
+        try:
+            has_changes = int(physical_count) * THRESHOLD < (
+                int(added_lines) + int(removed_lines)
+            )
+        except (TypeError, ValueError):
+            has_changes = ""
 
-        for col_index, header in enumerate(headers):
-            ctk.CTkLabel(
-                table_frame,
-                text=header,
-                font=("Helvetica", 14, "bold"),
-            ).grid(row=0, column=col_index, padx=col_padding,
-                   pady=row_padding)
+        return (str(file_name), class_name, method_count,
+                physical_count, added_lines, removed_lines, has_changes)
 
-    def __populate_table_data(self, table_frame, metric_results):
+    def apply_metric_deltas(self, delta):
         """
-        Populates the result table with the metric data.
-
-        This method iterates over the metric results and displays
-        the filename along with its corresponding physical line counts,
-        methods counts and the total number of physical lines
-        in the proyect.
+        Updates the open result table with the rows added, updated or
+        removed since the last change, without rebuilding it.
         """
-        row_padding, col_padding = 5, 10
+        if not hasattr(self, "result_table") or \
+                not self.result_table.winfo_exists():
+            return
 
-        for row_index, (file_name, metrics) in enumerate(
-                metric_results.items(), start=1
-        ):
-            logging.info(f"DEBUG - {file_name} -> {metrics}")
-            class_name, physical_count, method_count, added_lines, removed_lines = metrics
-            has_changes = int(physical_count) * THRESHOLD < (
-                int(added_lines) + int(removed_lines)
-            )
+        changed_results = {**delta.added, **delta.updated}
+        rows, total_row = self.__build_table_rows(changed_results)
 
-            ctk.CTkLabel(table_frame, text=file_name).grid(
-                row=row_index, column=0, padx=col_padding,
-                pady=row_padding
-            )
-            ctk.CTkLabel(table_frame, text=class_name).grid(
-                row=row_index, column=1, padx=col_padding,
-                pady=row_padding
-            )
-            ctk.CTkLabel(table_frame, text=str(method_count)).grid(
-                row=row_index, column=2, padx=col_padding,
-                pady=row_padding
-            )
-            ctk.CTkLabel(table_frame, text=str(physical_count)).grid(
-                row=row_index, column=3, padx=col_padding,
-                pady=row_padding
-            )
-            ctk.CTkLabel(table_frame, text=str(added_lines)).grid(
-                row=row_index, column=4, padx=col_padding,
-                pady=row_padding
-            )
-            ctk.CTkLabel(table_frame, text=str(removed_lines)).grid(
-                row=row_index, column=5, padx=col_padding,
-                pady=row_padding
-            )
-            ctk.CTkLabel(table_frame, text=str(has_changes)).grid(
-                row=row_index, column=6, padx=col_padding,
-                pady=row_padding
-            )
+        self.result_table.apply_row_changes(
+            rows,
+            [str(file_name) for file_name in delta.removed],
+            total_row
+        )
 
     def get_folder_name(self, path: str) -> str:
         """
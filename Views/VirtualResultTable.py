@@ -0,0 +1,199 @@
+import customtkinter as ctk
+
+from tkinter import ttk
+
+from Utils.ResultTableRows import ResultTableRows
+
+class VirtualResultTable(ctk.CTkFrame):
+    """
+    A result table that only creates the rows that are visible.
+
+    The table keeps a fixed number of ttk.Treeview items and refills
+    them with the page of rows selected by its own scrollbar, so the
+    number of widgets does not grow with the number of results. Rows can
+    be sorted by clicking a column header and filtered by column.
+    """
+
+    def __init__(self, master, headers, visible_row_count=25, **kwargs):
+        """
+        Initializes the table with its column headers.
+        """
+        super().__init__(master, **kwargs)
+
+        self.__headers = headers
+        self.__visible_row_count = visible_row_count
+        self.__first_row = 0
+        self.__rows = ResultTableRows()
+
+        self.__create_filter_bar()
+        self.__create_tree()
+
+    def __create_filter_bar(self):
+        """
+        Creates the column selector and the text entry used to filter.
+        """
+        filter_frame = ctk.CTkFrame(self, fg_color="transparent")
+        filter_frame.pack(fill="x", pady=(0, 5))
+
+        self.filter_column_menu = ctk.CTkOptionMenu(
+            filter_frame,
+            values=["All columns"] + self.__headers,
+            command=lambda _: self.__apply_filter(),
+        )
+        self.filter_column_menu.pack(side="left", padx=(0, 10))
+
+        self.filter_entry = ctk.CTkEntry(
+            filter_frame,
+            placeholder_text="Filter...",
+        )
+        self.filter_entry.pack(side="left", fill="x", expand=True)
+        self.filter_entry.bind("<KeyRelease>", lambda _: self.__apply_filter())
+
+    def __create_tree(self):
+        """
+        Creates the Treeview with a fixed number of items and the
+        scrollbar that selects which rows they show.
+        """
+        table_frame = ctk.CTkFrame(self)
+        table_frame.pack(fill="both", expand=True)
+
+        style = ttk.Style(self)
+        style.theme_use("default")
+        style.configure(
+            "Results.Treeview",
+            background="#2b2b2b",
+            fieldbackground="#2b2b2b",
+            foreground="white",
+            rowheight=24,
+        )
+        style.configure(
+            "Results.Treeview.Heading",
+            background="#1f538d",
+            foreground="white",
+            font=("Helvetica", 12, "bold"),
+        )
+
+        self.tree = ttk.Treeview(
+            table_frame,
+            columns=self.__headers,
+            show="headings",
+            height=self.__visible_row_count,
+            style="Results.Treeview",
+            selectmode="browse",
+        )
+
+        for column_index, header in enumerate(self.__headers):
+            self.tree.heading(
+                header,
+                text=header,
+                command=lambda index=column_index: self.sort_by(index),
+            )
+            self.tree.column(header, width=140, anchor="w")
+
+        for item_index in range(self.__visible_row_count):
+            self.tree.insert("", "end", iid=str(item_index), values=())
+
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        self.v_scrollbar = ctk.CTkScrollbar(
+            table_frame, command=self.__on_scrollbar
+        )
+        self.v_scrollbar.pack(side="right", fill="y")
+
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(sequence, self.__on_mouse_wheel)
+
+    def set_rows(self, rows, total_row=None):
+        """
+        Sets the rows shown by the table, plus an optional total row
+        that is always displayed last.
+        """
+        self.__rows.set_rows(rows, total_row)
+        self.__scroll_to(0)
+
+    def apply_row_changes(self, upserted_rows, removed_keys, total_row=None):
+        """
+        Updates only the changed rows, keeping the scroll position, and
+        replaces the total row when one is given.
+        """
+        if removed_keys:
+            self.__rows.remove_rows(removed_keys)
+        if upserted_rows:
+            self.__rows.upsert_rows(upserted_rows)
+        if total_row is not None:
+            self.__rows.set_total_row(total_row)
+
+        self.__scroll_to(self.__first_row)
+
+    def sort_by(self, column_index):
+        """
+        Sorts the rows by a column, reversing the order on a second
+        click, and marks the sorted column header.
+        """
+        self.__rows.sort_by(column_index)
+        sort_column, descending = self.__rows.get_sort_state()
+
+        for index, header in enumerate(self.__headers):
+            arrow = ""
+            if index == sort_column:
+                arrow = " ▼" if descending else " ▲"
+            self.tree.heading(header, text=header + arrow)
+
+        self.__scroll_to(0)
+
+    def __apply_filter(self):
+        """
+        Filters the rows with the selected column and entry text.
+        """
+        selected_column = self.filter_column_menu.get()
+        column_index = self.__headers.index(selected_column) \
+            if selected_column in self.__headers else None
+
+        self.__rows.set_filter(column_index, self.filter_entry.get())
+        self.__scroll_to(0)
+
+    def __on_scrollbar(self, action, amount, unit=None):
+        """
+        Handles the scrollbar commands ('moveto' and 'scroll').
+        """
+        if action == "moveto":
+            self.__scroll_to(round(float(amount) * len(self.__rows)))
+        elif action == "scroll":
+            step = self.__visible_row_count if unit == "pages" else 1
+            self.__scroll_to(self.__first_row + int(amount) * step)
+
+    def __on_mouse_wheel(self, event):
+        """
+        Scrolls three rows per wheel step.
+        """
+        if event.num == 4 or event.delta > 0:
+            self.__scroll_to(self.__first_row - 3)
+        else:
+            self.__scroll_to(self.__first_row + 3)
+
+        return "break"
+
+    def __scroll_to(self, first_row):
+        """
+        Shows the page of rows that starts at `first_row` and updates
+        the scrollbar.
+        """
+        row_count = len(self.__rows)
+        last_first_row = max(0, row_count - self.__visible_row_count)
+        self.__first_row = min(max(0, first_row), last_first_row)
+
+        page = self.__rows.get_page(
+            self.__first_row, self.__visible_row_count
+        )
+
+        for item_index in range(self.__visible_row_count):
+            values = page[item_index] if item_index < len(page) else ()
+            self.tree.item(str(item_index), values=values)
+
+        if row_count:
+            self.v_scrollbar.set(
+                self.__first_row / row_count,
+                (self.__first_row + len(page)) / row_count
+            )
+        else:
+            self.v_scrollbar.set(0, 1)
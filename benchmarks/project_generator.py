@@ -0,0 +1,95 @@
+"""
+Generates synthetic pairs of Python project versions for the benchmarks.
+
+The same parameters and seed always produce the same trees, so results
+can be compared between commits.
+"""
+import random
+
+from pathlib import Path
+
+def build_module(module_index, line_count, generator):
+    """
+    Builds the lines of a module with one class, docstrings, comments
+    and a few lines longer than the standard allows.
+    """
+    lines = [
+        f'"""Synthetic module {module_index}."""\n',
+        "import os\n",
+        "\n",
+        "\n",
+        f"class Module{module_index}:\n",
+        f'    """Class of module {module_index}."""\n',
+    ]
+    method_index = 0
+
+    while len(lines) < line_count:
+        lines.append("\n")
+        lines.append(f"    def method_{method_index}(self, value):\n")
+        lines.append("        # Computes the next value\n")
+        for statement_index in range(generator.randint(3, 8)):
+            if generator.random() < 0.05:
+                lines.append(
+                    f"        result_{statement_index} = value + "
+                    + " + ".join(str(number) for number in range(30))
+                    + "\n"
+                )
+            else:
+                lines.append(
+                    f"        result_{statement_index} = value * "
+                    f"{generator.randint(1, 1000)}\n"
+                )
+        lines.append("        return value\n")
+        method_index += 1
+
+    return lines[:line_count]
+
+def change_module(lines, generator):
+    """
+    Returns a new version of a module with some lines changed, removed
+    and added.
+    """
+    new_lines = list(lines)
+
+    for _ in range(max(1, len(lines) // 20)):
+        position = generator.randrange(6, len(new_lines))
+        action = generator.random()
+        if action < 0.4:
+            new_lines[position] = \
+                f"        changed = {generator.randint(1, 1000)}\n"
+        elif action < 0.7 and len(new_lines) > 7:
+            del new_lines[position]
+        else:
+            new_lines.insert(
+                position, f"        added = {generator.randint(1, 1000)}\n"
+            )
+
+    return new_lines
+
+def generate_project_tree(root, file_count=100, lines_per_file=200,
+                          change_ratio=0.3, seed=0):
+    """
+    Writes an 'old' and a 'new' version of a project under `root`.
+
+    `change_ratio` of the files are modified in the new version; the
+    rest are identical. Returns the paths of both versions.
+    """
+    generator = random.Random(seed)
+    old_root = Path(root) / "old"
+    new_root = Path(root) / "new"
+
+    for file_index in range(file_count):
+        relative_path = Path(f"package_{file_index % 10}") / \
+            f"module_{file_index}.py"
+        lines = build_module(file_index, lines_per_file, generator)
+        new_lines = change_module(lines, generator) \
+            if generator.random() < change_ratio else lines
+
+        for version_root, version_lines in (
+            (old_root, lines), (new_root, new_lines)
+        ):
+            file_path = version_root / relative_path
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.write_text("".join(version_lines), encoding="utf-8")
+
+    return old_root, new_root
@@ -0,0 +1,285 @@
+"""
+Measures the throughput of every stage of the analysis pipeline.
+
+Each stage runs in a fresh process on a fresh copy of a synthetic
+project, and reports files/s, MB/s (over the bytes of both versions)
+and its peak resident memory. The results are written as JSON; pass
+a previous results file with --compare to see the change of every
+stage.
+
+Usage:
+    python benchmarks/run_benchmarks.py --files 200 --output results.json
+    python benchmarks/run_benchmarks.py --compare results.json
+"""
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+
+from project_generator import generate_project_tree
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+def get_file_pairs(old_root, new_root):
+    """
+    Returns the (old file, new file) pairs of both versions.
+    """
+    return [
+        (old_root / new_file.relative_to(new_root), new_file)
+        for new_file in sorted(new_root.rglob("*.py"))
+    ]
+
+def run_analyze(old_root, new_root, engine_name):
+    """Counts the lines of every new file."""
+    from Controllers.FileLineCounterController import (
+        FileLineCounterController)
+    from Utils.FileReader import FileReader
+
+    engine = FileLineCounterController.COUNTING_ENGINES[engine_name]()
+    for _, new_file in get_file_pairs(old_root, new_root):
+        engine.analyze(FileReader(str(new_file)).iter_lines())
+
+def run_compare_files(old_root, new_root, diff_engine="difflib"):
+    """Counts the added and removed lines of every pair."""
+    from Controllers.FileComparerController import FileComparerController
+
+    comparer = FileComparerController(diff_engine=diff_engine)
+    for old_file, new_file in get_file_pairs(old_root, new_root):
+        comparer.compare_files(old_file, new_file)
+
+def run_format_file_long_lines(old_root, new_root):
+    """Reflows the long lines of every new file."""
+    from Controllers.FileComparerController import FileComparerController
+
+    comparer = FileComparerController()
+    for _, new_file in get_file_pairs(old_root, new_root):
+        comparer.format_file_long_lines(new_file)
+
+def run_add_modification_comments(old_root, new_root):
+    """Annotates the changes of every pair."""
+    from Controllers.FileComparerController import FileComparerController
+
+    comparer = FileComparerController()
+    for old_file, new_file in get_file_pairs(old_root, new_root):
+        comparer.add_modification_comments(old_file, new_file)
+
+def run_process_file_path(old_root, new_root, read_only,
+                          skip_unchanged_trees=False, diff_engine="difflib"):
+    """Runs a whole comparison like the command line entry point."""
+    from Controllers.FileLineCounterController import (
+        FileLineCounterController)
+    from Models.FileLineCounterModel import FileLineCounterModel
+    from Views.FileLineCounterReportView import FileLineCounterReportView
+
+    controller = FileLineCounterController()
+    controller.set_file_line_counter_view(
+        FileLineCounterReportView("json", io.StringIO())
+    )
+    controller.set_file_line_counter_model(FileLineCounterModel(controller))
+    controller.set_read_only(read_only)
+    controller.set_skip_unchanged_trees(skip_unchanged_trees)
+    controller.set_diff_engine(diff_engine)
+    controller.process_file_path(str(old_root), str(new_root))
+
+STAGES = {
+    "analyze_heuristic": lambda old, new: run_analyze(old, new, "heuristic"),
+    "analyze_tokenize": lambda old, new: run_analyze(old, new, "tokenize"),
+    "compare_files": run_compare_files,
+    "compare_files_myers": lambda old, new: run_compare_files(
+        old, new, "myers"),
+    "format_file_long_lines": run_format_file_long_lines,
+    "add_modification_comments": run_add_modification_comments,
+    "process_file_path": lambda old, new: run_process_file_path(
+        old, new, False),
+    "process_file_path_read_only": lambda old, new: run_process_file_path(
+        old, new, True),
+    "process_file_path_myers": lambda old, new: run_process_file_path(
+        old, new, True, diff_engine="myers"),
+    "process_file_path_skip_unchanged_trees":
+        lambda old, new: run_process_file_path(old, new, True, True),
+}
+
+def get_peak_rss_kb():
+    """
+    Returns the peak resident memory of the process in KiB, or None
+    where the resource module is not available.
+    """
+    if resource is None:
+        return None
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak_rss // 1024 if sys.platform == "darwin" else peak_rss
+
+def run_stage(stage_name, tree_root, repeat):
+    """
+    Runs a stage in the current process on fresh copies of the tree
+    and returns its best time and peak memory.
+    """
+    best_seconds = float("inf")
+
+    for run_index in range(repeat):
+        run_root = Path(tree_root).parent / f"{stage_name}_{run_index}"
+        shutil.copytree(tree_root, run_root)
+        try:
+            start = time.perf_counter()
+            STAGES[stage_name](run_root / "old", run_root / "new")
+            best_seconds = min(best_seconds, time.perf_counter() - start)
+        finally:
+            shutil.rmtree(run_root)
+
+    return best_seconds, get_peak_rss_kb()
+
+def measure_tree(tree_root):
+    """
+    Returns the number of new files and the bytes of both versions.
+    """
+    file_count = len(list((Path(tree_root) / "new").rglob("*.py")))
+    byte_count = sum(
+        file_path.stat().st_size
+        for file_path in Path(tree_root).rglob("*.py")
+    )
+    return file_count, byte_count
+
+def get_commit():
+    """
+    Returns the current git commit, or None outside a repository.
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+            check=True, cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmarks(file_count=100, lines_per_file=200, change_ratio=0.3,
+                   seed=0, repeat=3, stages=None):
+    """
+    Generates a project and benchmarks the selected stages, each in a
+    new process. Returns the results as a dictionary.
+    """
+    stages = stages or list(STAGES)
+    results = {}
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        tree_root = Path(temporary_directory) / "tree"
+        generate_project_tree(
+            tree_root, file_count, lines_per_file, change_ratio, seed
+        )
+        files, byte_count = measure_tree(tree_root)
+        context = multiprocessing.get_context("spawn")
+
+        for stage_name in stages:
+            with ProcessPoolExecutor(1, mp_context=context) as executor:
+                seconds, peak_rss_kb = executor.submit(
+                    run_stage, stage_name, tree_root, repeat
+                ).result()
+
+            results[stage_name] = {
+                "seconds": round(seconds, 6),
+                "files_per_second": round(files / seconds, 2),
+                "mb_per_second": round(byte_count / seconds / 1e6, 3),
+                "peak_rss_kb": peak_rss_kb,
+            }
+
+    return {
+        "commit": get_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            "files": file_count,
+            "lines_per_file": lines_per_file,
+            "change_ratio": change_ratio,
+            "seed": seed,
+            "repeat": repeat,
+            "bytes": byte_count,
+        },
+        "stages": results,
+    }
+
+def compare_results(previous, current):
+    """
+    Returns one line per stage with the change of throughput against
+    previous results.
+    """
+    lines = []
+
+    for stage_name, stage in current["stages"].items():
+        previous_stage = previous.get("stages", {}).get(stage_name)
+        if previous_stage is None:
+            lines.append(f"{stage_name:>28}: new stage")
+            continue
+
+        ratio = stage["files_per_second"] / previous_stage["files_per_second"]
+        lines.append(
+            f"{stage_name:>28}: {previous_stage['files_per_second']:10.1f} "
+            f"-> {stage['files_per_second']:10.1f} files/s "
+            f"({(ratio - 1) * 100:+.1f}%)"
+        )
+
+    return lines
+
+def parse_arguments(arguments=None):
+    """
+    Parses the command line arguments of the benchmarks.
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark the stages of the analysis pipeline."
+    )
+    parser.add_argument("--files", type=int, default=100)
+    parser.add_argument("--lines", type=int, default=200,
+                        help="Lines per file.")
+    parser.add_argument("--change-ratio", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--stage", dest="stages", action="append",
+                        choices=tuple(STAGES),
+                        help="Stage to run; repeat it to run several "
+                             "(default: all).")
+    parser.add_argument("--output", help="File to write the JSON results.")
+    parser.add_argument("--compare",
+                        help="Previous JSON results to compare against.")
+    return parser.parse_args(arguments)
+
+def main(arguments=None):
+    """
+    Runs the benchmarks and writes or compares their results.
+    """
+    arguments = parse_arguments(arguments)
+    results = run_benchmarks(
+        arguments.files, arguments.lines, arguments.change_ratio,
+        arguments.seed, arguments.repeat, arguments.stages
+    )
+
+    if arguments.output:
+        with open(arguments.output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+    if arguments.compare:
+        with open(arguments.compare, encoding="utf-8") as previous_file:
+            previous = json.load(previous_file)
+        print("\n".join(compare_results(previous, results)), file=sys.stderr)
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+import argparse
+import json
+import logging
+import sys
+
+from Controllers.FileComparerController import FileComparerController
+from Controllers.FileLineCounterController import FileLineCounterController
+from Controllers.PythonStandardValidatorController import (
+    PythonStandardValidatorController)
+from Models.FileLineCounterModel import FileLineCounterModel
+from Views.FileLineCounterReportView import FileLineCounterReportView
+from Utils.Constants import DEFAULT_EXCLUDE_PATTERNS
+from Utils.MetricsCache import MetricsCache
+from Utils.ProjectTreeWalker import ProjectTreeWalker
+from Utils.StageProfiler import StageProfiler
+
+logging.basicConfig(level=logging.WARNING)
+
+def positive_integer(value):
+    """
+    Parses a command line value that must be an integer of at least 1.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer: '{value}'")
+
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+
+    return number
+
+def add_analysis_arguments(parser):
+    """
+    Adds the arguments that decide how the files are listed and
+    analyzed, shared by comparisons and snapshots.
+    """
+    parser.add_argument(
+        "--cache", help="Path of a persistent metrics cache."
+    )
+    parser.add_argument(
+        "--counting-engine", default="heuristic",
+        choices=tuple(FileLineCounterController.COUNTING_ENGINES),
+        help="How lines and methods are counted: 'heuristic' (fast, "
+             "default) or 'tokenize' (exact, per class)."
+    )
+    parser.add_argument(
+        "--diff-engine", default="difflib",
+        choices=tuple(FileComparerController.DIFF_ENGINES),
+        help="How the versions of a file are diffed: 'difflib' "
+             "(default) or 'myers' (linear space, faster on large files)."
+    )
+    parser.add_argument(
+        "--rule", dest="rules", action="append",
+        choices=tuple(PythonStandardValidatorController.STANDARD_RULES),
+        help="Rule of the standard files must comply with; repeat it to "
+             "check several (default: line-length)."
+    )
+    parser.add_argument(
+        "--exclude", dest="exclude_patterns", action="append", default=[],
+        metavar="PATTERN",
+        help="Skip the files and directories matching a .gitignore-style "
+             "pattern; repeat it to skip several."
+    )
+    parser.add_argument(
+        "--no-default-excludes", action="store_true",
+        help="Also walk virtual environments, node_modules, __pycache__, "
+             "build output and the other directories skipped by default."
+    )
+    parser.add_argument(
+        "--no-gitignore", action="store_true",
+        help="Do not honour the .gitignore files of the compared trees."
+    )
+    parser.add_argument(
+        "--walk-threads", type=positive_integer, default=1,
+        help="Threads used to list the compared directories, useful on "
+             "network filesystems."
+    )
+
+def configure_analysis(controller, arguments, metrics_cache):
+    """
+    Applies the arguments added by `add_analysis_arguments`.
+    """
+    controller.set_metrics_cache(metrics_cache)
+    controller.set_counting_engine(arguments.counting_engine)
+    controller.set_diff_engine(arguments.diff_engine)
+    controller.set_tree_walker(ProjectTreeWalker(
+        (() if arguments.no_default_excludes
+         else DEFAULT_EXCLUDE_PATTERNS) + tuple(arguments.exclude_patterns),
+        not arguments.no_gitignore,
+        arguments.walk_threads
+    ))
+    if arguments.rules:
+        controller.set_standard_rules(arguments.rules)
+
+def build_argument_parser():
+    """
+    Builds the parser of the command line arguments of the headless
+    comparison.
+    """
+    parser = argparse.ArgumentParser(
+        description="Compare two versions of a Python project without "
+                    "the graphical interface."
+    )
+    parser.add_argument(
+        "old_path",
+        help="Previous version path, snapshot manifest written by the "
+             "'snapshot' command, or revision with --git."
+    )
+    parser.add_argument(
+        "new_path", help="Current version path, or revision with --git."
+    )
+    parser.add_argument(
+        "--git", metavar="REPOSITORY",
+        help="Compare two revisions of this git repository, read from "
+             "its object store without checking them out."
+    )
+    parser.add_argument(
+        "--format", choices=("json", "csv"), default="json",
+        help="Output format of the results (default: json)."
+    )
+    parser.add_argument(
+        "--output", help="File to write the results to (default: stdout)."
+    )
+    parser.add_argument(
+        "--workers", type=positive_integer, default=1,
+        help="Worker processes used to compare directories."
+    )
+    parser.add_argument(
+        "--read-only", action="store_true",
+        help="Do not rewrite the compared files."
+    )
+    parser.add_argument(
+        "--annotations-dir",
+        help="Where read-only mode writes the annotated files."
+    )
+    add_analysis_arguments(parser)
+    parser.add_argument(
+        "--skip-unchanged-trees", action="store_true",
+        help="Report the directories whose content hash is the same in "
+             "both versions as unchanged without comparing their files; "
+             "file hashes are recorded in the --cache database."
+    )
+    parser.add_argument(
+        "--units", action="store_true",
+        help="Add the physical lines and methods of every top-level "
+             "class and function of the compared files to the JSON "
+             "results."
+    )
+    parser.add_argument(
+        "--no-rename-detection", action="store_true",
+        help="Pair files by relative path only, reporting moved and "
+             "renamed modules as deleted and added."
+    )
+    parser.add_argument(
+        "--profile",
+        help="File to write a JSON report of the time, counters and "
+             "bytes of each stage of the comparison."
+    )
+    parser.add_argument(
+        "--cprofile",
+        help="File to write cProfile statistics of the comparison, "
+             "readable with pstats."
+    )
+    return parser
+
+def parse_arguments(arguments=None):
+    """
+    Parses the command line arguments of the headless comparison.
+    """
+    return build_argument_parser().parse_args(arguments)
+
+def parse_snapshot_arguments(arguments=None):
+    """
+    Parses the command line arguments of the snapshot command.
+    """
+    parser = argparse.ArgumentParser(
+        prog="cli.py snapshot",
+        description="Record the files and metrics of a project tree in a "
+                    "manifest that can replace the tree as the previous "
+                    "version of later comparisons."
+    )
+    parser.add_argument("tree", help="Project tree to record.")
+    parser.add_argument("manifest", help="JSON manifest file to write.")
+    add_analysis_arguments(parser)
+    return parser.parse_args(arguments)
+
+def snapshot_main(arguments=None):
+    """
+    Writes the snapshot manifest of a project tree.
+    """
+    arguments = parse_snapshot_arguments(arguments)
+    metrics_cache = MetricsCache(arguments.cache) if arguments.cache else None
+
+    try:
+        controller = FileLineCounterController()
+        configure_analysis(controller, arguments, metrics_cache)
+        controller.create_snapshot(arguments.tree).write(arguments.manifest)
+    finally:
+        if metrics_cache is not None:
+            metrics_cache.close()
+
+    return 0
+
+def main(arguments=None):
+    """
+    Runs a comparison and writes its results as JSON or CSV, or the
+    snapshot command when the first argument is 'snapshot'.
+    """
+    if arguments is None:
+        arguments = sys.argv[1:]
+    if arguments[:1] == ["snapshot"]:
+        return snapshot_main(arguments[1:])
+
+    parser = build_argument_parser()
+    arguments = parser.parse_args(arguments)
+    output_stream = open(arguments.output, "w", newline="",
+                         encoding="utf-8") if arguments.output else sys.stdout
+    metrics_cache = MetricsCache(arguments.cache) if arguments.cache else None
+    profiler = StageProfiler(use_cprofile=bool(arguments.cprofile)) \
+        if arguments.profile or arguments.cprofile else None
+
+    try:
+        controller = FileLineCounterController()
+        view = FileLineCounterReportView(arguments.format, output_stream)
+        model = FileLineCounterModel(controller)
+
+        controller.set_file_line_counter_view(view)
+        controller.set_file_line_counter_model(model)
+        controller.set_max_workers(arguments.workers)
+        controller.set_read_only(arguments.read_only,
+                                 arguments.annotations_dir)
+        controller.set_profiler(profiler)
+        configure_analysis(controller, arguments, metrics_cache)
+        controller.set_skip_unchanged_trees(arguments.skip_unchanged_trees)
+        controller.set_code_unit_breakdown(arguments.units)
+        if arguments.no_rename_detection:
+            controller.set_rename_detector(None)
+
+        if arguments.git:
+            try:
+                controller.process_git_revisions(
+                    arguments.git, arguments.old_path, arguments.new_path
+                )
+            except ValueError as e:
+                parser.error(str(e))
+        else:
+            controller.process_file_path(
+                arguments.old_path, arguments.new_path
+            )
+
+        if arguments.profile:
+            with open(arguments.profile, "w", encoding="utf-8") as report_file:
+                json.dump(profiler.get_report(), report_file, indent=2)
+        if arguments.cprofile:
+            profiler.dump_stats(arguments.cprofile)
+    finally:
+        if metrics_cache is not None:
+            metrics_cache.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+import pytest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/../.."))
+
+from unittest.mock import patch
+from Controllers.FileComparerController import FileComparerController
+
+
+@pytest.fixture
+def comparer():
+    """
+    Creates an instance of FileComparerController.
+    """
+    return FileComparerController()
+
+
+def write_file(path, content):
+    """
+    Writes the given content to a file and returns its path.
+    """
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+def test_identical_files_skip_the_diff(comparer, tmp_path):
+    """
+    Tests that identical files are compared without running difflib
+    and that they are not annotated.
+    """
+    content = "x = 1\nprint(x)\n"
+    old_file = write_file(tmp_path / "old.py", content)
+    new_file = write_file(tmp_path / "new.py", content)
+
+    with patch.object(comparer.get_diff_engine(), "get_opcodes") as diff:
+        assert comparer.compare_files(old_file, new_file) == (0, 0)
+        comparer.add_modification_comments(old_file, new_file)
+
+    diff.assert_not_called()
+    assert old_file.read_text(encoding="utf-8") == content
+    assert new_file.read_text(encoding="utf-8") == content
+
+
+@pytest.mark.parametrize("old_content,new_content,expected", [
+    ("x = 1\n", "x = 1\ny = 2\n", False),
+    ("x = 1\n", "x = 2\n", False),
+    ("x = 1\n", "x = 1\n", True),
+])
+def test_files_are_identical(comparer, tmp_path, old_content,
+                             new_content, expected):
+    """
+    Tests the size and hash based identity check.
+    """
+    old_file = write_file(tmp_path / "old.py", old_content)
+    new_file = write_file(tmp_path / "new.py", new_content)
+
+    assert comparer.files_are_identical(old_file, new_file) is expected
+
+
+def test_hard_links_are_identical_without_reading(comparer, tmp_path):
+    """
+    Tests that the stat check recognizes hard-linked files.
+    """
+    old_file = write_file(tmp_path / "old.py", "x = 1\n")
+    new_file = tmp_path / "new.py"
+    os.link(old_file, new_file)
+
+    with patch.object(comparer,
+                      "_FileComparerController__hash_file") as hash_file:
+        assert comparer.files_are_identical(old_file, new_file)
+
+    hash_file.assert_not_called()
+
+
+@pytest.mark.parametrize("diff_engine", ["difflib", "myers"])
+def test_compare_files_counts_changes(tmp_path, diff_engine):
+    """
+    Tests that different files are still diffed with every engine.
+    """
+    comparer = FileComparerController(diff_engine=diff_engine)
+    old_file = write_file(tmp_path / "old.py", "a = 1\nb = 2\n")
+    new_file = write_file(tmp_path / "new.py", "a = 1\nb = 3\nc = 4\n")
+
+    assert comparer.compare_files(old_file, new_file) == (2, 1)
+
+
+def test_unknown_diff_engine_is_rejected():
+    """
+    Tests that selecting an unknown engine name fails.
+    """
+    with pytest.raises(ValueError):
+        FileComparerController(diff_engine="patience")
+
+
+def test_diff_result_is_reused_for_annotation(comparer, tmp_path):
+    """
+    Tests that annotating with an existing diff result does not diff
+    the files again and produces the expected comments.
+    """
+    old_file = write_file(tmp_path / "old.py", "a = 1\nb = 2\n")
+    new_file = write_file(tmp_path / "new.py", "a = 1\nb = 3\nc = 4\n")
+
+    diff_result = comparer.diff_files(old_file, new_file)
+
+    with patch.object(comparer.get_diff_engine(), "get_opcodes") as diff:
+        comparer.add_modification_comments(old_file, new_file, diff_result)
+
+    diff.assert_not_called()
+    assert (diff_result.added_lines, diff_result.removed_lines) == (2, 1)
+    assert new_file.read_text(encoding="utf-8") == (
+        "a = 1\n"
+        "# Added Line:   # minor change\n"
+        "b = 3\n"
+        "# Added Line: Major change\n"
+        "c = 4\n"
+    )
+
+
+@pytest.mark.parametrize("old_lines,new_lines,expected_severities", [
+    (["a = 1\n"], ["a = 2\n"], ["minor"]),
+    (["a = 1\n"], ["a = 1000000\n"], ["major"]),
+    (["a = 1\n"], ["a = 2\n", "b = 3\n"], ["major"]),
+    (["a = 1\n", "b = 2\n"], ["b = 2\n"], ["major"]),
+    (["a = 1\n"], ["a = 1\n"], []),
+])
+def test_diff_lines_grades_hunks(comparer, old_lines, new_lines,
+                                 expected_severities):
+    """
+    Tests the severity assigned to every changed hunk.
+    """
+    diff_result = comparer.diff_lines(old_lines, new_lines)
+
+    assert [hunk.severity for hunk in diff_result.hunks] == \
+        expected_severities
@@ -4,9 +4,13 @@ import os
 
 sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/../.."))
 
+import threading
+
+from pathlib import Path
 from unittest.mock import Mock
 from unittest.mock import patch
 from Controllers.FileLineCounterController import FileLineCounterController
+from Utils.MetricsCache import MetricsCache
 
 
 @pytest.fixture
@@ -164,4 +168,611 @@ def test_get_file_metrics_invalid_file(controller):
                           return_value=False):
             result = controller.get_file_metrics(mock_file)
 
-    assert result == ("Doesn't comply with Standard", 'None', 'None')
\ No newline at end of file
+    assert result == ("Doesn't comply with Standard", 'None', 'None')
+
+def test_set_max_workers_rejects_invalid_values(controller):
+    """
+    Tests that the controller refuses a worker count lower than one.
+    """
+    with pytest.raises(ValueError):
+        controller.set_max_workers(0)
+
+
+def test_process_directory_in_parallel_matches_sequential(tmp_path):
+    """
+    Tests that comparing a directory with a process pool gives the
+    same results, in the same order, as the sequential mode.
+    """
+    def create_trees(root):
+        old_dir = root / "old"
+        new_dir = root / "new"
+        for directory in (old_dir, new_dir):
+            directory.mkdir(parents=True)
+        for index in range(4):
+            (old_dir / f"module_{index}.py").write_text(
+                f"class Module{index}:\n    def run(self):\n        pass\n"
+            )
+            (new_dir / f"module_{index}.py").write_text(
+                f"class Module{index}:\n    def run(self):\n"
+                "        return 1\n"
+            )
+        return old_dir, new_dir
+
+    results = []
+    for max_workers in (1, 2):
+        model = Mock()
+        controller = FileLineCounterController(Mock(), model)
+        controller.set_max_workers(max_workers)
+        old_dir, new_dir = create_trees(tmp_path / str(max_workers))
+
+        controller.process_file_path(old_dir, new_dir)
+
+        line_counting_results = model.set_line_count_results.call_args[0][0]
+        results.append([
+            (Path(path).name if path != "Total" else path, metrics)
+            for path, metrics in line_counting_results.items()
+        ])
+
+    assert results[0] == results[1]
+
+
+def test_metrics_cache_reuses_results(controller, tmp_path):
+    """
+    Tests that a second comparison of byte-identical files is
+    answered by the metrics cache.
+    """
+    metrics_cache = MetricsCache(tmp_path / "metrics.sqlite")
+    controller.set_metrics_cache(metrics_cache)
+
+    source = "class Ejemplo:\n    def run(self):\n        pass\n"
+    for run in ("first", "second"):
+        (tmp_path / run).mkdir()
+        old_file = tmp_path / run / "old.py"
+        new_file = tmp_path / run / "new.py"
+        old_file.write_text(source)
+        new_file.write_text(source)
+        metrics = controller.get_file_metrics(new_file, old_file)
+
+    assert metrics == ("Ejemplo", 3, 1, 0, 0)
+    assert metrics_cache.get_misses() == 1
+    assert metrics_cache.get_hits() == 1
+    metrics_cache.close()
+
+
+def test_read_only_mode_matches_default_without_writing(tmp_path):
+    """
+    Tests that the read-only mode computes the same metrics as the
+    default mode, leaves the compared files untouched and writes the
+    annotated files to the output directory.
+    """
+    old_source = (
+        "class Ejemplo:\n"
+        "    def run(self):\n"
+        "        valor = 'una cadena lo bastante larga para que la linea "
+        "supere el limite permitido'\n"
+        "        return 1\n"
+    )
+    new_source = old_source.replace("return 1", "return 2") + \
+        "    def stop(self):\n        pass\n"
+
+    results = []
+    for read_only in (False, True):
+        old_file = tmp_path / str(read_only) / "old" / "ejemplo.py"
+        new_file = tmp_path / str(read_only) / "new" / "ejemplo.py"
+        for path, source in ((old_file, old_source), (new_file, new_source)):
+            path.parent.mkdir(parents=True)
+            path.write_text(source)
+
+        controller = FileLineCounterController(Mock(), Mock())
+        controller.set_read_only(read_only, tmp_path / "output")
+        results.append(controller.get_file_metrics(new_file, old_file))
+
+    assert results[0] == results[1]
+    assert old_file.read_text() == old_source
+    assert new_file.read_text() == new_source
+
+    output_file = tmp_path / "output" / \
+        new_file.resolve().relative_to(new_file.resolve().anchor)
+    assert "# Added Line" in output_file.read_text()
+
+
+def create_project_versions(root, file_count):
+    """
+    Creates an old and a new version of a project with the same files.
+    """
+    old_dir = root / "old"
+    new_dir = root / "new"
+    for directory in (old_dir, new_dir):
+        directory.mkdir(parents=True)
+        for index in range(file_count):
+            (directory / f"module_{index}.py").write_text(f"x = {index}\n")
+    return old_dir, new_dir
+
+
+def test_collect_results_reports_progress(controller, tmp_path):
+    """
+    Tests that every processed file is streamed to the listeners and
+    that the model is not touched while collecting.
+    """
+    old_dir, new_dir = create_project_versions(tmp_path, 3)
+    streamed_results = []
+    progress_events = []
+
+    results = controller.collect_file_path_results(
+        old_dir, new_dir,
+        on_result=lambda path, metrics: streamed_results.append(path),
+        on_progress=progress_events.append
+    )
+
+    assert streamed_results == [path for path in results if path != "Total"]
+    assert [event.files_done for event in progress_events] == [0, 1, 2, 3]
+    assert progress_events[-1].files_total == 3
+    assert progress_events[-1].eta_seconds == 0
+    controller.get_file_line_counter_model() \
+        .set_line_count_results.assert_not_called()
+
+
+def test_collect_results_stops_when_cancelled(controller, tmp_path):
+    """
+    Tests that a cancelled comparison returns the partial results.
+    """
+    old_dir, new_dir = create_project_versions(tmp_path, 5)
+    cancel_event = threading.Event()
+
+    def cancel_after_two(path, metrics):
+        if len(processed_files) == 1:
+            cancel_event.set()
+        processed_files.append(path)
+
+    processed_files = []
+    results = controller.collect_file_path_results(
+        old_dir, new_dir,
+        on_result=cancel_after_two,
+        cancel_event=cancel_event
+    )
+
+    assert len(processed_files) == 2
+    assert list(results) == processed_files + ["Total"]
+
+
+def test_standard_rules_decide_compliance(tmp_path):
+    """
+    Tests that a file is only rejected by the rules that are selected,
+    in the default and the read-only modes.
+    """
+    old_file = tmp_path / "old" / "ejemplo.py"
+    new_file = tmp_path / "new" / "ejemplo.py"
+    for path, value in ((old_file, 1), (new_file, 2)):
+        path.parent.mkdir()
+        path.write_text(f"class Ejemplo:\n\tvalor = {value} \n")
+
+    for read_only in (True, False):
+        controller = FileLineCounterController(Mock(), Mock())
+        controller.set_read_only(read_only, tmp_path / "output")
+        assert controller.get_file_metrics(new_file, old_file)[0] == \
+            "Ejemplo"
+
+        controller.set_standard_rules(["line-length", "tab-indentation"])
+        assert controller.get_standard_rules() == \
+            ("line-length", "tab-indentation")
+        assert controller.get_file_metrics(new_file, old_file)[0] == \
+            "Doesn't comply with Standard"
+
+    with pytest.raises(ValueError):
+        controller.set_standard_rules(["unknown-rule"])
+
+
+def test_counting_engine_selection(tmp_path):
+    """
+    Tests that the tokenize engine counts async methods the heuristic
+    engine misses, and that unknown engines are rejected.
+    """
+    old_file = tmp_path / "old" / "ejemplo.py"
+    new_file = tmp_path / "new" / "ejemplo.py"
+    for path, value in ((old_file, 1), (new_file, 2)):
+        path.parent.mkdir()
+        path.write_text(
+            f"class Ejemplo:\n    async def run(self):\n"
+            f"        return {value}\n"
+        )
+
+    controller = FileLineCounterController(Mock(), Mock())
+    controller.set_read_only(True)
+    assert controller.get_counting_engine() == "heuristic"
+    assert controller.get_file_metrics(new_file, old_file)[2] == 0
+
+    controller.set_counting_engine("tokenize")
+    assert controller.get_counting_engine() == "tokenize"
+    assert controller.get_file_metrics(new_file, old_file)[:3] == \
+        ("Ejemplo", 3, 1)
+
+    with pytest.raises(ValueError):
+        controller.set_counting_engine("unknown")
+
+
+def test_get_file_comparison_breaks_down_code_units(controller, tmp_path):
+    """
+    Tests that the classes and functions of two versions of a file
+    are compared one by one in the comparison of the file, and only
+    when the breakdown is enabled.
+    """
+    (tmp_path / "old").mkdir()
+    (tmp_path / "new").mkdir()
+    old_file = tmp_path / "old" / "ejemplo.py"
+    new_file = tmp_path / "new" / "ejemplo.py"
+    old_file.write_text(
+        "class Grows:\n    def a(self):\n        pass\n\n"
+        "def removed():\n    pass\n"
+    )
+    new_file.write_text(
+        "class Grows:\n    def a(self):\n        pass\n\n"
+        "    def b(self):\n        pass\n\n"
+        "class Added:\n    pass\n"
+    )
+
+    controller.set_read_only(True)
+    assert controller.get_file_comparison(new_file, old_file)[1] == ()
+
+    controller.set_code_unit_breakdown(True)
+    metrics, changes = controller.get_file_comparison(new_file, old_file)
+    results = controller.collect_file_path_results(
+        old_file.parent, new_file.parent
+    )
+
+    assert metrics == controller.get_file_metrics(new_file, old_file)
+    assert [(change.name, change.line_growth, change.new_methods)
+            for change in changes] == [
+        ("Grows", 2, 2), ("Added", 2, 0), ("removed", -2, 0)
+    ]
+    assert results.get_code_unit_changes(old_file) == changes
+
+
+def test_profiler_reports_every_stage(tmp_path):
+    """
+    Tests that a profiled comparison reports its stages, counters and
+    bytes in the default and read-only modes, also with workers.
+    """
+    from Utils.StageProfiler import StageProfiler
+
+    for read_only, workers in ((False, 1), (True, 1), (True, 2)):
+        root = tmp_path / f"{read_only}_{workers}"
+        old_dir, new_dir = create_project_versions(root, 3)
+        (new_dir / "module_0.py").write_text("x = 10\ny = 2\n")
+
+        controller = FileLineCounterController(Mock(), Mock())
+        controller.set_read_only(read_only, root / "output")
+        controller.set_max_workers(workers)
+        profiler = StageProfiler()
+        controller.set_profiler(profiler)
+
+        controller.collect_file_path_results(old_dir, new_dir)
+        report = profiler.get_report()
+
+        assert {"read", "validation", "analysis", "diff", "annotation",
+                "discovery"} <= set(report["stages"])
+        assert report["counters"]["files_compared"] == 3
+        assert report["bytes_read"] > 0
+        assert report["bytes_written"] > 0
+
+
+def test_collect_git_revision_results(tmp_path):
+    """
+    Tests that two revisions are compared from the object store with
+    the same metrics as two checked-out directories.
+    """
+    import subprocess
+
+    def git(*arguments):
+        subprocess.run(["git", "-C", str(repository), *arguments],
+                       check=True, capture_output=True)
+
+    repository = tmp_path / "repository"
+    repository.mkdir()
+    git("init", "-q")
+    git("config", "user.email", "test@example.com")
+    git("config", "user.name", "Test")
+
+    versions = {
+        "v1": {"ejemplo.py": "class Ejemplo:\n    def run(self):\n"
+                             "        return 1\n",
+               "borrado.py": "class Borrado:\n    pass\n"},
+        "v2": {"ejemplo.py": "class Ejemplo:\n    def run(self):\n"
+                             "        return 2\n",
+               "nuevo.py": "class Nuevo:\n    pass\n"},
+    }
+    for tag, files in versions.items():
+        git("rm", "-q", "-r", "--ignore-unmatch", ".")
+        for name, source in files.items():
+            (repository / name).write_text(source)
+            directory = tmp_path / tag
+            directory.mkdir(exist_ok=True)
+            (directory / name).write_text(source)
+        git("add", "-A")
+        git("commit", "-q", "-m", tag)
+        git("tag", tag)
+
+    controller = FileLineCounterController(Mock(), Mock())
+    controller.set_read_only(True, tmp_path / "output")
+    git_results = controller.collect_git_revision_results(
+        repository, "v1", "v2"
+    )
+    directory_results = controller.collect_file_path_results(
+        tmp_path / "v1", tmp_path / "v2"
+    )
+
+    assert git_results[Path("ejemplo.py")] == \
+        directory_results[tmp_path / "v1" / "ejemplo.py"]
+    assert git_results[Path("borrado.py")] == ("Deleted (Borrado)", 0, 0, 0, 0)
+    assert git_results[Path("nuevo.py")] == \
+        directory_results[tmp_path / "v2" / "nuevo.py"]
+    assert git_results["Total"] == directory_results["Total"]
+    assert "# Added Line" in \
+        (tmp_path / "output" / "v2" / "ejemplo.py").read_text()
+
+
+def test_moved_files_are_compared(controller, tmp_path):
+    """
+    Tests that a module moved to another package is compared with its
+    old version instead of being reported as deleted and added.
+    """
+    module_lines = [f"value_{index} = {index}\n" for index in range(20)]
+    old_dir = tmp_path / "old"
+    new_dir = tmp_path / "new"
+    (old_dir / "package").mkdir(parents=True)
+    (new_dir / "other").mkdir(parents=True)
+    (old_dir / "package" / "ejemplo.py").write_text("".join(module_lines))
+    (new_dir / "other" / "ejemplo.py").write_text(
+        "".join(module_lines + ["value_20 = 20\n"])
+    )
+
+    results = controller.collect_file_path_results(old_dir, new_dir)
+
+    assert [rename[:2] for rename in controller.get_detected_renames()] == [
+        (Path("package") / "ejemplo.py", Path("other") / "ejemplo.py")
+    ]
+    assert results[old_dir / "package" / "ejemplo.py"][1:] == (21, 0, 1, 0)
+
+    controller.set_rename_detector(None)
+    results = controller.collect_file_path_results(old_dir, new_dir)
+
+    assert controller.get_detected_renames() == []
+    assert results[old_dir / "package" / "ejemplo.py"][0].startswith("Deleted")
+
+
+def test_deleted_and_added_files_are_reported_in_order(controller, tmp_path):
+    """
+    Tests that deleted and added files are listed sorted by path, so
+    the results are the same on every run.
+    """
+    old_dir, new_dir = create_project_versions(tmp_path, 0)
+    names = ["zeta", "alpha", "mid", "beta", "omega"]
+    for index, name in enumerate(names):
+        (old_dir / f"old_{name}.py").write_text(
+            f"class Old{index}:\n    x = 1\n"
+        )
+        (new_dir / f"new_{name}.py").write_text(f"y = {index}\n")
+    controller.set_rename_detector(None)
+
+    results = controller.collect_file_path_results(old_dir, new_dir)
+
+    assert [path.name for path in results if path != "Total"] == \
+        [f"old_{name}.py" for name in sorted(names)] + \
+        [f"new_{name}.py" for name in sorted(names)]
+
+
+def test_excluded_directories_are_not_compared(controller, tmp_path):
+    """
+    Tests that virtual environments and `.gitignore`d paths are left
+    out of a directory comparison.
+    """
+    old_dir, new_dir = create_project_versions(tmp_path, 1)
+    (new_dir / ".venv" / "lib").mkdir(parents=True)
+    (new_dir / ".venv" / "lib" / "site.py").write_text("x = 1\n")
+    (new_dir / "generated.py").write_text("x = 1\n")
+    (new_dir / ".gitignore").write_text("generated.py\n")
+
+    results = controller.collect_file_path_results(old_dir, new_dir)
+
+    assert [path for path in results if path != "Total"] == [
+        old_dir / "module_0.py"
+    ]
+
+
+def test_compare_against_snapshot_manifest(tmp_path):
+    """
+    Tests that a snapshot manifest gives the same results as its
+    directory, without reading the old files that did not change.
+    """
+    from Utils.StageProfiler import StageProfiler
+
+    old_dir, new_dir = create_project_versions(tmp_path, 3)
+    (new_dir / "module_1.py").write_text("x = 10\ny = 1\n")
+    (new_dir / "module_3.py").write_text("z = 3\n")
+    (old_dir / "removed.py").write_text("class Removed:\n    pass\n")
+    controller = FileLineCounterController()
+    controller.set_read_only(True)
+    directory_results = controller.collect_file_path_results(
+        old_dir, new_dir
+    )
+    manifest_file = tmp_path / "old.json"
+    controller.create_snapshot(old_dir).write(manifest_file)
+    (old_dir / "module_0.py").unlink()
+    profiler = StageProfiler()
+    controller.set_profiler(profiler)
+
+    manifest_results = controller.collect_file_path_results(
+        manifest_file, new_dir
+    )
+
+    for index in range(3):
+        assert manifest_results[old_dir / f"module_{index}.py"] == \
+            directory_results[old_dir / f"module_{index}.py"]
+    assert manifest_results[new_dir / "module_3.py"] == \
+        directory_results[new_dir / "module_3.py"]
+    assert manifest_results[old_dir / "removed.py"] == \
+        ("Deleted (Removed)", 0, 0, 0, 0)
+    assert profiler.get_report()["counters"]["files_unchanged"] == 2
+    assert profiler.get_report()["counters"]["files_compared"] == 1
+
+
+@pytest.mark.parametrize("use_cache", [False, True])
+def test_snapshot_files_removed_after_the_snapshot(controller, tmp_path,
+                                                   use_cache):
+    """
+    Tests that a changed file whose old version was removed from the
+    snapshot root gets an error result instead of stopping the
+    comparison.
+    """
+    old_dir, new_dir = create_project_versions(tmp_path, 2)
+    (new_dir / "module_0.py").write_text("x = 10\n")
+    manifest_file = tmp_path / "old.json"
+    controller.create_snapshot(old_dir).write(manifest_file)
+    (old_dir / "module_0.py").unlink()
+    metrics_cache = MetricsCache(tmp_path / "cache.sqlite") \
+        if use_cache else None
+    controller.set_metrics_cache(metrics_cache)
+
+    results = controller.collect_file_path_results(manifest_file, new_dir)
+    if metrics_cache is not None:
+        metrics_cache.close()
+
+    assert results[old_dir / "module_0.py"] == \
+        ("error", "Old file missing from the snapshot", "None")
+    assert results[old_dir / "module_1.py"][3:] == (0, 0)
+
+
+def test_json_files_that_are_not_manifests(controller, tmp_path):
+    """
+    Tests that other JSON files are reported as not Python files and
+    broken manifests as an error result instead of raising.
+    """
+    _, new_dir = create_project_versions(tmp_path, 1)
+    results_file = tmp_path / "results.json"
+    results_file.write_text('{"results": []}')
+    broken_manifest = tmp_path / "snapshot.json"
+    broken_manifest.write_text('{"format": "proyecto-amarillo-snapshot"}')
+
+    results = controller.collect_file_path_results(results_file, new_dir)
+    assert results[results_file] == ("error", "Not a Python file", "None")
+
+    results = controller.collect_file_path_results(broken_manifest, new_dir)
+    assert results[broken_manifest] == \
+        ("error", "Not a valid snapshot manifest", "None")
+
+
+def test_unchanged_trees_are_skipped(tmp_path):
+    """
+    Tests that the files of directories that are equal in both
+    versions get the same metrics without being compared, and that
+    their metrics are reused from the metrics cache.
+    """
+    from Utils.StageProfiler import StageProfiler
+
+    old_dir, new_dir = create_project_versions(tmp_path, 2)
+    for directory in (old_dir, new_dir):
+        (directory / "package").mkdir()
+        (directory / "package" / "module.py").write_text(
+            "class Module:\n    def run(self):\n        return 1\n"
+        )
+    (new_dir / "module_1.py").write_text("x = 10\n")
+    metrics_cache = MetricsCache(tmp_path / "metrics.sqlite")
+    controller = FileLineCounterController()
+    controller.set_read_only(True)
+    expected_results = controller.collect_file_path_results(old_dir, new_dir)
+    controller.set_skip_unchanged_trees(True)
+    controller.set_metrics_cache(metrics_cache)
+
+    for run in range(2):
+        profiler = StageProfiler()
+        controller.set_profiler(profiler)
+        results = controller.collect_file_path_results(old_dir, new_dir)
+
+        assert dict(results) == dict(expected_results)
+        counters = profiler.get_report()["counters"]
+        assert counters["files_compared"] == 2
+        assert counters["files_unchanged"] == 1
+        assert counters["trees_unchanged"] == 1
+
+    assert counters["files_hashed"] == 0
+    assert counters["cache_hits"] == 3
+    metrics_cache.close()
+
+
+def test_read_only_tree_skipping_leaves_the_trees_unchanged(controller,
+                                                           tmp_path):
+    """
+    Tests that hashing the trees of a read-only comparison writes
+    nothing inside them, with or without a metrics cache.
+    """
+    old_dir, new_dir = create_project_versions(tmp_path, 2)
+    (old_dir / "package").mkdir()
+    (new_dir / "package").mkdir()
+    (old_dir / "package" / "core.py").write_text("x = 1\n")
+    (new_dir / "package" / "core.py").write_text("x = 1\n")
+    (new_dir / "module_1.py").write_text("x = 10\n")
+
+    def read_tree(directory):
+        return {
+            path.relative_to(directory): path.read_bytes()
+            for path in directory.rglob("*") if path.is_file()
+        }
+
+    trees_before = read_tree(old_dir), read_tree(new_dir)
+    controller.set_read_only(True)
+    controller.set_skip_unchanged_trees(True)
+
+    for metrics_cache in (None, MetricsCache(tmp_path / "metrics.sqlite")):
+        controller.set_metrics_cache(metrics_cache)
+        controller.collect_file_path_results(old_dir, new_dir)
+
+        assert (read_tree(old_dir), read_tree(new_dir)) == trees_before
+
+    metrics_cache.close()
+
+
+def test_deleted_file_reports_its_class(controller, tmp_path):
+    """
+    Tests that a file missing from the new directory is reported with
+    the class read from its old version.
+    """
+    old_dir, new_dir = create_project_versions(tmp_path, 1)
+    (old_dir / "removed.py").write_text("class Removed:\n    pass\n")
+    controller.set_read_only(True)
+    controller.set_rename_detector(None)
+
+    results = controller.collect_file_path_results(old_dir, new_dir)
+
+    assert results[old_dir / "removed.py"] == \
+        ("Deleted (Removed)", 0, 0, 0, 0)
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_diff_engine_selection(tmp_path, max_workers):
+    """
+    Tests that the diff engine is selectable through the controller,
+    also in worker processes, gives the same counts with both engines
+    and is part of the metrics cache key.
+    """
+    old_dir, new_dir = create_project_versions(tmp_path, 2)
+    (new_dir / "module_1.py").write_text("x = 10\ny = 1\n")
+    metrics_cache = MetricsCache(tmp_path / "metrics.sqlite")
+    controller = FileLineCounterController()
+    controller.set_read_only(True)
+    controller.set_max_workers(max_workers)
+    controller.set_metrics_cache(metrics_cache)
+
+    with pytest.raises(ValueError):
+        controller.set_diff_engine("patience")
+
+    results_by_engine = {}
+    for diff_engine in ("difflib", "myers"):
+        controller.set_diff_engine(diff_engine)
+        assert controller.get_diff_engine() == diff_engine
+        results_by_engine[diff_engine] = dict(
+            controller.collect_file_path_results(old_dir, new_dir)
+        )
+
+    assert results_by_engine["difflib"] == results_by_engine["myers"]
+    assert results_by_engine["myers"][old_dir / "module_1.py"][3:] == (2, 1)
+    assert len(metrics_cache) == 4
+    metrics_cache.close()
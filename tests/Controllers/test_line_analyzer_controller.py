@@ -64,4 +64,96 @@ def test_line_counting(file_content, expected_physical, expected_methods):
     analyzer = LineAnalyzerController(file_content)
 
     assert analyzer.count_physical_lines() == expected_physical
-    assert analyzer.count_methods() == expected_methods
\ No newline at end of file
+    assert analyzer.count_methods() == expected_methods
+
+@pytest.mark.parametrize("file_content", [
+    [],
+    ["# Esto es un comentario\n"],
+    ["\"\"\"\n", "    def dentro_de_docstring():\n", "\"\"\"\n"],
+    ["class Primera:\n",
+     "    def metodo(self):\n",
+     "        \"\"\"Docstring.\"\"\"\n",
+     "        pass\n",
+     "\n",
+     "class Segunda:\n",
+     "    def otro(self):\n",
+     "        return 1\n"],
+    ["x = 1\n", "\"\"\"\n", "docstring sin cerrar\n"],
+])
+def test_analyze_matches_individual_counters(file_content):
+    """
+    Tests that the single pass analysis returns the same metrics
+    as the individual counting methods.
+    """
+    analyzer = LineAnalyzerController()
+    result = analyzer.analyze(iter(file_content))
+
+    assert result.physical_lines == \
+        analyzer.count_physical_lines(file_content)
+    assert result.methods == analyzer.count_methods(file_content)
+    assert result.class_name == analyzer.extract_class(file_content)
+    assert analyzer.get_all_data(file_content) == (
+        result.class_name, result.physical_lines, result.methods
+    )
+
+
+def test_analyze_reports_all_classes_and_docstring_state():
+    """
+    Tests that the analysis keeps every class name and reports
+    an unterminated docstring.
+    """
+    analyzer = LineAnalyzerController()
+    result = analyzer.analyze([
+        "class Primera:\n",
+        "class Segunda:\n",
+        "\"\"\"\n",
+        "sin cerrar\n",
+    ])
+
+    assert result.class_names == ("Primera", "Segunda")
+    assert result.in_docstring is True
+
+
+BREAKDOWN_SOURCE = '''"""Module docstring."""
+import os
+
+
+@decorator(
+    1)
+class First:
+    """Docstring."""
+
+    def run(self):
+        def inner():
+            pass
+        return 1
+
+# comment
+VALUE = 1
+
+
+def helper():
+    return 1
+
+
+class Second(First): pass
+'''
+
+
+def test_analyze_reports_top_level_units():
+    """
+    Tests that the counts are split among the top-level classes and
+    functions, with decorators, in the same pass as the totals.
+    """
+    from Utils.CodeUnitBreakdown import CodeUnitMetrics
+
+    result = LineAnalyzerController().analyze(
+        iter(BREAKDOWN_SOURCE.splitlines(keepends=True))
+    )
+
+    assert (result.physical_lines, result.methods) == (12, 3)
+    assert result.units == (
+        CodeUnitMetrics("class", "First", 7, 2),
+        CodeUnitMetrics("function", "helper", 2, 0),
+        CodeUnitMetrics("class", "Second", 1, 0),
+    )
@@ -0,0 +1,65 @@
+import pytest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/../.."))
+
+from Controllers.MyersDiffController import MyersDiffController
+
+
+def apply_opcodes(old_lines, new_lines, opcodes):
+    """
+    Rebuilds the new lines from the old ones following the opcodes,
+    checking that equal ranges really match.
+    """
+    rebuilt_lines = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == "equal":
+            assert old_lines[i1:i2] == new_lines[j1:j2]
+            rebuilt_lines.extend(old_lines[i1:i2])
+        else:
+            rebuilt_lines.extend(new_lines[j1:j2])
+    return rebuilt_lines
+
+
+@pytest.mark.parametrize("old_lines,new_lines,expected_equal", [
+    ([], [], 0),
+    ([], ["a\n"], 0),
+    (["a\n"], [], 0),
+    (["a\n", "b\n", "c\n"], ["a\n", "b\n", "c\n"], 3),
+    (["a\n", "b\n", "c\n"], ["a\n", "x\n", "c\n"], 2),
+    (["a\n", "b\n", "c\n", "a\n", "b\n", "b\n", "a\n"],
+     ["c\n", "b\n", "a\n", "b\n", "a\n", "c\n"], 4),
+    (["\n", "pass\n", "\n", "pass\n"], ["pass\n", "\n", "pass\n", "\n"], 3),
+])
+def test_opcodes_describe_a_shortest_edit(old_lines, new_lines,
+                                          expected_equal):
+    """
+    Tests that the opcodes cover both inputs, rebuild the new lines
+    and keep the longest common subsequence as equal lines.
+    """
+    opcodes = MyersDiffController().get_opcodes(old_lines, new_lines)
+
+    assert apply_opcodes(old_lines, new_lines, opcodes) == new_lines
+    assert sum(i2 - i1 for tag, i1, i2, _, _ in opcodes
+               if tag == "equal") == expected_equal
+    if opcodes:
+        assert opcodes[-1][2] == len(old_lines)
+        assert opcodes[-1][4] == len(new_lines)
+
+
+def test_repeated_lines_are_diffed_quickly():
+    """
+    Tests that a large file made of repeated lines with a few changes
+    is diffed into the expected number of replacements.
+    """
+    old_lines = ["    pass\n", "\n", "}\n"] * 5000
+    new_lines = list(old_lines)
+    for index in range(0, len(new_lines), 1000):
+        new_lines[index] = f"changed_{index}\n"
+
+    opcodes = MyersDiffController().get_opcodes(old_lines, new_lines)
+
+    assert apply_opcodes(old_lines, new_lines, opcodes) == new_lines
+    assert sum(j2 - j1 for tag, _, _, j1, j2 in opcodes
+               if tag != "equal") == 15
@@ -1,10 +1,14 @@
+import mmap
 import pytest
 import sys
 import os
 
 sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/../.."))
 
-from Controllers.PythonStandardValidatorController import PythonStandardValidatorController
+from Controllers.PythonStandardValidatorController import (
+    PythonStandardValidatorController)
+from Utils.PythonStandardRules import LineLengthRule
+from Utils.StandardRule import RuleViolation, StandardRule
 
 
 @pytest.mark.parametrize("file, expected", [
@@ -36,4 +40,197 @@ def test_validate_compliance_with_standard(file, expected):
     method correctly identifies whether the given lines of code adhere to the defined rules.
     """
     validator = PythonStandardValidatorController(file)
-    assert validator.validate_compliance_with_standard() == expected
\ No newline at end of file
+    assert validator.validate_compliance_with_standard() == expected
+
+
+LONG_LINE = "x = " + "1" * 80 + "\n"
+INDENTED_LINE = " " * 20 + "y = " + "2" * 70 + "\n"
+ACCENTED_LINE = "s = '" + "ñ" * 70 + "'\n"
+
+
+def test_get_line_length_violations():
+    """
+    Tests that every long line is reported with its number and its
+    length without surrounding whitespace.
+    """
+    file = ['x = 1\n', LONG_LINE, INDENTED_LINE, 'y = 2\n', LONG_LINE]
+    validator = PythonStandardValidatorController(file)
+
+    assert validator.get_line_length_violations() == [
+        LineLengthRule.build_violation(2, 84),
+        LineLengthRule.build_violation(5, 84),
+    ]
+
+
+@pytest.mark.parametrize("lines", [
+    ['x = 1\n', LONG_LINE, INDENTED_LINE, 'y = 2\n', LONG_LINE],
+    [INDENTED_LINE, ACCENTED_LINE, 'z = 3\n'],
+    ['\n', '\n', LONG_LINE.rstrip("\n")],
+    [],
+])
+def test_buffer_matches_lines(lines, tmp_path):
+    """
+    Tests that validating the raw bytes, in memory or memory-mapped,
+    reports the same violations as validating the decoded lines.
+    """
+    content = "".join(lines).encode("utf-8")
+    expected = PythonStandardValidatorController(
+        lines).get_line_length_violations()
+
+    assert PythonStandardValidatorController(
+        content).get_line_length_violations() == expected
+    assert PythonStandardValidatorController(
+        content).validate_compliance_with_standard() == (not expected)
+
+    if content:
+        file_path = tmp_path / "file.py"
+        file_path.write_bytes(content)
+        with open(file_path, "rb") as file, \
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            assert PythonStandardValidatorController(
+                view).get_line_length_violations() == expected
+
+
+def test_mmap_line_numbers_span_count_chunks(tmp_path, monkeypatch):
+    """
+    Tests that the line numbers of a memory-mapped file are right when
+    the newlines before a long line are counted in several chunks.
+    """
+    monkeypatch.setattr(
+        "Controllers.PythonStandardValidatorController."
+        "NEWLINE_COUNT_CHUNK_BYTES", 7
+    )
+    lines = ['x = 1\n'] * 10 + [LONG_LINE] + ['y = 2\n'] * 5 + [LONG_LINE]
+    file_path = tmp_path / "file.py"
+    file_path.write_text("".join(lines))
+
+    with open(file_path, "rb") as file, \
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+        assert PythonStandardValidatorController(
+            view).get_line_length_violations() == [
+            LineLengthRule.build_violation(11, 84),
+            LineLengthRule.build_violation(17, 84),
+        ]
+
+
+def test_validation_stops_at_first_violation():
+    """
+    Tests that the validation does not read lines after the first
+    line that is too long.
+    """
+    read_lines = []
+
+    def lines():
+        for line in ['x = 1\n', LONG_LINE, 'y = 2\n']:
+            read_lines.append(line)
+            yield line
+
+    validator = PythonStandardValidatorController(lines())
+
+    assert validator.validate_compliance_with_standard() is False
+    assert read_lines == ['x = 1\n', LONG_LINE]
+
+
+MULTI_RULE_LINES = [
+    'def f():\n',
+    '\treturn 1 \n',
+    LONG_LINE,
+    ' ' * 28 + 'x = 1\n',
+]
+
+
+def test_default_rules_only_check_line_length():
+    """
+    Tests that other rules are only checked when selected.
+    """
+    validator = PythonStandardValidatorController(MULTI_RULE_LINES)
+
+    assert validator.get_violations() == [
+        RuleViolation("line-length", 3, "Line too long (84 > 79 characters)")
+    ]
+
+
+def test_selected_rules_are_checked_in_one_pass():
+    """
+    Tests that every selected rule sees each line once, whether the
+    file is given as lines or as raw bytes.
+    """
+    rules = ["line-length", "trailing-whitespace", "tab-indentation",
+             "nesting-depth"]
+    read_lines = []
+
+    def lines():
+        for line in MULTI_RULE_LINES:
+            read_lines.append(line)
+            yield line
+
+    validator = PythonStandardValidatorController(lines(), rules)
+    violations = validator.get_violations()
+
+    assert read_lines == MULTI_RULE_LINES
+    assert [(violation.rule, violation.line_number)
+            for violation in violations] == [
+        ("trailing-whitespace", 2),
+        ("tab-indentation", 2),
+        ("line-length", 3),
+        ("nesting-depth", 4),
+    ]
+
+    content = "".join(MULTI_RULE_LINES).encode("utf-8")
+    assert PythonStandardValidatorController(
+        content, rules).get_violations() == violations
+    assert PythonStandardValidatorController(
+        content, rules).validate_compliance_with_standard() is False
+
+
+def test_unknown_rule():
+    """
+    Tests that selecting an unknown rule raises a ValueError.
+    """
+    with pytest.raises(ValueError):
+        PythonStandardValidatorController([], ["unknown-rule"])
+
+
+def test_register_rule():
+    """
+    Tests that a registered rule can be selected by name.
+    """
+    class NoPrintRule(StandardRule):
+        name = "no-print"
+
+        def visit_line(self, line_number, line):
+            if line.lstrip().startswith("print("):
+                return (RuleViolation(self.name, line_number, "print"),)
+            return ()
+
+    class CustomValidator(PythonStandardValidatorController):
+        pass
+
+    CustomValidator.register_rule(NoPrintRule)
+    validator = CustomValidator(['x = 1\n', 'print(x)\n'], ["no-print"])
+
+    assert validator.get_violations() == [RuleViolation("no-print", 2, "print")]
+    assert "no-print" not in PythonStandardValidatorController.STANDARD_RULES
+
+
+def test_buffer_checks_every_rule_in_one_pass(tmp_path):
+    """
+    Tests that a memory-mapped file checked against several rules
+    reports the same violations as its decoded lines.
+    """
+    lines = ["x = 1  \r\n", "\tif x:\r\n", LONG_LINE, "y = 2"]
+    rules = ("line-length", "trailing-whitespace", "tab-indentation")
+    file_path = tmp_path / "file.py"
+    file_path.write_bytes("".join(lines).encode("utf-8"))
+    expected = PythonStandardValidatorController(
+        [line.replace("\r\n", "\n") for line in lines], rules
+    ).get_violations()
+
+    with open(file_path, "rb") as file, \
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+        assert PythonStandardValidatorController(
+            view, rules).get_violations() == expected
+
+    assert [violation.rule for violation in expected] == [
+        "trailing-whitespace", "tab-indentation", "line-length"
+    ]
@@ -0,0 +1,118 @@
+import pytest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/../.."))
+
+from Controllers.TokenLineAnalyzerController import TokenLineAnalyzerController
+from Controllers.LineAnalyzerController import LineAnalyzerController
+
+
+SOURCE = '''"""Module docstring."""
+import os
+
+
+class First:
+    \'\'\'Docstring with """ inside.\'\'\'
+
+    text = """not
+a docstring"""
+
+    async def load(self):
+        # comment
+        return (1,
+                2)
+
+    def stop(self):
+        def inner():
+            pass
+        pass
+
+
+def helper():
+    """Docstring
+    on two lines"""
+    return 1
+
+
+class Second(First): pass
+'''
+
+
+@pytest.fixture
+def analyzer():
+    """Fixture that provides an instance of TokenLineAnalyzerController."""
+    return TokenLineAnalyzerController()
+
+
+def test_analyze(analyzer):
+    """
+    Tests the counts on code the heuristic engine miscounts: other
+    quotes, strings with triple quotes, async methods, nested
+    functions and several classes.
+    """
+    result = analyzer.analyze(SOURCE.splitlines(keepends=True))
+
+    assert result.physical_lines == 14
+    assert result.methods == 4
+    assert result.class_names == ("First", "Second")
+    assert result.methods_by_class == (("First", 2), ("Second", 0))
+    assert analyzer.get_all_data(iter(SOURCE.splitlines(keepends=True))) == \
+        ("First", 14, 4)
+
+
+@pytest.mark.parametrize("lines", [
+    ["x = 1\n", "\n", "# comment\n", "y = 2\n"],
+    ["def f():\n", '    """Doc."""\n', "    return 1\n"],
+    ["class A:\n", "    def m(self):\n", "        pass\n"],
+    [],
+])
+def test_matches_heuristic_on_simple_code(analyzer, lines):
+    """
+    Tests that both engines agree on code without the cases the
+    heuristic gets wrong.
+    """
+    assert analyzer.get_all_data(lines) == \
+        LineAnalyzerController().get_all_data(lines)
+
+
+def test_untokenizable_lines_use_heuristic(analyzer):
+    """
+    Tests that the lines after a tokenizer error are still counted.
+    """
+    lines = ["def f():\n", "    x = 1\n", "  y = 2\n", "def g():\n"]
+
+    result = analyzer.analyze(lines)
+
+    assert result.physical_lines == 4
+    assert result.methods == 2
+
+
+def test_units_match_heuristic_breakdown(analyzer):
+    """
+    Tests that both engines split simple code among the same units.
+    """
+    lines = [
+        "import os\n", "\n", "@decorator(\n", "    1)\n", "class First:\n",
+        '    """Docstring."""\n', "    def run(self):\n",
+        "        return 1\n", "# comment\n", "VALUE = 1\n",
+        "def helper():\n", "    return 1\n",
+    ]
+
+    assert analyzer.analyze(lines).units == \
+        LineAnalyzerController().analyze(lines).units
+
+
+def test_units_count_async_methods(analyzer):
+    """
+    Tests that the breakdown of the tokenize engine counts the async
+    methods of every class.
+    """
+    result = analyzer.analyze(SOURCE.splitlines(keepends=True))
+
+    assert [(unit.kind, unit.name, unit.physical_lines, unit.methods)
+            for unit in result.units] == [
+        ("class", "First", 10, 3),
+        ("function", "helper", 2, 0),
+        ("class", "Second", 1, 0),
+    ]
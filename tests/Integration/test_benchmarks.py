@@ -0,0 +1,71 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/../.."))
+sys.path.append(
+    os.path.abspath(os.path.dirname(__file__) + "/../../benchmarks")
+)
+
+from project_generator import generate_project_tree
+from run_benchmarks import compare_results, run_benchmarks
+
+
+def read_tree(root):
+    """Returns the relative path and content of every file of a tree."""
+    return {
+        file_path.relative_to(root): file_path.read_text()
+        for file_path in root.rglob("*.py")
+    }
+
+
+def test_generate_project_tree_is_deterministic(tmp_path):
+    """
+    Tests that the same parameters produce the same trees and that the
+    change ratio decides how many files differ.
+    """
+    first_old, first_new = generate_project_tree(
+        tmp_path / "first", 20, 60, 0.5, seed=7
+    )
+    second_old, second_new = generate_project_tree(
+        tmp_path / "second", 20, 60, 0.5, seed=7
+    )
+
+    assert read_tree(first_old) == read_tree(second_old)
+    assert read_tree(first_new) == read_tree(second_new)
+
+    old_files, new_files = read_tree(first_old), read_tree(first_new)
+    changed = [path for path in new_files if new_files[path] != old_files[path]]
+    assert len(new_files) == 20
+    assert 0 < len(changed) < 20
+
+    _, unchanged_new = generate_project_tree(tmp_path / "same", 5, 60, 0.0)
+    _, changed_new = generate_project_tree(tmp_path / "all", 5, 60, 1.0)
+    assert read_tree(unchanged_new) == read_tree(tmp_path / "same" / "old")
+    assert all(
+        content != read_tree(tmp_path / "all" / "old")[path]
+        for path, content in read_tree(changed_new).items()
+    )
+
+
+def test_run_benchmarks_reports_every_stage():
+    """
+    Tests that the results have the throughput and memory fields of
+    each selected stage and can be compared with previous results.
+    """
+    results = run_benchmarks(
+        file_count=3, lines_per_file=40, repeat=1,
+        stages=["analyze_heuristic", "process_file_path_read_only"]
+    )
+
+    assert results["parameters"]["files"] == 3
+    assert set(results["stages"]) == {
+        "analyze_heuristic", "process_file_path_read_only"
+    }
+    for stage in results["stages"].values():
+        assert stage["seconds"] > 0
+        assert stage["files_per_second"] > 0
+        assert stage["mb_per_second"] > 0
+        assert "peak_rss_kb" in stage
+
+    comparison = compare_results({"stages": {}}, results)
+    assert all("new stage" in line for line in comparison)
@@ -0,0 +1,152 @@
+import json
+import pytest
+
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/../.."))
+
+import cli
+
+
+def test_cli_compares_directories_without_gui(tmp_path):
+    """
+    Tests that the command line entry point compares two directories
+    in read-only mode, writes JSON results and never loads the
+    graphical toolkit.
+    """
+    old_dir = tmp_path / "old"
+    new_dir = tmp_path / "new"
+    old_dir.mkdir()
+    new_dir.mkdir()
+    (old_dir / "ejemplo.py").write_text(
+        "class Ejemplo:\n    def run(self):\n        return 1\n"
+    )
+    (new_dir / "ejemplo.py").write_text(
+        "class Ejemplo:\n    def run(self):\n        return 2\n"
+    )
+    output_file = tmp_path / "results.json"
+
+    exit_code = cli.main([
+        str(old_dir), str(new_dir), "--read-only",
+        "--output", str(output_file)
+    ])
+
+    records = json.loads(output_file.read_text())["results"]
+    assert exit_code == 0
+    assert records[0]["class_name"] == "Ejemplo"
+    assert (records[0]["added_lines"], records[0]["removed_lines"]) == (1, 1)
+    assert records[-1]["file"] == "Total"
+    assert "customtkinter" not in sys.modules
+
+
+def test_cli_writes_profile_report(tmp_path):
+    """
+    Tests that --profile writes the stage report and --cprofile the
+    cProfile statistics of the comparison.
+    """
+    import pstats
+
+    old_file = tmp_path / "old" / "ejemplo.py"
+    new_file = tmp_path / "new" / "ejemplo.py"
+    for path, value in ((old_file, 1), (new_file, 2)):
+        path.parent.mkdir()
+        path.write_text(f"x = {value}\n")
+    report_file = tmp_path / "profile.json"
+    stats_file = tmp_path / "profile.pstats"
+
+    exit_code = cli.main([
+        str(old_file.parent), str(new_file.parent), "--read-only",
+        "--output", str(tmp_path / "results.json"),
+        "--profile", str(report_file), "--cprofile", str(stats_file)
+    ])
+
+    report = json.loads(report_file.read_text())
+    assert exit_code == 0
+    assert report["counters"]["files_compared"] == 1
+    assert "diff" in report["stages"]
+    assert pstats.Stats(str(stats_file)).total_calls > 0
+
+
+def test_cli_reports_code_unit_changes(tmp_path):
+    """
+    Tests that --units adds the changes of every top-level class and
+    function to the JSON records of the compared files.
+    """
+    old_dir = tmp_path / "old"
+    new_dir = tmp_path / "new"
+    old_dir.mkdir()
+    new_dir.mkdir()
+    (old_dir / "ejemplo.py").write_text(
+        "class Ejemplo:\n    def run(self):\n        return 1\n"
+    )
+    (new_dir / "ejemplo.py").write_text(
+        "class Ejemplo:\n    def run(self):\n        return 1\n\n"
+        "def helper():\n    return 2\n"
+    )
+    output_file = tmp_path / "results.json"
+
+    exit_code = cli.main([
+        str(old_dir), str(new_dir), "--read-only", "--units",
+        "--output", str(output_file)
+    ])
+
+    records = json.loads(output_file.read_text())["results"]
+    assert exit_code == 0
+    assert [(unit["name"], unit["line_growth"])
+            for unit in records[0]["units"]] == [
+        ("Ejemplo", 0), ("helper", 2)
+    ]
+    assert "units" not in records[-1]
+
+
+def test_cli_compares_against_a_snapshot(tmp_path):
+    """
+    Tests that the snapshot command writes a manifest that replaces
+    the previous version directory in a comparison.
+    """
+    old_dir = tmp_path / "old"
+    new_dir = tmp_path / "new"
+    for directory, value in ((old_dir, 1), (new_dir, 2)):
+        directory.mkdir()
+        (directory / "ejemplo.py").write_text(
+            f"class Ejemplo:\n    def run(self):\n        return {value}\n"
+        )
+    manifest_file = tmp_path / "old.json"
+    output_file = tmp_path / "results.json"
+
+    assert cli.main(["snapshot", str(old_dir), str(manifest_file)]) == 0
+    exit_code = cli.main([
+        str(manifest_file), str(new_dir), "--output", str(output_file)
+    ])
+
+    records = json.loads(output_file.read_text())["results"]
+    assert exit_code == 0
+    assert records[0]["class_name"] == "Ejemplo"
+    assert (records[0]["added_lines"], records[0]["removed_lines"]) == (1, 1)
+    assert "return 1" in (old_dir / "ejemplo.py").read_text()
+
+
+@pytest.mark.parametrize("option", ["--workers", "--walk-threads"])
+def test_cli_rejects_counts_below_one(tmp_path, capsys, option):
+    """
+    Tests that worker and thread counts below one are usage errors.
+    """
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main([str(tmp_path), str(tmp_path), option, "0"])
+
+    assert exit_info.value.code == 2
+    assert "must be at least 1" in capsys.readouterr().err
+
+
+def test_cli_rejects_bad_git_revisions(tmp_path, capsys):
+    """
+    Tests that a path that is not a repository is a usage error
+    instead of a traceback.
+    """
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main(["--git", str(tmp_path), "HEAD~1", "HEAD",
+                  "--output", str(tmp_path / "results.json")])
+
+    assert exit_info.value.code == 2
+    assert "error:" in capsys.readouterr().err
@@ -0,0 +1,70 @@
+import pytest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/../.."))
+
+from pathlib import Path
+from Models.ComparisonResultStore import ComparisonResultStore
+from Models.ComparisonResultStore import FileStatus
+
+
+@pytest.fixture
+def results():
+    """
+    Creates results with every kind of entry the controller produces.
+    """
+    return {
+        Path("old/a.py"): ("Alfa", 10, 2, 3, 1),
+        Path("new/b.py"): ("New file (Beta)", 5, 1, 0, 5),
+        Path("old/c.py"): ("Deleted (Gamma)", 0, 0, 0, 0),
+        Path("old/d.py"): ("Doesn't comply with Standard", 0, 0, 0, 0),
+        Path("new/e.py"): ("New file doesn't comply with Standard",
+                           0, 0, 0, 0),
+        Path("old/f.txt"): ("error", "Not a Python file", "None"),
+        "otro": ("raro", "1", 2),
+    }
+
+
+def test_round_trip_keeps_metrics_and_order(results):
+    """
+    Tests that the store returns the same entries, in the same order
+    and with the same key types, as the results it was built from.
+    """
+    store = ComparisonResultStore(results)
+
+    assert list(store.items()) == list(results.items())
+    assert store == results
+
+
+def test_statuses(results):
+    """
+    Tests that free-text outcomes are stored as FileStatus values.
+    """
+    store = ComparisonResultStore(results)
+
+    assert store.get_status(Path("old/a.py")) == FileStatus.MODIFIED
+    assert store.get_status(Path("new/b.py")) == FileStatus.NEW
+    assert store.get_status(Path("old/c.py")) == FileStatus.DELETED
+    assert store.get_status(Path("old/d.py")) == FileStatus.NON_COMPLIANT
+    assert store.get_status(Path("old/f.txt")) == FileStatus.NOT_PYTHON
+    assert store.count_by_status()[FileStatus.OTHER] == 1
+
+
+def test_total_is_computed_and_listed_last(results):
+    """
+    Tests that 'Total' is computed from the stored counts and that
+    removed files no longer count.
+    """
+    store = ComparisonResultStore(results)
+    store["Total"] = None
+
+    assert list(store)[-1] == "Total"
+    assert store["Total"] == ("", 15, "", 3, 6)
+
+    del store[Path("new/b.py")]
+    store[Path("old/a.py")] = ("Alfa", 12, 2, 4, 1)
+
+    assert store["Total"] == ("", 12, "", 4, 1)
+    assert Path("new/b.py") not in store
+    assert len(store) == len(results)
@@ -75,4 +75,72 @@ def test_inform_changes_to_controller(model, mock_controller):
       the `manage_model_changes` method in the controller.
     """
     model.inform_changes_to_controller()
-    mock_controller.manage_model_changes.assert_called_once()
\ No newline at end of file
+    mock_controller.manage_model_changes.assert_called_once()
+
+def test_add_line_count_result(model, mock_controller):
+    """
+    Tests that partial results are stored without notifying the
+    controller.
+    """
+    model.add_line_count_result("a.py", ("A", 1, 0, 0, 0))
+    model.add_line_count_result("b.py", ("B", 2, 0, 0, 0))
+
+    assert model.get_line_count_results() == {
+        "a.py": ("A", 1, 0, 0, 0),
+        "b.py": ("B", 2, 0, 0, 0),
+    }
+    mock_controller.manage_model_changes.assert_not_called()
+
+
+def get_sent_deltas(mock_controller):
+    """
+    Returns the deltas the model sent to the controller.
+    """
+    return [
+        call.args[0]
+        for call in mock_controller.manage_model_deltas.call_args_list
+    ]
+
+
+def test_changes_outside_a_batch_are_sent_one_by_one(model, mock_controller):
+    """
+    Tests that every change made outside a batch is sent as a delta.
+    """
+    model.add_line_count_result("a.py", ("A", 1, 0, 0, 0))
+    model.update_line_count_result("a.py", ("A", 2, 0, 0, 0))
+    model.remove_line_count_result("a.py")
+
+    deltas = get_sent_deltas(mock_controller)
+    assert deltas[0].added == {"a.py": ("A", 1, 0, 0, 0)}
+    assert deltas[1].updated == {"a.py": ("A", 2, 0, 0, 0)}
+    assert deltas[2].removed == ["a.py"]
+    assert model.get_line_count_results() == {}
+
+
+def test_batch_coalesces_changes(model, mock_controller):
+    """
+    Tests that a batch sends a single delta with the coalesced changes.
+    """
+    model.set_line_count_results({"old.py": ("Old", 1, 0, 0, 0)})
+    listener_deltas = []
+    model.add_delta_listener(listener_deltas.append)
+
+    with model.batch_updates():
+        model.add_line_count_result("a.py", ("A", 1, 0, 0, 0))
+        model.update_line_count_result("a.py", ("A", 3, 0, 0, 0))
+        model.add_line_count_result("temp.py", ("T", 1, 0, 0, 0))
+        model.remove_line_count_result("temp.py")
+        model.remove_line_count_result("old.py")
+        with model.batch_updates():
+            model.add_line_count_result("b.py", ("B", 2, 0, 0, 0))
+        mock_controller.manage_model_deltas.assert_not_called()
+
+    deltas = get_sent_deltas(mock_controller)
+    assert len(deltas) == 1
+    assert deltas[0].added == {
+        "a.py": ("A", 3, 0, 0, 0),
+        "b.py": ("B", 2, 0, 0, 0),
+    }
+    assert deltas[0].updated == {}
+    assert deltas[0].removed == ["old.py"]
+    assert listener_deltas == deltas
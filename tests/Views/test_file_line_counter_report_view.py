@@ -0,0 +1,69 @@
+import pytest
+import io
+import json
+
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/../.."))
+
+from Views.FileLineCounterReportView import FileLineCounterReportView
+
+
+@pytest.fixture
+def metric_results():
+    """
+    Creates results like the ones produced by the controller.
+    """
+    return {
+        "old/ejemplo.py": ("Ejemplo", 10, 2, 1, 1),
+        "old/notas.txt": ("error", "Not a Python file", "None"),
+        "Total": ("", 10, "", 1, 1),
+    }
+
+
+def test_json_report(metric_results):
+    """
+    Tests that the JSON report has one record per entry.
+    """
+    output_stream = io.StringIO()
+    view = FileLineCounterReportView("json", output_stream)
+
+    view.show_metric_results(metric_results)
+    records = json.loads(output_stream.getvalue())["results"]
+
+    assert [record["file"] for record in records] == \
+        ["old/ejemplo.py", "old/notas.txt", "Total"]
+    assert records[0] == {
+        "file": "old/ejemplo.py",
+        "class_name": "Ejemplo",
+        "physical_lines": 10,
+        "methods": 2,
+        "added_lines": 1,
+        "removed_lines": 1,
+        "major_changes": False,
+    }
+    assert records[1]["major_changes"] is None
+
+
+def test_csv_report(metric_results):
+    """
+    Tests that the CSV report has a header and one row per entry.
+    """
+    output_stream = io.StringIO()
+    view = FileLineCounterReportView("csv", output_stream)
+
+    view.show_metric_results(metric_results)
+    lines = output_stream.getvalue().splitlines()
+
+    assert lines[0] == ",".join(FileLineCounterReportView.FIELDS)
+    assert lines[1] == "old/ejemplo.py,Ejemplo,10,2,1,1,False"
+    assert len(lines) == 4
+
+
+def test_unsupported_format():
+    """
+    Tests that an unknown output format is rejected.
+    """
+    with pytest.raises(ValueError):
+        FileLineCounterReportView("xml")
@@ -10,6 +10,7 @@ sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/../.."))
 from Views.FileLineCounterView import FileLineCounterView
 from Controllers.FileLineCounterController import FileLineCounterController
 from Models.FileLineCounterModel import FileLineCounterModel
+import threading
 import time
 
 
@@ -70,3 +71,31 @@ def test_rendering_of_components(start_tkinter_app):
     assert hasattr(view, "header"), "Header was not rendered!"
     assert hasattr(view, "file_entry"), "File entry was not rendered"
     assert hasattr(view, "file_button"), "File button was not rendered"
+
+
+def test_closing_the_window_cancels_the_comparison(mock_controller):
+    """
+    Tests that closing the window during a comparison cancels it, so
+    the comparison thread ends instead of keeping the process alive.
+    """
+    started = threading.Event()
+    cancelled = threading.Event()
+
+    def collect_file_path_results(old_path, new_path, on_result=None,
+                                  on_progress=None, cancel_event=None):
+        started.set()
+        if cancel_event.wait(5):
+            cancelled.set()
+        return {"Total": ("", 0, "", 0, 0)}
+
+    mock_controller.collect_file_path_results.side_effect = \
+        collect_file_path_results
+    view = FileLineCounterView(mock_controller)
+    view.old_path_entry.insert(0, "old")
+    view.new_path_entry.insert(0, "new")
+
+    view.process_file_path_from_user()
+    assert started.wait(5)
+    view.tk.eval(view.protocol("WM_DELETE_WINDOW"))
+
+    assert cancelled.wait(5)
@@ -0,0 +1,67 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+from Utils.CodeUnitBreakdown import (
+    CodeUnitChange,
+    CodeUnitMetrics,
+    CodeUnitTracker,
+    compare_code_units,
+)
+
+
+def test_tracker_splits_lines_among_units():
+    """
+    Tests that decorator lines go to the unit that follows them and
+    that module-level code closes the open unit.
+    """
+    tracker = CodeUnitTracker()
+
+    tracker.start_top_level_statement()
+    tracker.add_lines(1)
+    tracker.start_top_level_statement(CodeUnitTracker.DECORATOR)
+    tracker.add_lines(2)
+    tracker.start_top_level_statement(CodeUnitTracker.CLASS, "Ejemplo")
+    tracker.add_lines(3)
+    tracker.add_method()
+    tracker.start_top_level_statement()
+    tracker.add_lines(1)
+    tracker.add_method()
+    tracker.start_top_level_statement(CodeUnitTracker.FUNCTION, "helper")
+    tracker.add_lines(2)
+
+    assert tracker.get_units() == (
+        CodeUnitMetrics("class", "Ejemplo", 5, 1),
+        CodeUnitMetrics("function", "helper", 2, 0),
+    )
+
+
+def test_compare_code_units():
+    """
+    Tests that units are matched by kind and name, in order for
+    repeated names, and that added and removed units are reported.
+    """
+    old_units = (
+        CodeUnitMetrics("class", "A", 10, 2),
+        CodeUnitMetrics("function", "f", 3, 0),
+        CodeUnitMetrics("function", "f", 4, 0),
+        CodeUnitMetrics("class", "Gone", 5, 1),
+    )
+    new_units = (
+        CodeUnitMetrics("class", "A", 15, 3),
+        CodeUnitMetrics("function", "f", 3, 0),
+        CodeUnitMetrics("function", "f", 6, 1),
+        CodeUnitMetrics("class", "B", 7, 1),
+    )
+
+    changes = compare_code_units(old_units, new_units)
+
+    assert changes == (
+        CodeUnitChange("class", "A", 10, 15, 2, 3),
+        CodeUnitChange("function", "f", 3, 3, 0, 0),
+        CodeUnitChange("function", "f", 4, 6, 0, 1),
+        CodeUnitChange("class", "B", 0, 7, 0, 1),
+        CodeUnitChange("class", "Gone", 5, 0, 1, 0),
+    )
+    assert [change.line_growth for change in changes] == [5, 0, 2, 7, -5]
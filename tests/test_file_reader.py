@@ -5,6 +5,7 @@ import sys
 import os
 
 sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/../Utils"))
 
 from FileReader import FileReader
 
@@ -84,3 +85,121 @@ def test_read_python_file_empty(empty_test_file):
     assert content == [], (
         "El contenido del archivo vacío debe ser una lista vacía."
     )
+
+
+@pytest.mark.parametrize("use_mmap", [None, False, True])
+def test_iter_lines_matches_read_file(python_test_file, use_mmap):
+    """
+    Tests that streaming the file, with or without a memory map,
+    yields the same lines as reading it whole.
+    """
+    file_reader = FileReader(str(python_test_file), use_mmap=use_mmap)
+
+    assert list(file_reader.iter_lines()) == file_reader.read_file()
+
+
+def test_iter_lines_mmap_normalizes_line_endings(tmp_path):
+    """
+    Tests that the memory-mapped mode converts Windows line endings
+    and keeps a last line without a newline.
+    """
+    file_path = tmp_path / "windows.py"
+    file_path.write_bytes("x = 1\r\nprint('ñ')\r\nfin".encode("utf-8"))
+
+    file_reader = FileReader(str(file_path), use_mmap=True)
+
+    assert list(file_reader.iter_lines()) == [
+        "x = 1\n", "print('ñ')\n", "fin"
+    ]
+
+
+@pytest.mark.parametrize("content", [
+    b"x = 1\ry = 2\rfin",
+    b"x = 1\r\ny = 2\r\n",
+    b"x = 1\r\ry = 2\n\r\nfin\r",
+])
+def test_iter_lines_modes_split_lines_the_same_way(tmp_path, content):
+    """
+    Tests that the text and memory-mapped modes end lines at '\\r'
+    and '\\r\\n' the same way as reading the file whole.
+    """
+    file_path = tmp_path / "endings.py"
+    file_path.write_bytes(content)
+
+    expected = FileReader(str(file_path)).read_file()
+
+    for use_mmap in (False, True):
+        assert list(
+            FileReader(str(file_path), use_mmap=use_mmap).iter_lines()
+        ) == expected
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_iter_lines_invalid_utf8_yields_nothing(tmp_path, use_mmap, caplog):
+    """
+    Tests that a file with invalid UTF-8 after some valid lines is
+    logged and yields no line, as `read_file` returns none.
+    """
+    file_path = tmp_path / "invalid.py"
+    file_path.write_bytes(b"x = 1\n" * 1000 + b"y = '\xff'\n")
+
+    with caplog.at_level(logging.ERROR):
+        lines = list(FileReader(str(file_path), use_mmap).iter_lines())
+
+    assert lines == FileReader(str(file_path)).read_file() == []
+    assert "invalid.py" in caplog.text
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_iter_lines_empty_and_missing_files(empty_test_file, use_mmap, caplog):
+    """
+    Tests that streaming an empty file yields nothing and that a
+    missing file is logged instead of raising.
+    """
+    assert list(FileReader(str(empty_test_file), use_mmap).iter_lines()) == []
+
+    with caplog.at_level(logging.ERROR):
+        assert list(FileReader("no_existe.py", use_mmap).iter_lines()) == []
+        assert "El archivo no_existe.py no existe." in caplog.text
+
+
+def test_read_bytes(tmp_path, caplog):
+    """
+    Tests that the raw content is returned unchanged and that a
+    missing file is logged and read as empty bytes.
+    """
+    file_path = tmp_path / "raw.py"
+    file_path.write_bytes("x = 'ñ'\r\n".encode("utf-8"))
+
+    assert FileReader(str(file_path)).read_bytes() == \
+        "x = 'ñ'\r\n".encode("utf-8")
+
+    with caplog.at_level(logging.ERROR):
+        assert FileReader("no_existe.py").read_bytes() == b""
+        assert "El archivo no_existe.py no existe." in caplog.text
+
+
+def test_open_buffer(tmp_path, caplog):
+    """
+    Tests that the raw content is mapped without being read, that an
+    empty file gives empty bytes and that a missing file is logged.
+    """
+    import mmap
+
+    file_path = tmp_path / "raw.py"
+    file_path.write_bytes("x = 'ñ'\r\n".encode("utf-8"))
+    empty_path = tmp_path / "empty.py"
+    empty_path.write_bytes(b"")
+
+    with FileReader(str(file_path)).open_buffer() as buffer:
+        assert isinstance(buffer, mmap.mmap)
+        assert buffer[:] == "x = 'ñ'\r\n".encode("utf-8")
+    assert buffer.closed
+
+    with FileReader(str(empty_path)).open_buffer() as buffer:
+        assert buffer == b""
+
+    with caplog.at_level(logging.ERROR):
+        with FileReader("no_existe.py").open_buffer() as buffer:
+            assert buffer == b""
+        assert "El archivo no_existe.py no existe." in caplog.text
@@ -0,0 +1,83 @@
+import subprocess
+import pytest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+from Utils.GitRevisionSource import GitFileChange, GitRevisionSource
+
+
+def git(repository, *arguments):
+    """Runs a git command in the test repository."""
+    subprocess.run(
+        ["git", "-C", str(repository), *arguments],
+        check=True, capture_output=True
+    )
+
+
+@pytest.fixture
+def repository(tmp_path):
+    """
+    Creates a repository with two tagged commits: one file modified,
+    one added, one deleted, one unchanged and one non-Python file.
+    """
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "config", "user.email", "test@example.com")
+    git(tmp_path, "config", "user.name", "Test")
+
+    (tmp_path / "package").mkdir()
+    (tmp_path / "package" / "modified.py").write_text("x = 1\r\ny = 2\n")
+    (tmp_path / "deleted.py").write_text("class Gone:\n    pass\n")
+    (tmp_path / "same.py").write_text("z = 3\n")
+    (tmp_path / "notes.txt").write_text("old\n")
+    git(tmp_path, "add", "-A")
+    git(tmp_path, "commit", "-q", "-m", "first")
+    git(tmp_path, "tag", "v1")
+
+    (tmp_path / "package" / "modified.py").write_text("x = 10\ny = 2\n")
+    (tmp_path / "deleted.py").unlink()
+    (tmp_path / "added.py").write_text("class New:\n    pass\n")
+    (tmp_path / "notes.txt").write_text("new\n")
+    git(tmp_path, "add", "-A")
+    git(tmp_path, "commit", "-q", "-m", "second")
+    git(tmp_path, "tag", "v2")
+
+    return tmp_path
+
+
+def test_get_changes_lists_only_changed_python_files(repository):
+    """
+    Tests that unchanged and non-Python files are not listed and that
+    the missing side of added and deleted files has no blob.
+    """
+    with GitRevisionSource(repository, "v1", "v2") as source:
+        changes = source.get_changes()
+
+    assert [(change.path, change.status) for change in changes] == [
+        ("added.py", "A"), ("deleted.py", "D"), ("package/modified.py", "M")
+    ]
+    assert changes[0].old_blob_id is None
+    assert changes[1].new_blob_id is None
+    assert all(isinstance(change, GitFileChange) for change in changes)
+
+
+def test_read_blob_lines(repository):
+    """
+    Tests that several blobs are read through the same process and
+    decoded with universal newlines.
+    """
+    with GitRevisionSource(repository, "v1", "v2") as source:
+        modified = source.get_changes()[2]
+
+        assert source.read_blob_lines(modified.old_blob_id) == \
+            ["x = 1\n", "y = 2\n"]
+        assert source.read_blob(modified.new_blob_id) == b"x = 10\ny = 2\n"
+
+
+def test_unknown_revision(repository):
+    """
+    Tests that an unknown revision raises a ValueError.
+    """
+    with pytest.raises(ValueError):
+        GitRevisionSource(repository, "v1", "missing").get_changes()
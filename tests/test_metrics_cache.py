@@ -0,0 +1,147 @@
+import pytest
+import sqlite3
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+from Utils.MetricsCache import MetricsCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """
+    Creates a metrics cache stored in a temporary directory.
+    """
+    metrics_cache = MetricsCache(tmp_path / "metrics.sqlite", max_entries=2)
+    yield metrics_cache
+    metrics_cache.close()
+
+
+def test_key_depends_on_content(cache, tmp_path):
+    """
+    Tests that files with the same content share a key and that
+    changing the content or the kind changes it.
+    """
+    first = tmp_path / "first.py"
+    second = tmp_path / "second.py"
+    first.write_text("x = 1\n")
+    second.write_text("x = 1\n")
+
+    assert cache.make_key("basic", first) == cache.make_key("basic", second)
+    assert cache.make_key("basic", first) != cache.make_key("pair", first)
+
+    second.write_text("x = 2\n")
+    assert cache.make_key("basic", first) != cache.make_key("basic", second)
+
+
+def test_get_and_put_count_hits_and_misses(cache):
+    """
+    Tests that stored metrics are returned as tuples and that lookups
+    are counted.
+    """
+    assert cache.get("key") is None
+
+    cache.put("key", ("Clase", 10, 2, 1, 0))
+
+    assert cache.get("key") == ("Clase", 10, 2, 1, 0)
+    assert cache.get_hits() == 1
+    assert cache.get_misses() == 1
+
+
+def test_least_recently_used_entry_is_evicted(cache):
+    """
+    Tests that the cache keeps its size bound by evicting the entry
+    that was used least recently.
+    """
+    cache.put("first", ("A", 1, 0, 0, 0))
+    cache.put("second", ("B", 2, 0, 0, 0))
+    cache.get("first")
+    cache.put("third", ("C", 3, 0, 0, 0))
+
+    assert len(cache) == 2
+    assert cache.get("second") is None
+    assert cache.get("first") == ("A", 1, 0, 0, 0)
+
+
+def test_entries_persist_between_instances(tmp_path):
+    """
+    Tests that the cache keeps its entries on disk.
+    """
+    cache_path = tmp_path / "metrics.sqlite"
+    first_cache = MetricsCache(cache_path)
+    first_cache.put("key", ("Clase", 5, 1, 0, 0))
+    first_cache.close()
+
+    second_cache = MetricsCache(cache_path)
+    assert second_cache.get("key") == ("Clase", 5, 1, 0, 0)
+    second_cache.close()
+
+
+def test_uses_are_saved_on_flush(tmp_path):
+    """
+    Tests that reading an entry doesn't write to the database until
+    the cache is flushed, and that the order of use survives it.
+    """
+    cache_path = tmp_path / "metrics.sqlite"
+    first_cache = MetricsCache(cache_path, max_entries=2)
+    first_cache.put("first", ("A", 1, 0, 0, 0))
+    first_cache.put("second", ("B", 2, 0, 0, 0))
+    first_cache.flush()
+    first_cache.get("first")
+
+    def read_last_used():
+        with sqlite3.connect(str(cache_path)) as connection:
+            return dict(connection.execute(
+                "SELECT key, last_used FROM metrics"
+            ).fetchall())
+
+    stored_uses = read_last_used()
+    assert stored_uses["first"] < stored_uses["second"]
+    first_cache.flush()
+    assert read_last_used()["first"] > stored_uses["second"]
+    first_cache.close()
+
+    second_cache = MetricsCache(cache_path, max_entries=2)
+    assert len(second_cache) == 2
+    second_cache.put("third", ("C", 3, 0, 0, 0))
+
+    assert len(second_cache) == 2
+    assert second_cache.get("second") is None
+    assert second_cache.get("first") == ("A", 1, 0, 0, 0)
+    second_cache.close()
+
+
+def test_entries_are_committed_on_flush(tmp_path):
+    """
+    Tests that stored entries are committed together by flush instead
+    of one transaction each.
+    """
+    cache_path = tmp_path / "metrics.sqlite"
+    cache = MetricsCache(cache_path)
+
+    def count_committed():
+        with sqlite3.connect(str(cache_path)) as connection:
+            return connection.execute(
+                "SELECT COUNT(*) FROM metrics"
+            ).fetchone()[0]
+
+    for index in range(3):
+        cache.put(f"key_{index}", ("A", index, 0, 0, 0))
+
+    assert count_committed() == 0
+    cache.flush()
+    assert count_committed() == 3
+    cache.close()
+
+
+def test_replacing_an_entry_keeps_the_count(cache):
+    """
+    Tests that storing a key again doesn't count as a new entry.
+    """
+    cache.put("first", ("A", 1, 0, 0, 0))
+    cache.put("first", ("A", 2, 0, 0, 0))
+    cache.put("second", ("B", 2, 0, 0, 0))
+
+    assert len(cache) == 2
+    assert cache.get("first") == ("A", 2, 0, 0, 0)
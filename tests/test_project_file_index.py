@@ -0,0 +1,65 @@
+import pytest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+from Utils.ProjectFileIndex import ProjectFileIndex
+
+
+@pytest.fixture
+def project_root(tmp_path):
+    """
+    Creates a project tree with a repeated file name.
+    """
+    (tmp_path / "package").mkdir()
+    (tmp_path / "main.py").write_text("print('main')\n")
+    (tmp_path / "utils.py").write_text("x = 1\n")
+    (tmp_path / "package" / "utils.py").write_text("y = 2\n")
+    (tmp_path / "notes.txt").write_text("no es python\n")
+    ProjectFileIndex.clear_cache()
+    return tmp_path
+
+
+def test_find_files_by_name(project_root):
+    """
+    Tests that the index finds the files by name and ignores
+    files with other extensions.
+    """
+    index = ProjectFileIndex.for_root(project_root)
+
+    assert index.find("main.py") == [project_root / "main.py"]
+    assert index.contains("utils.py")
+    assert not index.contains("notes.txt")
+    assert index.find("missing.py") == []
+
+
+def test_reports_name_collisions(project_root):
+    """
+    Tests that files sharing a name are reported as collisions.
+    """
+    index = ProjectFileIndex.for_root(project_root)
+
+    assert index.get_collisions() == {
+        "utils.py": [
+            project_root / "package" / "utils.py",
+            project_root / "utils.py",
+        ]
+    }
+
+
+def test_cached_index_is_rebuilt_when_tree_changes(project_root):
+    """
+    Tests that the cached index is reused while the tree is unchanged
+    and rebuilt after a file is added.
+    """
+    index = ProjectFileIndex.for_root(project_root)
+    assert ProjectFileIndex.for_root(project_root) is index
+
+    new_file = project_root / "package" / "nuevo.py"
+    new_file.write_text("z = 3\n")
+    os.utime(new_file.parent, ns=(0, 0))
+
+    rebuilt_index = ProjectFileIndex.for_root(project_root)
+    assert rebuilt_index is not index
+    assert rebuilt_index.find("nuevo.py") == [new_file]
@@ -0,0 +1,109 @@
+import pytest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+from Utils.ProjectTreeWalker import IgnoreRules, ProjectTreeWalker
+
+
+@pytest.fixture
+def project_root(tmp_path):
+    """
+    Creates a project tree with a virtual environment, caches and a
+    nested `.gitignore`.
+    """
+    for relative_path in (
+        "main.py",
+        "notes.txt",
+        "package/module.py",
+        "package/generated_api.py",
+        "package/generated_keep.py",
+        "package/__pycache__/module.py",
+        ".venv/lib/site.py",
+        "build/lib/main.py",
+        "docs/conf.py",
+    ):
+        file_path = tmp_path / relative_path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text("x = 1\n")
+
+    (tmp_path / ".gitignore").write_text("# Documentation\n/docs/\n")
+    (tmp_path / "package" / ".gitignore").write_text(
+        "generated_*.py\n!generated_keep.py\n"
+    )
+    return tmp_path
+
+
+def get_relative_paths(root, walked_tree):
+    """Returns the walked files relative to the root, with '/'."""
+    return [file.relative_to(root).as_posix() for file in walked_tree.files]
+
+
+def test_walk_skips_excluded_and_ignored_paths(project_root):
+    """
+    Tests that the default excludes and the `.gitignore` files, with
+    their negations, decide which files are listed.
+    """
+    walked_tree = ProjectTreeWalker().walk(project_root)
+
+    assert get_relative_paths(project_root, walked_tree) == [
+        "main.py",
+        "package/generated_keep.py",
+        "package/module.py",
+    ]
+    assert str(project_root / "package" / ".gitignore") in \
+        walked_tree.watched_mtimes
+    assert str(project_root / ".venv") not in walked_tree.watched_mtimes
+
+
+def test_walk_without_rules_lists_every_file(project_root):
+    """
+    Tests that without excludes nor `.gitignore` the walk lists the
+    same files as rglob.
+    """
+    walked_tree = ProjectTreeWalker((), use_gitignore=False).walk(
+        project_root
+    )
+
+    assert walked_tree.files == sorted(project_root.rglob("*.py"))
+
+
+def test_threaded_walk_matches_sequential_walk(project_root):
+    """
+    Tests that scanning directories in threads lists the same files.
+    """
+    assert ProjectTreeWalker(max_threads=4).walk(project_root) == \
+        ProjectTreeWalker().walk(project_root)
+
+
+@pytest.mark.parametrize("pattern, path, is_directory, expected", [
+    ("*.log", "a/b/debug.log", False, True),
+    ("/build", "build", True, True),
+    ("/build", "src/build", True, False),
+    ("logs/", "logs", False, False),
+    ("logs/", "src/logs", True, True),
+    ("docs/**/*.py", "docs/a/b/conf.py", False, True),
+    ("**/fixtures", "tests/unit/fixtures", True, True),
+    ("module_[0-9].py", "module_7.py", False, True),
+    ("module_[!0-9].py", "module_7.py", False, False),
+])
+def test_ignore_rules(pattern, path, is_directory, expected):
+    """
+    Tests the `.gitignore` pattern syntax.
+    """
+    assert IgnoreRules.parse([pattern]).is_ignored(path, is_directory) \
+        == expected
+
+
+def test_ignore_rules_are_relative_to_their_directory():
+    """
+    Tests that nested rules only apply below their directory and that
+    the last matching rule wins.
+    """
+    rules = IgnoreRules.parse(["*.py"]).extended(["!keep.py"], "src")
+
+    assert rules.is_ignored("main.py", False)
+    assert rules.is_ignored("keep.py", False)
+    assert not rules.is_ignored("src/keep.py", False)
+    assert not IgnoreRules.parse(["# comment", "", "   "])
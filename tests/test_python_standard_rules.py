@@ -0,0 +1,75 @@
+import pytest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+from Utils.PythonStandardRules import (
+    LineLengthRule,
+    NestingDepthRule,
+    TabIndentationRule,
+    TrailingWhitespaceRule,
+)
+from Utils.StandardRule import RuleViolation
+
+
+def check(rule_class, lines):
+    """
+    Runs a single rule over the lines and returns the numbers of the
+    lines with violations.
+    """
+    rule = rule_class()
+    violations = []
+
+    for line_number, line in enumerate(lines, start=1):
+        violations.extend(rule.visit_line(line_number, line))
+    violations.extend(rule.finish())
+
+    assert all(violation.rule == rule_class.name for violation in violations)
+    return [violation.line_number for violation in violations]
+
+
+def test_line_length_rule():
+    """
+    Tests that the length is measured without surrounding whitespace.
+    """
+    lines = ["x = 1\n", "y = " + "1" * 80 + "\n", " " * 30 + "z = 2\n"]
+
+    assert check(LineLengthRule, lines) == [2]
+    assert LineLengthRule.build_violation(2, 84) == RuleViolation(
+        "line-length", 2, "Line too long (84 > 79 characters)"
+    )
+
+
+def test_trailing_whitespace_rule():
+    """
+    Tests that spaces and tabs before the line break are reported,
+    but not the line break itself.
+    """
+    lines = ["x = 1\n", "y = 2 \n", "z = 3\t\r\n", "w = 4\r\n", "end  "]
+
+    assert check(TrailingWhitespaceRule, lines) == [2, 3, 5]
+
+
+def test_tab_indentation_rule():
+    """
+    Tests that only tabs in the indentation are reported.
+    """
+    lines = ["def f():\n", "\treturn 1\n", "    x = '\t'\n", "  \ty = 2\n"]
+
+    assert check(TabIndentationRule, lines) == [2, 4]
+
+
+@pytest.mark.parametrize("lines, expected", [
+    ([" " * 24 + "x = 1\n", " " * 28 + "y = 2\n"], [2]),
+    (["\t" * 7 + "x = 1\n"], [1]),
+    (["foo(\n", " " * 40 + "argument)\n", " " * 28 + "z = 3\n"], [3]),
+    (["x = 1 + \\\n", " " * 40 + "2\n"], []),
+    (['"""\n', " " * 40 + "text (\n", '"""\n', " " * 28 + "w = 4\n"], [4]),
+    (["# comment\n", " " * 40 + "# indented comment\n", "\n"], []),
+])
+def test_nesting_depth_rule(lines, expected):
+    """
+    Tests that only lines that start a statement are measured.
+    """
+    assert check(NestingDepthRule, lines) == expected
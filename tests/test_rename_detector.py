@@ -0,0 +1,117 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+from pathlib import Path
+from Utils.RenameDetector import DetectedRename, RenameDetector
+
+
+def build_module(name, method_count):
+    """
+    Builds the lines of a module whose methods are unique to its name.
+    """
+    lines = [f"class {name}:\n"]
+    for index in range(method_count):
+        lines.append(f"    def {name.lower()}_{index}(self):\n")
+        lines.append(f"        return {index} * {len(name)}\n")
+    return lines
+
+
+def test_find_renames_pairs_moved_files():
+    """
+    Tests that deleted files are matched to the added files with the
+    same content, even when slightly edited.
+    """
+    files = {
+        "old/alpha.py": build_module("Alpha", 20),
+        "old/beta.py": build_module("Beta", 20),
+        "old/gone.py": build_module("Gone", 20),
+        "new/moved/alpha.py": build_module("Alpha", 20),
+        "new/beta_renamed.py": build_module("Beta", 18)
+            + ["    def extra(self):\n", "        return 0\n"],
+        "new/unrelated.py": build_module("Unrelated", 20),
+    }
+
+    renames = RenameDetector().find_renames(
+        ["old/alpha.py", "old/beta.py", "old/gone.py"],
+        ["new/moved/alpha.py", "new/beta_renamed.py", "new/unrelated.py"],
+        files.__getitem__
+    )
+
+    assert [rename[:2] for rename in renames] == [
+        ("old/alpha.py", "new/moved/alpha.py"),
+        ("old/beta.py", "new/beta_renamed.py"),
+    ]
+    assert renames[0].similarity == 1.0
+    assert 0.5 < renames[1].similarity < 1.0
+
+
+def test_each_file_is_matched_once():
+    """
+    Tests that a file copied to two places is paired with only one of
+    them, preferring the copy with the same name.
+    """
+    old_file = Path("old") / "alpha.py"
+    copied_file = Path("new") / "a" / "copy.py"
+    moved_file = Path("new") / "b" / "alpha.py"
+
+    renames = RenameDetector().find_renames(
+        [old_file], [copied_file, moved_file],
+        lambda file: build_module("Alpha", 10)
+    )
+
+    assert renames == [DetectedRename(old_file, moved_file, 1.0)]
+
+
+def test_many_near_identical_small_files_are_not_compared_pairwise():
+    """
+    Tests that boilerplate `__init__.py` files and near-identical
+    generated stubs don't make every old file a candidate for every
+    new one, and that real renames are still found among them.
+    """
+    similarity_checks = []
+
+    class CountingRenameDetector(RenameDetector):
+        def get_similarity(self, first_shingles, second_shingles):
+            similarity_checks.append(1)
+            return super().get_similarity(first_shingles, second_shingles)
+
+    def build_stub(index):
+        return ["from typing import Any\n", "\n",
+                "def load(value: Any) -> Any:\n", "    return value\n",
+                f"STUB_ID = {index}\n"]
+
+    files = {
+        "old/alpha.py": build_module("Alpha", 20),
+        "new/moved/alpha.py": build_module("Alpha", 20),
+    }
+    for index in range(200):
+        files[f"old/stub_{index}.py"] = build_stub(index)
+        files[f"new/generated_{index}.py"] = build_stub(1000 + index)
+        files[f"old/package_{index}/__init__.py"] = ["from .core import *\n"]
+        files[f"new/module_{index}/__init__.py"] = ["from .core import *\n"]
+
+    renames = CountingRenameDetector().find_renames(
+        [file for file in files if file.startswith("old/")],
+        [file for file in files if file.startswith("new/")],
+        files.__getitem__
+    )
+
+    assert ("old/alpha.py", "new/moved/alpha.py") in \
+        [rename[:2] for rename in renames]
+    assert not any("__init__" in rename.old_file for rename in renames)
+    assert len(similarity_checks) < 1000
+
+
+def test_get_similarity_ignores_whitespace_and_blank_lines():
+    """
+    Tests that the shingles ignore indentation changes and blank lines.
+    """
+    detector = RenameDetector()
+    first = detector.get_shingles(["a = 1\n", "b = 2\n", "c = 3\n"])
+    second = detector.get_shingles(["  a = 1\n", "\n", "b = 2  \n", "d = 4\n"])
+
+    assert detector.get_similarity(first, first) == 1.0
+    assert detector.get_similarity(first, second) == 1 / 3
+    assert detector.get_similarity(frozenset(), frozenset()) == 1.0
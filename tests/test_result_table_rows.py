@@ -0,0 +1,90 @@
+import pytest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+from Utils.ResultTableRows import ResultTableRows
+
+
+@pytest.fixture
+def table_rows():
+    """
+    Creates table rows with a total row.
+    """
+    return ResultTableRows(
+        [
+            ("b.py", "Beta", 2, 30),
+            ("a.py", "Alfa", 10, 5),
+            ("c.txt", "error", "Not a Python file", "None"),
+        ],
+        total_row=("Total", "", "", 35),
+    )
+
+
+def test_total_row_is_always_last(table_rows):
+    """
+    Tests that the total row stays last after sorting and filtering.
+    """
+    table_rows.sort_by(0)
+    assert table_rows.get_page(0, 10)[-1][0] == "Total"
+
+    table_rows.set_filter(None, "alfa")
+    assert [row[0] for row in table_rows.get_page(0, 10)] == \
+        ["a.py", "Total"]
+
+
+def test_sort_numbers_before_text_and_reverse(table_rows):
+    """
+    Tests that numeric columns sort numerically and that sorting the
+    same column twice reverses the order.
+    """
+    table_rows.sort_by(2)
+    assert [row[2] for row in table_rows.get_page(0, 3)] == \
+        [2, 10, "Not a Python file"]
+
+    table_rows.sort_by(2)
+    assert [row[2] for row in table_rows.get_page(0, 3)] == \
+        ["Not a Python file", 10, 2]
+    assert table_rows.get_sort_state() == (2, True)
+
+
+def test_filter_by_column(table_rows):
+    """
+    Tests that a column filter only looks at that column.
+    """
+    table_rows.set_filter(1, "py")
+    assert len(table_rows) == 1
+
+    table_rows.set_filter(0, "PY")
+    assert len(table_rows) == 3
+
+    table_rows.set_filter(0, "")
+    assert len(table_rows) == 4
+
+
+def test_get_page_returns_only_the_requested_window():
+    """
+    Tests that only the requested page of rows is returned.
+    """
+    table_rows = ResultTableRows([(f"{index}.py",) for index in range(1000)])
+
+    assert table_rows.get_page(500, 3) == \
+        [("500.py",), ("501.py",), ("502.py",)]
+    assert table_rows.get_page(999, 25) == [("999.py",)]
+
+
+def test_upsert_and_remove_rows(table_rows):
+    """
+    Tests that rows are updated in place, appended or removed by their
+    first column.
+    """
+    table_rows.upsert_rows([("a.py", "Alfa", 11, 6), ("d.py", "Delta", 1, 1)])
+    table_rows.remove_rows(["b.py"])
+
+    assert [row[:3] for row in table_rows.get_page(0, 10)] == [
+        ("a.py", "Alfa", 11),
+        ("c.txt", "error", "Not a Python file"),
+        ("d.py", "Delta", 1),
+        ("Total", "", ""),
+    ]
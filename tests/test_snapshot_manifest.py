@@ -0,0 +1,62 @@
+import pytest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+from pathlib import Path
+from Utils.SnapshotManifest import SnapshotEntry, SnapshotManifest
+
+
+def create_entry(path, complies_with_standard=True):
+    """Creates a snapshot entry with fixed metrics."""
+    return SnapshotEntry(
+        path, 10, 123, "ab" * 32, "Ejemplo", 8, 2, complies_with_standard
+    )
+
+
+def test_manifest_round_trip(tmp_path):
+    """
+    Tests that a written manifest is read back unchanged.
+    """
+    manifest_file = tmp_path / "snapshot.json"
+    settings = {"standard_rules": ["line-length"], "counting_engine": "heuristic"}
+    SnapshotManifest(
+        tmp_path / "tree", settings,
+        [create_entry("b.py"), create_entry("package/a.py", False)]
+    ).write(manifest_file)
+
+    manifest = SnapshotManifest.read(manifest_file)
+
+    assert SnapshotManifest.is_manifest(manifest_file)
+    assert manifest.get_root() == tmp_path / "tree"
+    assert manifest.get_settings() == settings
+    assert len(manifest) == 2
+    assert manifest.get("b.py").get_unchanged_metrics() == \
+        ("Ejemplo", 8, 2, 0, 0)
+    assert manifest.get("package/a.py").get_unchanged_metrics() == \
+        ("Doesn't comply with Standard", 0, 0, 0, 0)
+
+
+def test_read_rejects_other_files(tmp_path):
+    """
+    Tests that JSON files that are not manifests are rejected.
+    """
+    other_file = tmp_path / "results.json"
+    other_file.write_text('{"results": []}')
+    broken_file = tmp_path / "broken.json"
+    broken_file.write_text("{")
+    malformed_file = tmp_path / "malformed.json"
+    malformed_file.write_text(
+        '{"format": "proyecto-amarillo-snapshot", "version": 1}'
+    )
+
+    for file_path in (other_file, broken_file, malformed_file,
+                      tmp_path / "missing.json"):
+        with pytest.raises(ValueError):
+            SnapshotManifest.read(file_path)
+    assert not SnapshotManifest.is_manifest(other_file)
+    assert not SnapshotManifest.is_manifest(broken_file)
+    assert SnapshotManifest.is_manifest(malformed_file)
+    assert not SnapshotManifest.is_manifest(tmp_path / "missing.json")
+    assert not SnapshotManifest.is_manifest(Path(__file__))
@@ -0,0 +1,108 @@
+import pstats
+import sys
+import time
+import os
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+from Utils.StageProfiler import NullStageProfiler, StageProfiler
+
+
+def test_stage_profiler_report():
+    """
+    Tests that stages, counters and bytes are added up in the report.
+    """
+    profiler = StageProfiler()
+    profiler.start()
+
+    for _ in range(3):
+        with profiler.stage("read"):
+            pass
+    with profiler.stage("diff"):
+        sum(range(10000))
+    profiler.add_count("files_compared", 2)
+    profiler.add_count("files_compared")
+    profiler.add_bytes_read(100)
+    profiler.add_bytes_written(40)
+    profiler.stop()
+
+    report = profiler.get_report()
+
+    assert report["stages"]["read"]["calls"] == 3
+    assert report["stages"]["diff"]["calls"] == 1
+    assert report["stages"]["diff"]["seconds"] > 0
+    assert report["counters"] == {"files_compared": 3}
+    assert (report["bytes_read"], report["bytes_written"]) == (100, 40)
+    assert report["wall_seconds"] >= report["stages"]["diff"]["seconds"]
+
+
+def test_nested_stages_record_exclusive_time():
+    """
+    Tests that the time of a nested stage is left out of the stage it
+    runs in, so the stages add up to the time they were open.
+    """
+    profiler = StageProfiler()
+    profiler.start()
+
+    with profiler.stage("tree_hashing"):
+        with profiler.stage("read"):
+            time.sleep(0.05)
+    profiler.stop()
+
+    stages = profiler.get_report()["stages"]
+    assert stages["read"]["seconds"] >= 0.05
+    assert stages["tree_hashing"]["seconds"] < 0.05
+    assert stages["read"]["seconds"] + stages["tree_hashing"]["seconds"] <= \
+        profiler.get_report()["wall_seconds"]
+
+
+def test_merge_report():
+    """
+    Tests that the report of another profiler is added to this one.
+    """
+    worker_profiler = StageProfiler()
+    worker_profiler.add_stage_time("diff", 1.5, calls=2)
+    worker_profiler.add_count("cache_misses")
+    worker_profiler.add_bytes_read(10)
+
+    profiler = StageProfiler()
+    profiler.add_stage_time("diff", 0.5)
+    profiler.merge_report(worker_profiler.get_report())
+
+    report = profiler.get_report()
+    assert report["stages"]["diff"] == {"calls": 3, "seconds": 2.0}
+    assert report["counters"] == {"cache_misses": 1}
+    assert report["bytes_read"] == 10
+
+
+def test_dump_stats(tmp_path):
+    """
+    Tests that the cProfile statistics can be loaded with pstats.
+    """
+    profiler = StageProfiler(use_cprofile=True)
+    profiler.start()
+    sorted(range(1000), reverse=True)
+    profiler.stop()
+
+    stats_file = tmp_path / "run.pstats"
+    profiler.dump_stats(str(stats_file))
+
+    assert pstats.Stats(str(stats_file)).total_calls > 0
+
+
+def test_null_stage_profiler_records_nothing():
+    """
+    Tests that the disabled profiler has the same interface, reuses
+    one context manager and reports nothing.
+    """
+    profiler = NullStageProfiler()
+    profiler.start()
+
+    with profiler.stage("read"):
+        profiler.add_count("files_compared")
+        profiler.add_bytes_read(10)
+    profiler.stop()
+
+    assert not profiler.is_enabled()
+    assert profiler.stage("read") is profiler.stage("diff")
+    assert profiler.get_report() is None
@@ -0,0 +1,108 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+from Utils.MetricsCache import MetricsCache
+from Utils.TreeHashIndex import TreeHashIndex
+
+
+def create_tree(root, files):
+    """
+    Writes the files of a tree and returns their paths.
+    """
+    paths = []
+    for relative_path, content in files.items():
+        file_path = root / relative_path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text(content)
+        paths.append(file_path)
+    return paths
+
+
+FILES = {
+    "main.py": "x = 1\n",
+    "package/a.py": "a = 1\n",
+    "package/core/b.py": "b = 1\n",
+    "other/c.py": "c = 1\n",
+}
+
+
+def test_directory_hashes_cover_the_whole_subtree(tmp_path):
+    """
+    Tests that a change in a file changes the hash of every directory
+    above it and of no other directory.
+    """
+    old_index = TreeHashIndex(
+        tmp_path / "old", create_tree(tmp_path / "old", FILES)
+    )
+    new_index = TreeHashIndex(
+        tmp_path / "new",
+        create_tree(tmp_path / "new", {**FILES, "package/core/b.py": "b = 2\n"})
+    )
+
+    assert old_index.get_directory_hash("other") == \
+        new_index.get_directory_hash("other")
+    for directory in ("", "package", "package/core"):
+        assert old_index.get_directory_hash(directory) != \
+            new_index.get_directory_hash(directory)
+    assert old_index.get_unchanged_directories(new_index) == ["other"]
+    assert old_index.get_files("package") == \
+        ["package/a.py", "package/core/b.py"]
+
+
+def test_equal_trees_are_unchanged_from_the_root(tmp_path):
+    """
+    Tests that identical trees report only their root as unchanged,
+    and that a renamed file changes its directory hash.
+    """
+    old_index = TreeHashIndex(
+        tmp_path / "old", create_tree(tmp_path / "old", FILES)
+    )
+    new_index = TreeHashIndex(
+        tmp_path / "new", create_tree(tmp_path / "new", FILES)
+    )
+    renamed_index = TreeHashIndex(
+        tmp_path / "renamed",
+        create_tree(tmp_path / "renamed", {
+            **{path: content for path, content in FILES.items()
+               if path != "other/c.py"},
+            "other/d.py": "c = 1\n",
+        })
+    )
+
+    assert old_index.get_unchanged_directories(new_index) == [""]
+    assert "other" not in old_index.get_unchanged_directories(renamed_index)
+
+
+def test_cached_hashes_are_reused_until_files_change(tmp_path):
+    """
+    Tests that the hashes recorded in the metrics cache are trusted
+    while the files keep their size and modification time, and that
+    nothing is written to the tree.
+    """
+    tree = tmp_path / "tree"
+    files = create_tree(tree, FILES)
+    metrics_cache = MetricsCache(tmp_path / "metrics.sqlite")
+
+    first_index = TreeHashIndex(tree, files, metrics_cache)
+    second_index = TreeHashIndex(tree, files, metrics_cache)
+    (tree / "main.py").write_text("x = 22\n")
+    third_index = TreeHashIndex(tree, files, metrics_cache)
+    uncached_index = TreeHashIndex(tree, files)
+    metrics_cache.close()
+
+    assert first_index.get_hashed_file_count() == len(FILES)
+    assert second_index.get_hashed_file_count() == 0
+    assert second_index.get_directory_hash("") == \
+        first_index.get_directory_hash("")
+    assert third_index.get_hashed_file_count() == 1
+    assert third_index.get_directory_hash("") != \
+        first_index.get_directory_hash("")
+    assert third_index.get_directory_hash("package") == \
+        first_index.get_directory_hash("package")
+    assert uncached_index.get_hashed_file_count() == len(FILES)
+    assert uncached_index.get_directory_hash("") == \
+        third_index.get_directory_hash("")
+    assert sorted(path for path in tree.rglob("*") if path.is_file()) == \
+        sorted(files)